@@ -3,7 +3,7 @@ Configuration management for AI Agent Factory
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 
@@ -89,6 +89,204 @@ class Config:
         """Whether to enforce strict PRD validation"""
         return os.getenv("STRICT_PRD", "true").lower() == "true"
 
+    @property
+    def prd_parse_cache_size(self) -> int:
+        """Maximum number of parsed PRDs kept in the in-process cache (0 disables it)"""
+        try:
+            return int(os.getenv("PRD_PARSE_CACHE_SIZE", "256"))
+        except ValueError:
+            return 256
+
+    @property
+    def prd_parse_cache_dir(self) -> Optional[str]:
+        """Optional directory for the on-disk PRD parse cache"""
+        return os.getenv("PRD_PARSE_CACHE_DIR") or None
+
+    @property
+    def prd_markdown_cache_size(self) -> int:
+        """Rendered PRD markdown documents kept in memory (0 disables the cache)"""
+        try:
+            return int(os.getenv("PRD_MARKDOWN_CACHE_SIZE", "512"))
+        except ValueError:
+            return 512
+
+    @property
+    def prd_parser_mode(self) -> str:
+        """PRD section tokeniser: 'regex' (default) or 'ast' (markdown block parser)"""
+        mode = os.getenv("PRD_PARSER_MODE", "regex").strip().lower()
+        return mode if mode in ("regex", "ast") else "regex"
+
+    @property
+    def prd_parse_workers(self) -> int:
+        """Worker processes for batch PRD parsing (0 or unset: one per CPU)"""
+        try:
+            return int(os.getenv("PRD_PARSE_WORKERS", "0"))
+        except ValueError:
+            return 0
+
+    @property
+    def prd_parse_pool_workers(self) -> int:
+        """Worker threads that run PRD parsing off the event loop"""
+        try:
+            return int(os.getenv("PRD_PARSE_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+        except ValueError:
+            return min(4, os.cpu_count() or 1)
+
+    @property
+    def prd_parse_queue_limit(self) -> int:
+        """Parse jobs allowed to wait for a worker before uploads are rejected with 503"""
+        try:
+            return int(os.getenv("PRD_PARSE_QUEUE_LIMIT", "16"))
+        except ValueError:
+            return 16
+
+    @property
+    def prd_ingest_queue_size(self) -> int:
+        """Documents each PRD ingest pipeline stage may queue before submissions get 503"""
+        try:
+            return int(os.getenv("PRD_INGEST_QUEUE_SIZE", "32"))
+        except ValueError:
+            return 32
+
+    @property
+    def prd_ingest_persist_batch(self) -> int:
+        """Most PRDs the ingest pipeline's persist stage stores with one database insert"""
+        try:
+            return int(os.getenv("PRD_INGEST_PERSIST_BATCH", "32"))
+        except ValueError:
+            return 32
+
+    @property
+    def prd_ingest_stage_workers(self) -> Dict[str, int]:
+        """Per-stage worker overrides for the PRD ingest pipeline, e.g. 'parse=4,persist=8'"""
+        workers: Dict[str, int] = {}
+        for item in os.getenv("PRD_INGEST_STAGE_WORKERS", "").split(","):
+            name, _, count = item.partition("=")
+            try:
+                workers[name.strip()] = int(count)
+            except ValueError:
+                continue
+        return workers
+
+    @property
+    def github_api_url(self) -> str:
+        """GitHub REST API base URL (point at a local fake server for testing)"""
+        return os.getenv("GITHUB_API_URL") or "https://api.github.com"
+
+    @property
+    def github_raw_url(self) -> Optional[str]:
+        """Base URL for raw file downloads, e.g. https://raw.githubusercontent.com/owner/repo/main
+        (derived automatically for api.github.com)"""
+        return os.getenv("GITHUB_RAW_URL") or None
+
+    @property
+    def github_max_connections(self) -> int:
+        """Connections in the shared GitHub HTTP pool (kept alive between requests)"""
+        try:
+            return int(os.getenv("GITHUB_MAX_CONNECTIONS", "10"))
+        except ValueError:
+            return 10
+
+    @property
+    def github_download_concurrency(self) -> int:
+        """Concurrent file downloads when the GitHub PRD index fans out"""
+        try:
+            return int(os.getenv("GITHUB_DOWNLOAD_CONCURRENCY", "8"))
+        except ValueError:
+            return 8
+
+    @property
+    def github_write_reserve(self) -> int:
+        """Rate-limit requests that scans and reads leave untouched for commits and deletes"""
+        try:
+            return int(os.getenv("GITHUB_WRITE_RESERVE", "100"))
+        except ValueError:
+            return 100
+
+    @property
+    def github_max_queue_wait(self) -> float:
+        """Seconds a GitHub request may wait for rate-limit budget before failing"""
+        try:
+            return float(os.getenv("GITHUB_MAX_QUEUE_WAIT", "10"))
+        except ValueError:
+            return 10.0
+
+    @property
+    def github_commit_window_ms(self) -> int:
+        """How long PRD file adds/deletes are collected before they are committed together"""
+        try:
+            return int(os.getenv("GITHUB_COMMIT_WINDOW_MS", "200"))
+        except ValueError:
+            return 200
+
+    @property
+    def github_commit_max_files(self) -> int:
+        """Most file changes in one batched GitHub commit"""
+        try:
+            return int(os.getenv("GITHUB_COMMIT_MAX_FILES", "50"))
+        except ValueError:
+            return 50
+
+    @property
+    def prd_source_backend(self) -> str:
+        """Where PRD files are read and committed: "github" (REST API) or "local" (a git working copy)"""
+        return os.getenv("PRD_SOURCE_BACKEND", "github").lower()
+
+    @property
+    def prd_local_repo_path(self) -> str:
+        """Working copy used by the local PRD source backend (defaults to this checkout)"""
+        return os.getenv("PRD_LOCAL_REPO_PATH") or str(Path(__file__).parent.parent.parent)
+
+    @property
+    def prd_local_repo_push(self) -> bool:
+        """Push local PRD commits to the remote (and pull from it); false keeps the clone offline"""
+        return os.getenv("PRD_LOCAL_REPO_PUSH", "true").lower() == "true"
+
+    @property
+    def prd_local_push_interval(self) -> float:
+        """Seconds local PRD commits are collected before one push"""
+        try:
+            return float(os.getenv("PRD_LOCAL_PUSH_INTERVAL", "5"))
+        except ValueError:
+            return 5.0
+
+    @property
+    def prd_local_pull_interval(self) -> float:
+        """Seconds between pulls that bring the local working copy up to date (0 = never)"""
+        try:
+            return float(os.getenv("PRD_LOCAL_PULL_INTERVAL", "60"))
+        except ValueError:
+            return 60.0
+
+    @property
+    def prd_db_sync_lag(self) -> float:
+        """Seconds the database may trail GitHub; /prds/submit only refreshes the GitHub index when it is older"""
+        try:
+            return float(os.getenv("PRD_DB_SYNC_LAG", "60"))
+        except ValueError:
+            return 60.0
+
+    @property
+    def github_prd_index_dir(self) -> Optional[str]:
+        """Optional directory where the GitHub PRD index (blob SHA -> content hash) is persisted"""
+        return os.getenv("GITHUB_PRD_INDEX_DIR") or None
+
+    @property
+    def prd_max_document_bytes(self) -> int:
+        """Largest PRD document accepted by the upload endpoints, in bytes"""
+        try:
+            return int(os.getenv("PRD_MAX_DOCUMENT_BYTES", str(2 * 1024 * 1024)))
+        except ValueError:
+            return 2 * 1024 * 1024
+
+    @property
+    def prd_max_archive_bytes(self) -> int:
+        """Largest PRD archive accepted by /prds/upload-archive, in bytes"""
+        try:
+            return int(os.getenv("PRD_MAX_ARCHIVE_BYTES", str(100 * 1024 * 1024)))
+        except ValueError:
+            return 100 * 1024 * 1024
+
     def validate_config(self) -> dict:
         """Validate configuration and return status
         
@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from enum import Enum
 
+from .common import MAX_BATCH_GET_IDS
+
 
 class AgentStatus(str, Enum):
     """Agent status enumeration."""
@@ -148,6 +150,12 @@ class AgentListResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
+    deleted_ids: List[str] = Field(
+        default_factory=list,
+        description="IDs deleted since deleted_since (delta queries only)")
+    watermark: Optional[datetime] = Field(
+        None,
+        description="Send as updated_since/deleted_since on the next delta query")
 
 
 class AgentHealthResponse(BaseModel):
@@ -199,3 +207,24 @@ class AgentMetricsResponse(BaseModel):
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+
+
+class AgentBatchGetRequest(BaseModel):
+    """Model for fetching several agents by ID in one request."""
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_GET_IDS,
+                           description="Agent IDs to fetch")
+
+
+class AgentBatchGetItem(BaseModel):
+    """One entry of an agent batch get response, in request order."""
+    id: str = Field(..., description="Requested agent ID")
+    found: bool = Field(..., description="Whether the agent exists")
+    agent: Optional[AgentResponse] = Field(None, description="The agent, if found")
+
+
+class AgentBatchGetResponse(BaseModel):
+    """Model for agent batch get responses."""
+    results: List[AgentBatchGetItem] = Field(
+        ..., description="One entry per requested ID, in request order")
+    not_found: List[str] = Field(
+        default_factory=list, description="Requested IDs that do not exist")
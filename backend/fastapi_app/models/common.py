@@ -0,0 +1,6 @@
+"""
+Constants shared by the PRD and agent models.
+"""
+
+# Upper bound for batch get requests (keeps the single `in()` query URL short)
+MAX_BATCH_GET_IDS = 250
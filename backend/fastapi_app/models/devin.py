@@ -73,6 +73,12 @@ class DevinTaskListResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
+    deleted_ids: List[str] = Field(
+        default_factory=list,
+        description="IDs deleted since deleted_since (delta queries only)")
+    watermark: Optional[datetime] = Field(
+        None,
+        description="Send as updated_since/deleted_since on the next delta query")
 
 
 class DevinTaskComplete(BaseModel):
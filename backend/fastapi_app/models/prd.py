@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from enum import Enum
 
+from .common import MAX_BATCH_GET_IDS
+
 
 class PRDType(str, Enum):
     """PRD type enumeration."""
@@ -209,6 +211,12 @@ class PRDListResponse(BaseModel):
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
+    deleted_ids: List[str] = Field(
+        default_factory=list,
+        description="IDs deleted since deleted_since (delta queries only)")
+    watermark: Optional[datetime] = Field(
+        None,
+        description="Send as updated_since/deleted_since on the next delta query")
 
 
 class PRDMarkdownResponse(BaseModel):
@@ -216,3 +224,86 @@ class PRDMarkdownResponse(BaseModel):
     prd_id: str = Field(..., description="PRD ID")
     markdown: str = Field(..., description="Markdown content")
     filename: str = Field(..., description="Suggested filename")
+    etag: Optional[str] = Field(None, description="ETag of this version of the markdown")
+
+
+class PRDBatchGetRequest(BaseModel):
+    """Model for fetching several PRDs by ID in one request."""
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_GET_IDS,
+                           description="PRD IDs to fetch")
+
+
+class PRDBatchGetItem(BaseModel):
+    """One entry of a PRD batch get response, in request order."""
+    id: str = Field(..., description="Requested PRD ID")
+    found: bool = Field(..., description="Whether the PRD exists")
+    prd: Optional[PRDResponse] = Field(None, description="The PRD, if found")
+
+
+class PRDBatchGetResponse(BaseModel):
+    """Model for PRD batch get responses."""
+    results: List[PRDBatchGetItem] = Field(
+        ..., description="One entry per requested ID, in request order")
+    not_found: List[str] = Field(
+        default_factory=list, description="Requested IDs that do not exist")
+
+
+class PRDContentUpdateRequest(BaseModel):
+    """Model for replacing a PRD's markdown content."""
+    content: str = Field(..., min_length=1, description="Updated PRD markdown")
+    filename: Optional[str] = Field(
+        None, description="Original filename (defaults to the stored one)")
+
+
+class PRDSectionChanges(BaseModel):
+    """Section-level change set produced by an incremental re-parse."""
+    added: List[str] = Field(default_factory=list, description="Sections new in this version")
+    modified: List[str] = Field(default_factory=list, description="Sections whose content changed")
+    removed: List[str] = Field(default_factory=list, description="Sections no longer present")
+    unchanged: List[str] = Field(default_factory=list, description="Sections reused without re-parsing")
+
+
+class PRDContentUpdateResponse(BaseModel):
+    """Model for PRD content update responses."""
+    prd: PRDResponse = Field(..., description="The PRD after the update")
+    changes: PRDSectionChanges = Field(..., description="Section-level changes")
+    updated_fields: List[str] = Field(
+        default_factory=list, description="PRD fields written by the partial update")
+
+
+# Upper bound for one bulk import request
+MAX_IMPORT_DOCUMENTS = 500
+# Upper bound for the PRD documents read from one uploaded archive
+MAX_ARCHIVE_DOCUMENTS = 2000
+
+
+class PRDImportDocument(BaseModel):
+    """One PRD markdown document in a bulk import."""
+    content: str = Field(..., min_length=1, description="PRD markdown")
+    filename: str = Field("imported-prd.md", description="Original filename")
+
+
+class PRDImportRequest(BaseModel):
+    """Model for importing many PRD documents in one request."""
+    documents: List[PRDImportDocument] = Field(
+        ..., min_length=1, max_length=MAX_IMPORT_DOCUMENTS, description="Documents to import")
+
+
+class PRDImportResult(BaseModel):
+    """Outcome of one imported document, in request order."""
+    filename: str = Field(..., description="Filename given for the document")
+    status: str = Field(..., description="created, duplicate, failed or skipped")
+    prd_id: Optional[str] = Field(None, description="Created or existing PRD ID")
+    title: Optional[str] = Field(None, description="PRD title")
+    error: Optional[str] = Field(None, description="Why the document failed or was skipped")
+    duplicate_of: Optional[str] = Field(
+        None, description="Earlier file in the same archive with identical content")
+
+
+class PRDImportResponse(BaseModel):
+    """Model for bulk import responses."""
+    results: List[PRDImportResult] = Field(..., description="One entry per document, in request order")
+    created: int = Field(0, description="Documents stored as new PRDs")
+    duplicate: int = Field(0, description="Documents matching an existing PRD")
+    failed: int = Field(0, description="Documents that could not be imported")
+    skipped: int = Field(0, description="Archive members that are not PRD documents")
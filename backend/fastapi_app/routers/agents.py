@@ -1,12 +1,14 @@
 """
 Refactored agent router with proper separation of concerns.
 """
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 
 from ..models.agent import (
     AgentRegistration, AgentUpdate, AgentResponse, AgentStatus, AgentHealthStatus,
-    AgentListResponse, AgentHealthResponse, AgentMetricsResponse
+    AgentListResponse, AgentHealthResponse, AgentMetricsResponse,
+    AgentBatchGetRequest, AgentBatchGetResponse
 )
 from ..services.agent_service import agent_service
 
@@ -24,10 +26,29 @@ async def get_agents(
     skip: int = Query(0, ge=0, description="Number of agents to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of agents to return"),
     status: Optional[AgentStatus] = Query(None, description="Filter by agent status"),
-    prd_id: Optional[str] = Query(None, description="Filter by PRD ID")
+    prd_id: Optional[str] = Query(None, description="Filter by PRD ID"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only return agents created or updated at or after this timestamp"),
+    deleted_since: Optional[datetime] = Query(
+        None, description="Also return IDs of agents deleted at or after this timestamp")
 ):
-    """Get a list of agents with optional filtering and pagination."""
-    return await agent_service.get_agents(skip=skip, limit=limit, status=status, prd_id=prd_id)
+    """Get a list of agents with optional filtering and pagination.
+
+    Pass the previous response's `watermark` as `updated_since`/`deleted_since`
+    to fetch only what changed.
+    """
+    return await agent_service.get_agents(
+        skip=skip, limit=limit, status=status, prd_id=prd_id,
+        updated_since=updated_since, deleted_since=deleted_since)
+
+
+@router.post("/agents:batchGet", response_model=AgentBatchGetResponse)
+async def batch_get_agents(request_body: AgentBatchGetRequest):
+    """Get several agents by ID in one call.
+
+    Results are returned in request order, with `found: false` for unknown IDs.
+    """
+    return await agent_service.batch_get_agents(request_body.ids)
 
 
 @router.get("/agents/{agent_id}", response_model=AgentResponse)
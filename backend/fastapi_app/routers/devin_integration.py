@@ -1,6 +1,7 @@
 """
 Refactored Devin AI integration router with proper separation of concerns.
 """
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Query
 
@@ -24,10 +25,20 @@ async def get_devin_tasks(
     skip: int = Query(0, ge=0, description="Number of tasks to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of tasks to return"),
     status: Optional[DevinTaskStatus] = Query(None, description="Filter by task status"),
-    prd_id: Optional[str] = Query(None, description="Filter by PRD ID")
+    prd_id: Optional[str] = Query(None, description="Filter by PRD ID"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only return tasks created or updated at or after this timestamp"),
+    deleted_since: Optional[datetime] = Query(
+        None, description="Also return IDs of tasks deleted at or after this timestamp")
 ):
-    """Get a list of Devin tasks with optional filtering and pagination."""
-    return await devin_service.get_tasks(skip=skip, limit=limit, status=status, prd_id=prd_id)
+    """Get a list of Devin tasks with optional filtering and pagination.
+
+    Pass the previous response's `watermark` as `updated_since`/`deleted_since`
+    to fetch only what changed.
+    """
+    return await devin_service.get_tasks(
+        skip=skip, limit=limit, status=status, prd_id=prd_id,
+        updated_since=updated_since, deleted_since=deleted_since)
 
 
 @router.get("/devin/tasks/{task_id}", response_model=DevinTaskResponse)
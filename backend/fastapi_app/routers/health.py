@@ -199,6 +199,54 @@ async def debug_data_manager():
     }
 
 
+@router.get("/debug/parse-cache")
+async def debug_parse_cache():
+    """PRD parse cache statistics (hit rate, entries, evictions)."""
+    from ..services.prd_service import prd_service
+
+    return {"prd_parse_cache": prd_service.parse_cache.stats()}
+
+
+@router.get("/debug/markdown-cache")
+async def debug_markdown_cache():
+    """Rendered PRD markdown cache statistics (hit rate, renders, evictions)."""
+    from ..services.prd_service import prd_service
+
+    return {"prd_markdown_cache": prd_service.markdown_cache.stats()}
+
+
+@router.get("/debug/parse-pool")
+async def debug_parse_pool():
+    """PRD parse worker pool metrics (busy workers, queue depth, wait times)."""
+    from ..services.prd_service import prd_service
+
+    return {"prd_parse_pool": prd_service.parse_pool.stats()}
+
+
+@router.get("/debug/ingest-pipeline")
+async def debug_ingest_pipeline():
+    """PRD ingest pipeline metrics (per-stage queue depth, workers, latency)."""
+    from ..services.prd_service import prd_service
+
+    return {"prd_ingest_pipeline": prd_service.ingest_pipeline.stats()}
+
+
+@router.get("/debug/github-prd-index")
+async def debug_github_prd_index():
+    """GitHub PRD index, API client, commit batcher and local working-copy metrics."""
+    from ..services.github_api import all_github_apis
+    from ..services.github_commit_batcher import all_github_commit_batchers
+    from ..services.github_prd_index import all_github_prd_indexes
+    from ..services.local_git_repo import all_local_git_repos
+
+    return {
+        "github_prd_indexes": [index.stats() for index in all_github_prd_indexes()],
+        "github_api": [api.stats() for api in all_github_apis()],
+        "github_commit_batchers": [batcher.stats() for batcher in all_github_commit_batchers()],
+        "local_git_repos": [repo.stats() for repo in all_local_git_repos()]
+    }
+
+
 @router.get("/config")
 async def get_configuration():
     """Get application configuration status"""
@@ -3,14 +3,20 @@ MCP Integration Router
 Handles communication between our application and the MCP server
 """
 
-import requests
 import os
 from typing import Dict, Any
+
+import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from ..utils.http_client import SharedAsyncClient
+
 router = APIRouter()
 
+# Pooled, non-blocking client for calls to the MCP server
+mcp_http = SharedAsyncClient(timeout=30.0)
+
 class LoadPRDRequest(BaseModel):
     prd_id: str
 
@@ -56,7 +62,7 @@ async def load_prd_to_mcp(request: LoadPRDRequest):
         }
         
         # Call the MCP server
-        mcp_response = requests.post(
+        mcp_response = await mcp_http.get().post(
             f"{mcp_server_url}/mcp/call",
             json=mcp_request,
             headers={"Content-Type": "application/json"}
@@ -79,7 +85,7 @@ async def load_prd_to_mcp(request: LoadPRDRequest):
                 detail=f"Failed to load PRD into MCP server: {mcp_response.status_code}"
             )
             
-    except requests.exceptions.ConnectionError:
+    except (httpx.ConnectError, httpx.TimeoutException):
         raise HTTPException(
             status_code=503,
             detail="MCP server is not available. Please ensure it's running."
@@ -97,7 +103,7 @@ async def get_mcp_status():
         mcp_server_url = os.getenv('MCP_SERVER_URL', 'http://localhost:8001')
         
         # Try to ping the MCP server
-        response = requests.get(f"{mcp_server_url}/health", timeout=5)
+        response = await mcp_http.get().get(f"{mcp_server_url}/health", timeout=5)
         
         if response.status_code == 200:
             return {
@@ -112,7 +118,7 @@ async def get_mcp_status():
                 "url": mcp_server_url
             }
             
-    except requests.exceptions.ConnectionError:
+    except (httpx.ConnectError, httpx.TimeoutException):
         return {
             "success": False,
             "message": "MCP server is not available",
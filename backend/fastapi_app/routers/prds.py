@@ -1,16 +1,22 @@
 """
 Refactored PRD router with proper separation of concerns.
 """
+import math
+from datetime import datetime
 from typing import List, Optional, Union, Dict
-from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Form, Body
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Form, Body, Header
 from fastapi.responses import Response
 from pydantic import BaseModel
 
 from ..models.prd import (
     PRDCreate, PRDUpdate, PRDResponse, PRDType, PRDStatus,
-    PRDListResponse, PRDMarkdownResponse
+    PRDListResponse, PRDMarkdownResponse, PRDBatchGetRequest, PRDBatchGetResponse,
+    PRDContentUpdateRequest, PRDContentUpdateResponse, PRDImportRequest, PRDImportResponse
 )
 from ..services.prd_service import prd_service
+from ..services.github_api import GitHubAPIError, GitHubRateLimitedError
+from ..services.github_prd_index import get_github_prd_index
+from ..services.github_commit_batcher import get_github_commit_batcher
 
 router = APIRouter()
 
@@ -26,10 +32,43 @@ async def get_prds(
     skip: int = Query(0, ge=0, description="Number of PRDs to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of PRDs to return"),
     prd_type: Optional[PRDType] = Query(None, description="Filter by PRD type"),
-    status: Optional[PRDStatus] = Query(None, description="Filter by PRD status")
+    status: Optional[PRDStatus] = Query(None, description="Filter by PRD status"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only return PRDs created or updated at or after this timestamp"),
+    deleted_since: Optional[datetime] = Query(
+        None, description="Also return IDs of PRDs deleted at or after this timestamp")
 ):
-    """Get a list of PRDs with optional filtering and pagination."""
-    return await prd_service.get_prds(skip=skip, limit=limit, prd_type=prd_type, status=status)
+    """Get a list of PRDs with optional filtering and pagination.
+
+    Incremental consumers pass the previous response's `watermark` as
+    `updated_since`/`deleted_since` to fetch only the delta.
+    """
+    return await prd_service.get_prds(
+        skip=skip, limit=limit, prd_type=prd_type, status=status,
+        updated_since=updated_since, deleted_since=deleted_since)
+
+
+@router.post("/prds:batchGet", response_model=PRDBatchGetResponse)
+async def batch_get_prds(request_body: PRDBatchGetRequest):
+    """Get several PRDs by ID in one call.
+
+    Results are returned in request order, with `found: false` for unknown IDs.
+    """
+    return await prd_service.batch_get_prds(request_body.ids)
+
+
+@router.post("/prds/markdown:export")
+async def export_prds_markdown(request_body: PRDBatchGetRequest):
+    """Download several PRDs as markdown files in one zip.
+
+    Documents come from the same render cache as `/prds/{prd_id}/markdown`;
+    IDs that do not exist are listed in the `X-PRDs-Not-Found` header.
+    """
+    archive, not_found = await prd_service.export_prd_markdown(request_body.ids)
+    headers = {"Content-Disposition": "attachment; filename=prds-markdown.zip"}
+    if not_found:
+        headers["X-PRDs-Not-Found"] = ",".join(not_found)
+    return Response(content=archive, media_type="application/zip", headers=headers)
 
 
 # Devin AI workflow endpoints (must come before /prds/{prd_id} to avoid routing conflicts)
@@ -59,6 +98,17 @@ async def update_prd(prd_id: str, prd_data: PRDUpdate):
     return await prd_service.update_prd(prd_id, prd_data)
 
 
+@router.put("/prds/{prd_id}/content", response_model=PRDContentUpdateResponse)
+async def update_prd_content(prd_id: str, request_body: PRDContentUpdateRequest):
+    """
+    Replace a PRD's markdown with a new version.
+    
+    Only sections that changed are re-parsed, and only the fields they feed
+    are updated. The response lists added/modified/removed/unchanged sections.
+    """
+    return await prd_service.update_prd_content(prd_id, request_body.content, request_body.filename)
+
+
 @router.delete("/prds/{prd_id}")
 async def delete_prd(
     prd_id: str, 
@@ -89,6 +139,29 @@ async def upload_prd_file(file: UploadFile = File(...)):
     return await prd_service.upload_prd_file(file)
 
 
+@router.post("/prds/upload-archive", response_model=PRDImportResponse)
+async def upload_prd_archive(file: UploadFile = File(...)):
+    """Bulk import the .md/.txt files of a zip or tar(.gz) archive.
+
+    Returns one result per archive member, in archive order: created,
+    duplicate (of a stored PRD, or of an earlier identical member), failed,
+    or skipped for files that are not PRD documents.
+    """
+    return await prd_service.import_prd_archive(file)
+
+
+@router.post("/prds/import", response_model=PRDImportResponse)
+async def import_prds(request_body: PRDImportRequest):
+    """Bulk import PRD markdown documents.
+
+    Documents go through the same ingest pipeline as uploads, paced by its
+    slowest stage. Results are returned in request order; one failing
+    document does not fail the others.
+    """
+    return await prd_service.import_prds(
+        [(doc.content, doc.filename) for doc in request_body.documents])
+
+
 class IncomingPRDRequest(BaseModel):
     """Request model for incoming PRD submission."""
     content: str
@@ -106,7 +179,7 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
     Submit a PRD from ChatGPT - commits ONLY to GitHub (cloud source of truth).
     
     This is the preferred endpoint for ChatGPT Actions. It:
-    1. Checks for duplicates in GitHub
+    1. Checks for duplicates (database content hash, then the GitHub PRD index)
     2. Commits PRD to GitHub ONLY (no database writes)
     3. GitHub Actions will sync to database automatically
     
@@ -128,6 +201,7 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
         "status": "ok",
         "file_path": "prds/queue/2025-11-27_prd-title.md",
         "title": "PRD Title",
+        "prd_id": "uuid (also written to the file's front-matter)",
         "github_url": "https://github.com/...",
         "message": "PRD committed to GitHub (cloud source of truth)"
     }
@@ -135,10 +209,9 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
     """
     from datetime import datetime
     import re
-    import hashlib
-    import base64
-    import requests
     from ..config import config
+    from ..utils.prd_hash import calculate_prd_hash
+    from ..utils.simple_data_manager import data_manager
     import os
     
     content = request_body.content
@@ -165,19 +238,6 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
         text = re.sub(r"[^a-z0-9]+", "-", text)
         return text.strip("-") or "prd"
     
-    def normalize_text(text: str) -> str:
-        """Normalize text for consistent hashing (matches backend logic)"""
-        if not text:
-            return ""
-        text = text.lower()
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
-        text = re.sub(r'`(.+?)`', r'\1', text)
-        return text.strip()
-    
     date_str = datetime.utcnow().strftime("%Y-%m-%d")
     base = slugify(title)
     file_name = f"{date_str}_{base}.md"
@@ -185,7 +245,8 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
     
     # Get GitHub credentials
     github_token = config.github_token or os.getenv("GITHUB_TOKEN")
-    if not github_token:
+    # The local working-copy backend commits without the GitHub API
+    if not github_token and config.prd_source_backend != "local":
         raise HTTPException(
             status_code=500,
             detail="GitHub token not configured. Cannot commit PRD to GitHub."
@@ -194,21 +255,40 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
     repo_owner = os.getenv("GITHUB_ORG_NAME", "thedoctorJJ")
     repo_name = os.getenv("GITHUB_REPO_NAME", "ai-agent-factory")
     
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # Step 1: Check for duplicates in GitHub
+    # The file carries its PRD ID and database content hash in front-matter, so the
+    # row synced from it can later find the file with one index lookup
+    content, prd_id, prd_hash = await prd_service.with_identity_front_matter(content)
+    
+    # Step 1: Check for duplicates
+    # The database's indexed content_hash answers in one lookup, however long the queue is.
+    # Files committed since the last database sync are in the in-memory GitHub index, which
+    # is only refreshed from GitHub when it is older than the sync lag. A cold index (first
+    # submit after a start without a persisted index) is built on this request, since until
+    # then nothing covers files the database has not synced yet; concurrent submits share
+    # the one build.
+    index = get_github_prd_index(repo_owner, repo_name)
+    indexed = False
     try:
-        # Get list of files in prds/queue/
-        url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/prds/queue'
-        response = requests.get(url, headers=headers, timeout=10)
+        existing_prd = await data_manager.get_prd_by_hash(prd_hash)
+        if existing_prd:
+            existing = index.find_by_id(existing_prd["id"]) or index.find_by_hash(prd_hash)
+            existing_file = (existing["name"] if existing
+                             else (existing_prd.get("original_filename") or "").rsplit("/", 1)[-1])
+            return {
+                "status": "duplicate_prevented",
+                "message": f"PRD with identical content already exists: {existing_file or existing_prd['id']}",
+                "existing_file": existing_file,
+                "existing_prd_id": existing_prd["id"],
+                "github_url": existing.get("html_url", "") if existing else ""
+            }
         
-        if response.status_code == 200:
-            files = response.json()
-            
-            # Calculate hash of new content (title + first 500 chars of description)
+        age = index.age()
+        indexed = age is not None and age <= config.prd_db_sync_lag
+        if not indexed:
+            indexed = await index.refresh()
+        # If the refresh failed (e.g. scans are held back by the rate limit), a stale index still catches most duplicates
+        if indexed or len(index):
+            # Files committed before front-matter: hash of title + first 500 chars of description
             description = ""
             capture_desc = False
             for line in content_lines:
@@ -220,91 +300,71 @@ async def submit_prd_to_github(request_body: IncomingPRDRequest):
                 if capture_desc:
                     description += line + "\n"
             
-            norm_title = normalize_text(title)
-            norm_description = normalize_text(description)[:500]
-            new_content_key = f"{norm_title}::{norm_description}"
-            new_hash = hashlib.sha256(new_content_key.encode('utf-8')).hexdigest()
-            
-            # Check each existing PRD file
-            for item in files:
-                if isinstance(item, dict) and item.get("name", "").endswith(".md") and item.get("name") != "README.md":
-                    # Get file content
-                    file_content_url = item.get("download_url")
-                    if file_content_url:
-                        file_response = requests.get(file_content_url, timeout=10)
-                        if file_response.status_code == 200:
-                            existing_content = file_response.text
-                            
-                            # Extract title and description from existing file
-                            existing_lines = existing_content.split('\n')
-                            existing_title = ""
-                            existing_description = ""
-                            existing_capture_desc = False
-                            
-                            for line in existing_lines:
-                                if line.strip().startswith('# '):
-                                    existing_title = line[2:].strip()
-                                if line.strip().startswith('## Description'):
-                                    existing_capture_desc = True
-                                    continue
-                                if existing_capture_desc and line.strip().startswith('##'):
-                                    break
-                                if existing_capture_desc:
-                                    existing_description += line + "\n"
-                            
-                            # Normalize and hash existing content
-                            existing_norm_title = normalize_text(existing_title)
-                            existing_norm_desc = normalize_text(existing_description)[:500]
-                            existing_content_key = f"{existing_norm_title}::{existing_norm_desc}"
-                            existing_hash = hashlib.sha256(existing_content_key.encode('utf-8')).hexdigest()
-                            
-                            # Check if content matches
-                            if new_hash == existing_hash:
-                                return {
-                                    "status": "duplicate_prevented",
-                                    "message": f"PRD with identical content already exists: {item.get('name')}",
-                                    "existing_file": item.get("name"),
-                                    "github_url": item.get("html_url", "")
-                                }
+            new_hash = calculate_prd_hash(title, description)
+            existing = index.find_by_hash(prd_hash) or index.find_by_hash(new_hash)
+            if existing:
+                return {
+                    "status": "duplicate_prevented",
+                    "message": f"PRD with identical content already exists: {existing['name']}",
+                    "existing_file": existing["name"],
+                    "github_url": existing.get("html_url", "")
+                }
     except Exception as e:
         # If duplicate check fails, log but continue (don't block PRD creation)
         print(f"⚠️  Warning: Duplicate check failed: {e}")
     
     # Step 2: Check if exact filename already exists
-    check_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}'
-    check_response = requests.get(check_url, headers=headers, timeout=10)
+    if indexed:
+        filename_taken = index.get(file_name) is not None
+    else:
+        try:
+            filename_taken = await index.api.file_sha(file_path) is not None
+        except GitHubAPIError:
+            filename_taken = False
     
     # If filename exists, add timestamp to make unique
-    if check_response.status_code == 200:
+    if filename_taken:
         timestamp = datetime.utcnow().strftime("%H%M%S")
         file_name = f"{date_str}_{base}-{timestamp}.md"
         file_path = f"prds/queue/{file_name}"
     
     # Step 3: Commit PRD to GitHub
-    commit_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}'
-    commit_data = {
-        "message": f"Add PRD: {title} (from ChatGPT)",
-        "content": base64.b64encode(content.encode('utf-8')).decode('utf-8'),
-        "branch": "main"
-    }
-    
-    commit_response = requests.put(commit_url, headers=headers, json=commit_data, timeout=10)
-    
-    if commit_response.status_code not in [200, 201]:
-        error_detail = commit_response.json().get("message", "Unknown error")
+    # Submissions arriving together are written as one commit
+    batcher = get_github_commit_batcher(repo_owner, repo_name)
+    try:
+        commit_result = await batcher.add(file_path, content, f"Add PRD: {title} (from ChatGPT)")
+        if commit_result["status"] == "conflict" and not filename_taken:
+            # The index was not refreshed and someone else committed this filename meanwhile
+            timestamp = datetime.utcnow().strftime("%H%M%S")
+            file_name = f"{date_str}_{base}-{timestamp}.md"
+            file_path = f"prds/queue/{file_name}"
+            commit_result = await batcher.add(file_path, content, f"Add PRD: {title} (from ChatGPT)")
+    except GitHubRateLimitedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"GitHub rate limit reached, PRD not committed: {e}",
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    except GitHubAPIError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to commit PRD to GitHub: {error_detail}"
+            detail=f"Failed to commit PRD to GitHub: {e}"
         )
     
-    commit_result = commit_response.json()
+    if commit_result["status"] not in ("committed", "unchanged"):
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to commit PRD to GitHub: {commit_result.get('error', commit_result['status'])}"
+        )
+    index.record(commit_result["content"], content)
     
     return {
         "status": "ok",
         "file_path": file_path,
         "title": title,
-        "github_url": commit_result.get("content", {}).get("html_url", ""),
-        "commit_sha": commit_result.get("commit", {}).get("sha", ""),
+        "prd_id": prd_id,
+        "github_url": commit_result["content"]["html_url"],
+        "commit_sha": commit_result["commit_sha"],
         "message": "PRD committed to GitHub (cloud source of truth). GitHub Actions will sync to database automatically."
     }
 
@@ -337,24 +397,8 @@ async def submit_incoming_prd(request_body: IncomingPRDRequest):
     }
     ```
     """
-    from io import BytesIO
-    
-    # Create a fake uploaded file object
-    content_bytes = request_body.content.encode('utf-8')
-    file_obj = BytesIO(content_bytes)
-    
-    class IncomingFile:
-        def __init__(self, file_obj, filename):
-            self.file = file_obj
-            self.filename = filename
-            self.headers = {}
-        
-        async def read(self):
-            return self.file.read()
-    
-    # Use upload_prd_file which calls create_prd with hash-based duplicate detection
-    upload_file = IncomingFile(file_obj, "incoming-prd.md")
-    prd_response = await prd_service.upload_prd_file(upload_file)
+    # Parse the submitted text directly; create_prd applies hash-based duplicate detection
+    prd_response = await prd_service.create_prd_from_content(request_body.content, "incoming-prd.md")
     
     return {
         "status": "ok",
@@ -397,6 +441,9 @@ async def save_prd(req: SavePRDRequest):
         text = re.sub(r"[^a-z0-9]+", "-", text)
         return text.strip("-") or "prd"
     
+    # Reject oversized documents before anything is written
+    prd_service.check_document_size(req.content_markdown)
+    
     ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
     base = slugify(req.title)
     file_name = f"{base}-{ts}.md"
@@ -411,22 +458,7 @@ async def save_prd(req: SavePRDRequest):
     
     # Also submit to API for database storage
     try:
-        from io import BytesIO
-        
-        content_bytes = req.content_markdown.encode('utf-8')
-        file_obj = BytesIO(content_bytes)
-        
-        class IncomingFile:
-            def __init__(self, file_obj, filename):
-                self.file = file_obj
-                self.filename = filename
-                self.headers = {}
-            
-            async def read(self):
-                return self.file.read()
-        
-        upload_file = IncomingFile(file_obj, file_name)
-        prd_response = await prd_service.upload_prd_file(upload_file)
+        prd_response = await prd_service.create_prd_from_content(req.content_markdown, file_name)
         
         return {
             "status": "ok",
@@ -444,20 +476,28 @@ async def save_prd(req: SavePRDRequest):
 
 
 @router.get("/prds/{prd_id}/markdown", response_model=PRDMarkdownResponse)
-async def get_prd_markdown(prd_id: str):
-    """Get PRD as markdown for sharing with Devin AI."""
-    return await prd_service.get_prd_markdown(prd_id)
+async def get_prd_markdown(prd_id: str, response: Response,
+                           if_none_match: Optional[str] = Header(None)):
+    """Get PRD as markdown for sharing with Devin AI.
+
+    Answers `304 Not Modified` when `If-None-Match` holds the current ETag.
+    """
+    markdown_response = await prd_service.get_prd_markdown(prd_id, if_none_match)
+    response.headers["ETag"] = markdown_response.etag
+    response.headers["Cache-Control"] = "no-cache"
+    return markdown_response
 
 
 @router.get("/prds/{prd_id}/markdown/download")
-async def download_prd_markdown(prd_id: str):
+async def download_prd_markdown(prd_id: str, if_none_match: Optional[str] = Header(None)):
     """Download PRD as markdown file."""
-    markdown_response = await prd_service.get_prd_markdown(prd_id)
+    markdown_response = await prd_service.get_prd_markdown(prd_id, if_none_match)
     
     return Response(
         content=markdown_response.markdown,
         media_type="text/markdown",
-        headers={"Content-Disposition": f"attachment; filename={markdown_response.filename}"}
+        headers={"Content-Disposition": f"attachment; filename={markdown_response.filename}",
+                 "ETag": markdown_response.etag, "Cache-Control": "no-cache"}
     )
 
 
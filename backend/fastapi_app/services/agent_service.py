@@ -8,9 +8,11 @@ from fastapi import HTTPException
 
 from ..models.agent import (
     AgentRegistration, AgentResponse, AgentStatus, AgentHealthStatus,
-    AgentListResponse, AgentHealthResponse, AgentMetricsResponse
+    AgentListResponse, AgentHealthResponse, AgentMetricsResponse,
+    AgentBatchGetItem, AgentBatchGetResponse
 )
 from ..utils.simple_data_manager import data_manager
+from ..utils.delta import next_watermark
 
 
 class AgentService:
@@ -150,17 +152,57 @@ class AgentService:
 
         return AgentResponse(**agent_data)
 
+    async def batch_get_agents(self, agent_ids: List[str]) -> AgentBatchGetResponse:
+        """Get several agents by ID with a single storage lookup.
+
+        Results follow request order; unknown IDs get a not-found marker. A
+        storage failure is a 503, not a batch of not-found markers.
+        """
+        unique_ids = list(dict.fromkeys(agent_ids))
+        try:
+            agents_data = await data_manager.get_agents_by_ids(unique_ids)
+        except Exception as e:
+            print(f"❌ Error batch fetching agents from data manager: {e}")
+            raise HTTPException(status_code=503, detail="Agent storage is unavailable, retry shortly")
+
+        responses: Dict[str, AgentResponse] = {}
+        for agent in agents_data:
+            agent = dict(agent)
+            for field in ("created_at", "updated_at", "last_health_check"):
+                if isinstance(agent.get(field), str):
+                    agent[field] = datetime.fromisoformat(agent[field].replace('Z', '+00:00'))
+            try:
+                responses[str(agent["id"])] = AgentResponse(**agent)
+            except Exception as e:
+                print(f"❌ Error creating AgentResponse for agent {agent.get('id', 'unknown')}: {e}")
+
+        return AgentBatchGetResponse(
+            results=[
+                AgentBatchGetItem(id=agent_id, found=agent_id in responses,
+                                  agent=responses.get(agent_id))
+                for agent_id in agent_ids
+            ],
+            not_found=[agent_id for agent_id in unique_ids if agent_id not in responses]
+        )
+
     async def get_agents(
         self,
         skip: int = 0,
         limit: int = 100,
         status: Optional[AgentStatus] = None,
-        prd_id: Optional[str] = None
+        prd_id: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        deleted_since: Optional[datetime] = None
     ) -> AgentListResponse:
-        """Get a list of agents with optional filtering."""
+        """Get a list of agents with optional filtering.
+
+        `updated_since` restricts the result to agents changed at or after it;
+        `deleted_since` adds the IDs of agents deleted since then.
+        """
+        tombstones = await data_manager.get_tombstones("agents", deleted_since)
         try:
             # Use simplified data manager
-            agents_data = await data_manager.get_agents(skip, limit)
+            agents_data = await data_manager.get_agents(skip, limit, updated_since=updated_since)
         except Exception as e:
             print(f"❌ Error fetching agents from data manager: {e}")
             # Return empty list if data fetch fails
@@ -169,9 +211,13 @@ class AgentService:
                 total=0,
                 page=1,
                 size=limit,
-                has_next=False
+                has_next=False,
+                deleted_ids=[t["record_id"] for t in tombstones]
             )
 
+        # Watermark covers the whole page, before any records are filtered or skipped
+        watermark = next_watermark(agents_data, tombstones, updated_since, deleted_since)
+
         # Convert datetime strings and ensure proper formatting
         processed_agents = []
         for agent in agents_data:
@@ -269,7 +315,9 @@ class AgentService:
             total=len(agent_responses),
             page=skip // limit + 1 if limit > 0 else 1,
             size=limit,
-            has_next=len(agent_responses) == limit
+            has_next=len(agent_responses) == limit,
+            deleted_ids=[t["record_id"] for t in tombstones],
+            watermark=watermark
         )
 
     async def update_agent_status(
@@ -14,6 +14,11 @@ from ..models.devin import (
 from ..services.agent_service import agent_service
 from ..services.prd_service import prd_service
 from ..utils.database import db_manager
+from ..utils.delta import filter_changed_since, next_watermark
+from ..utils.http_client import SharedAsyncClient
+
+# Pooled, non-blocking client for calls back into this API
+_api_http = SharedAsyncClient(timeout=30.0)
 
 
 class DevinService:
@@ -97,14 +102,23 @@ class DevinService:
         skip: int = 0,
         limit: int = 100,
         status: Optional[DevinTaskStatus] = None,
-        prd_id: Optional[str] = None
+        prd_id: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+        deleted_since: Optional[datetime] = None
     ) -> DevinTaskListResponse:
-        """Get a list of Devin tasks with optional filtering."""
+        """Get a list of Devin tasks with optional filtering.
+
+        `updated_since` restricts the result to tasks changed at or after it;
+        `deleted_since` adds the IDs of tasks deleted since then.
+        """
+        tombstones = []
         # Try to get from database first
         try:
             if db_manager.is_connected():
-                tasks_data = await db_manager.get_devin_tasks(skip, limit)
+                tombstones = await db_manager.get_tombstones("devin_tasks", deleted_since)
+                tasks_data = await db_manager.get_devin_tasks(skip, limit, updated_since=updated_since)
                 if tasks_data:
+                    watermark = next_watermark(tasks_data, tombstones, updated_since, deleted_since)
                     # Convert datetime strings back to datetime objects
                     for task in tasks_data:
                         task["created_at"] = datetime.fromisoformat(task["created_at"].replace('Z', '+00:00'))
@@ -126,13 +140,15 @@ class DevinService:
                         total=len(filtered_tasks),
                         page=skip // limit + 1,
                         size=limit,
-                        has_next=len(filtered_tasks) == limit
+                        has_next=len(filtered_tasks) == limit,
+                        deleted_ids=[t["record_id"] for t in tombstones],
+                        watermark=watermark
                     )
         except Exception as e:
             print(f"Database get_tasks failed, using in-memory storage: {e}")
         
         # Fallback to in-memory storage
-        tasks = list(self._tasks_db.values())
+        tasks = filter_changed_since(self._tasks_db.values(), updated_since)
 
         # Apply filters
         if status:
@@ -140,8 +156,9 @@ class DevinService:
         if prd_id:
             tasks = [t for t in tasks if t["prd_id"] == prd_id]
 
-        # Sort by created_at descending
-        tasks.sort(key=lambda x: x["created_at"], reverse=True)
+        # Sort by created_at descending (delta queries keep oldest change first)
+        if updated_since is None:
+            tasks.sort(key=lambda x: x["created_at"], reverse=True)
 
         # Apply pagination
         total = len(tasks)
@@ -152,7 +169,9 @@ class DevinService:
             total=total,
             page=skip // limit + 1,
             size=limit,
-            has_next=skip + limit < total
+            has_next=skip + limit < total,
+            deleted_ids=[t["record_id"] for t in tombstones],
+            watermark=next_watermark(tasks, tombstones, updated_since, deleted_since)
         )
 
     async def execute_task(self, task_id: str) -> DevinTaskExecuteResponse:
@@ -516,10 +535,8 @@ Start by calling the MCP tools to get the complete PRD information!
     async def _load_prd_to_mcp(self, prd_id: str):
         """Load PRD data into the MCP server cache"""
         try:
-            import requests
-            
-            # Call our MCP integration endpoint
-            response = requests.post(
+            # Call our MCP integration endpoint (async: this server answers it on the same event loop)
+            response = await _api_http.get().post(
                 "http://localhost:8000/api/v1/mcp/load-prd",
                 json={"prd_id": prd_id}
             )
@@ -0,0 +1,362 @@
+"""
+GitHub access layer.
+Directory scans use the Git Trees API (one recursive call, no 1000-entry cap
+like the Contents API) and every GET is conditional: responses are cached by
+URL with their ETag and revalidated with If-None-Match, so an unchanged scan
+comes back as a 304, which GitHub does not count against the rate limit.
+Requests are async over a pooled keep-alive client, and fan-out downloads
+run with bounded concurrency, so GitHub calls never block the event loop.
+All requests for one token go through a shared GitHubRequestScheduler
+(see github_scheduler.py): commits and deletes go ahead of scans, the
+rate-limit budget is tracked from GitHub's headers, and rate-limited
+requests are retried after the advertised wait.
+"""
+import asyncio
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ..utils.http_client import SharedAsyncClient
+from .github_scheduler import GitHubPriority, GitHubRequestScheduler
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_RAW_URL = "https://raw.githubusercontent.com"
+
+# Conditional-request cache entries (URL -> ETag and decoded body)
+ETAG_CACHE_SIZE = 256
+
+# Retries of a rate-limited request whose wait fits within the scheduler's max_wait
+RATE_LIMIT_RETRIES = 2
+
+
+class GitHubAPIError(Exception):
+    """A GitHub request failed (status_code is None for transport errors)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GitHubRateLimitedError(GitHubAPIError):
+    """GitHub's rate limit (or our reserve for writes) left no budget in time."""
+
+    def __init__(self, message: str, retry_after: float, status_code: Optional[int] = None):
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+
+class GitHubAPI:
+    """Conditional, tree-based async access to one GitHub repository."""
+
+    def __init__(self, token: str, repo_owner: str, repo_name: str, branch: str = "main",
+                 base_url: str = DEFAULT_API_URL, raw_url: Optional[str] = None, timeout: float = 10,
+                 max_connections: int = 10, download_concurrency: int = 8,
+                 scheduler: Optional[GitHubRequestScheduler] = None):
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.branch = branch
+        self.base_url = base_url.rstrip("/")
+        # Raw file downloads are not API calls; only used with github.com unless given explicitly
+        if raw_url is None and self.base_url == DEFAULT_API_URL:
+            raw_url = f"{DEFAULT_RAW_URL}/{repo_owner}/{repo_name}/{branch}"
+        self.raw_url = raw_url.rstrip("/") if raw_url else None
+        self.download_concurrency = max(1, download_concurrency)
+        self.scheduler = scheduler or GitHubRequestScheduler(max_in_flight=max_connections)
+        self.http = SharedAsyncClient(
+            timeout=timeout, max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            headers={
+                'Authorization': f'token {token}',
+                'Accept': 'application/vnd.github.v3+json'
+            })
+        self._etags: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "not_modified": 0, "rate_limit_cost": 0,
+                       "raw_downloads": 0, "truncated_trees": 0}
+        self.rate_limit_remaining: Optional[int] = None
+
+    @property
+    def repo_url(self) -> str:
+        return f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
+
+    def html_url(self, path: str) -> str:
+        return f"https://github.com/{self.repo_owner}/{self.repo_name}/blob/{self.branch}/{path}"
+
+    async def _request(self, method: str, url: str, priority: GitHubPriority = GitHubPriority.READ,
+                       raw: bool = False, **kwargs) -> httpx.Response:
+        cost = 0 if raw else 1  # raw downloads do not count against the API rate limit
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                await self.scheduler.acquire(priority, cost)
+            except asyncio.TimeoutError:
+                retry_after = self.scheduler.retry_after()
+                raise GitHubRateLimitedError(
+                    f"GitHub rate limit budget unavailable, retry in {retry_after:g}s", retry_after)
+            try:
+                response = await self.http.get().request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                self.scheduler.finish(cost)
+                raise GitHubAPIError(f"GitHub request failed: {e!r}") from e
+            except BaseException:
+                self.scheduler.finish(cost)
+                raise
+            body_text = response.text if response.status_code in (403, 429) else ""
+            wait = self.scheduler.finish(cost, response.status_code, response.headers, body_text)
+            self._count(response, raw)
+            if wait is None:
+                return response
+            if attempt == RATE_LIMIT_RETRIES or wait > self.scheduler.max_wait:
+                raise GitHubRateLimitedError(f"GitHub rate limit hit, retry in {wait:g}s", wait,
+                                             response.status_code)
+            # The retry's acquire() waits until the scheduler's backoff or reset has passed
+        raise AssertionError("unreachable")
+
+    def _count(self, response: httpx.Response, raw: bool) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            if raw:
+                self._stats["raw_downloads"] += 1
+                return
+            if response.status_code == 304:
+                self._stats["not_modified"] += 1
+            else:
+                self._stats["rate_limit_cost"] += 1
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit_remaining = int(remaining)
+
+    async def get_json(self, url: str, conditional: bool = True,
+                       priority: GitHubPriority = GitHubPriority.READ) -> Tuple[Any, bool]:
+        """GET with If-None-Match. Returns (body, changed); changed is False on a 304.
+
+        Pass conditional=False for immutable resources (blobs) that would
+        only crowd the ETag cache.
+        """
+        with self._lock:
+            cached = self._etags.get(url) if conditional else None
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        response = await self._request("GET", url, priority, headers=headers)
+        if response.status_code == 304 and cached:
+            with self._lock:
+                self._etags.move_to_end(url)
+            return cached[1], False
+        if response.status_code != 200:
+            raise GitHubAPIError(f"GET {url} returned {response.status_code}", response.status_code)
+        body = response.json()
+        etag = response.headers.get("ETag")
+        if etag and conditional:
+            with self._lock:
+                self._etags[url] = (etag, body)
+                self._etags.move_to_end(url)
+                while len(self._etags) > ETAG_CACHE_SIZE:
+                    self._etags.popitem(last=False)
+        return body, True
+
+    async def list_tree(self, directory: str = "") -> Tuple[List[Dict[str, Any]], bool]:
+        """Files (blobs) under `directory`, recursively, in one conditional request.
+
+        Returns (entries, changed). Each entry has name, path (repo-relative),
+        sha and size. If GitHub truncates the whole-repo tree, the directory's
+        own subtree is listed instead.
+        """
+        directory = directory.strip("/")
+        tree, changed = await self.get_json(f"{self.repo_url}/git/trees/{self.branch}?recursive=1",
+                                            priority=GitHubPriority.SCAN)
+        if tree.get("truncated") and directory:
+            with self._lock:
+                self._stats["truncated_trees"] += 1
+            subtree_sha = await self._subtree_sha(tree, directory)
+            if subtree_sha is None:
+                return [], changed
+            tree, sub_changed = await self.get_json(f"{self.repo_url}/git/trees/{subtree_sha}?recursive=1",
+                                                    priority=GitHubPriority.SCAN)
+            return self._blobs(tree, directory, relative=True), changed or sub_changed
+        return self._blobs(tree, directory), changed
+
+    async def _subtree_sha(self, tree: Dict[str, Any], directory: str) -> Optional[str]:
+        for item in tree.get("tree", []):
+            if item.get("type") == "tree" and item.get("path") == directory:
+                return item["sha"]
+        # Not in the truncated listing: walk down one level at a time
+        sha = self.branch
+        for part in directory.split("/"):
+            level, _ = await self.get_json(f"{self.repo_url}/git/trees/{sha}", priority=GitHubPriority.SCAN)
+            sha = next((item["sha"] for item in level.get("tree", [])
+                        if item.get("type") == "tree" and item.get("path") == part), None)
+            if sha is None:
+                return None
+        return sha
+
+    @staticmethod
+    def _blobs(tree: Dict[str, Any], directory: str, relative: bool = False) -> List[Dict[str, Any]]:
+        prefix = f"{directory}/" if directory else ""
+        entries = []
+        for item in tree.get("tree", []):
+            if item.get("type") != "blob":
+                continue
+            path = f"{prefix}{item['path']}" if relative else item["path"]
+            if prefix and not path.startswith(prefix):
+                continue
+            entries.append({"name": path.rsplit("/", 1)[-1], "path": path,
+                            "sha": item["sha"], "size": item.get("size")})
+        return entries
+
+    async def get_blob(self, sha: str, priority: GitHubPriority = GitHubPriority.READ) -> str:
+        """Decoded text of a blob (blobs are immutable, so callers can cache by SHA)."""
+        body, _ = await self.get_json(f"{self.repo_url}/git/blobs/{sha}", conditional=False,
+                                      priority=priority)
+        if body.get("encoding") == "base64":
+            return base64.b64decode(body.get("content", "")).decode("utf-8")
+        return body.get("content", "")
+
+    async def read_file(self, path: str, sha: str,
+                        priority: GitHubPriority = GitHubPriority.READ) -> str:
+        """Text of the file at `path` whose blob SHA is `sha`.
+
+        Downloads the raw file (free of API rate limit) and checks it hashes
+        to `sha`; if the branch moved on since the listing, or no raw URL is
+        available, the blob is fetched through the API instead.
+        """
+        if self.raw_url:
+            response = await self._request("GET", f"{self.raw_url}/{path}", priority, raw=True)
+            if response.status_code == 200:
+                data = response.content
+                if hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest() == sha:
+                    return data.decode("utf-8")
+        return await self.get_blob(sha, priority)
+
+    async def read_files(self, items: Sequence[Tuple[str, str]],
+                         priority: GitHubPriority = GitHubPriority.SCAN) -> List[Any]:
+        """read_file for many (path, sha) pairs, at most `download_concurrency` at a time.
+
+        Results are in input order; a failed download is returned as its
+        exception rather than raised.
+        """
+        slots = asyncio.Semaphore(self.download_concurrency)
+
+        async def read(path: str, sha: str) -> str:
+            async with slots:
+                return await self.read_file(path, sha, priority)
+
+        return await asyncio.gather(*(read(path, sha) for path, sha in items), return_exceptions=True)
+
+    async def file_sha(self, path: str, ref: Optional[str] = None,
+                       priority: GitHubPriority = GitHubPriority.READ) -> Optional[str]:
+        """Blob SHA of `path` at `ref` (the branch by default), or None if there is no such file."""
+        try:
+            body, _ = await self.get_json(f"{self.repo_url}/contents/{path}?ref={ref or self.branch}",
+                                          conditional=False, priority=priority)
+        except GitHubAPIError as e:
+            if e.status_code == 404:
+                return None
+            raise
+        return body.get("sha") if isinstance(body, dict) else None
+
+    async def put_file(self, path: str, content: str, message: str,
+                       sha: Optional[str] = None) -> Dict[str, Any]:
+        """Create or update a file via the Contents API; returns the API response."""
+        data = {
+            "message": message,
+            "content": base64.b64encode(content.encode('utf-8')).decode('utf-8'),
+            "branch": self.branch
+        }
+        if sha:
+            data["sha"] = sha
+        response = await self._request("PUT", f"{self.repo_url}/contents/{path}", GitHubPriority.WRITE,
+                                       json=data)
+        if response.status_code not in (200, 201):
+            raise GitHubAPIError(_error_message(response), response.status_code)
+        return response.json()
+
+    async def delete_file(self, path: str, sha: str, message: str) -> Dict[str, Any]:
+        response = await self._request("DELETE", f"{self.repo_url}/contents/{path}", GitHubPriority.WRITE,
+                                       json={"message": message, "sha": sha, "branch": self.branch})
+        if response.status_code not in (200, 204):
+            raise GitHubAPIError(_error_message(response), response.status_code)
+        return response.json() if response.content else {}
+
+    # -- Git Data API (one commit for many files; see github_commit_batcher.py) --
+
+    async def _send_json(self, method: str, url: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._request(method, url, GitHubPriority.WRITE, json=data)
+        if response.status_code not in (200, 201):
+            raise GitHubAPIError(_error_message(response), response.status_code)
+        return response.json()
+
+    async def get_head(self) -> str:
+        """Commit SHA the branch points at (never cached: it is the base of a commit)."""
+        body, _ = await self.get_json(f"{self.repo_url}/git/ref/heads/{self.branch}", conditional=False,
+                                      priority=GitHubPriority.WRITE)
+        return body["object"]["sha"]
+
+    async def create_tree(self, base_tree: str, entries: List[Dict[str, Any]]) -> str:
+        """New tree from `base_tree` plus entries (inline `content`, or `sha: None` to delete)."""
+        body = await self._send_json("POST", f"{self.repo_url}/git/trees",
+                                     {"base_tree": base_tree, "tree": entries})
+        return body["sha"]
+
+    async def create_commit(self, message: str, tree: str, parents: List[str]) -> str:
+        body = await self._send_json("POST", f"{self.repo_url}/git/commits",
+                                     {"message": message, "tree": tree, "parents": parents})
+        return body["sha"]
+
+    async def update_head(self, commit_sha: str) -> None:
+        """Fast-forward the branch; 409/422 if it moved since the commit's parent was read."""
+        await self._send_json("PATCH", f"{self.repo_url}/git/refs/heads/{self.branch}",
+                              {"sha": commit_sha, "force": False})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"repository": f"{self.repo_owner}/{self.repo_name}",
+                    "cached_etags": len(self._etags),
+                    "rate_limit_remaining": self.rate_limit_remaining, **self._stats,
+                    "scheduler": self.scheduler.stats()}
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return response.json().get("message", "Unknown error")
+    except ValueError:
+        return response.text or "No error message"
+
+
+_clients: Dict[Tuple[str, str], GitHubAPI] = {}
+_schedulers: Dict[str, GitHubRequestScheduler] = {}
+_clients_lock = threading.Lock()
+
+
+def get_github_api(repo_owner: str, repo_name: str) -> GitHubAPI:
+    """Shared client for a repository (token, base URL and pool limits from config).
+
+    Clients for the same token share one scheduler, as GitHub's rate limit
+    is per token rather than per repository.
+    """
+    from ..config import config
+
+    key = (repo_owner, repo_name)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            token = config.github_token or ""
+            scheduler = _schedulers.get(token)
+            if scheduler is None:
+                scheduler = _schedulers[token] = GitHubRequestScheduler(
+                    max_in_flight=config.github_max_connections,
+                    reserve=config.github_write_reserve,
+                    max_wait=config.github_max_queue_wait)
+            client = _clients[key] = GitHubAPI(token, repo_owner, repo_name,
+                                               base_url=config.github_api_url,
+                                               raw_url=config.github_raw_url,
+                                               max_connections=config.github_max_connections,
+                                               download_concurrency=config.github_download_concurrency,
+                                               scheduler=scheduler)
+        return client
+
+
+def all_github_apis() -> List[GitHubAPI]:
+    with _clients_lock:
+        return list(_clients.values())
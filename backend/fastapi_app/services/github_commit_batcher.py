@@ -0,0 +1,323 @@
+"""
+GitHub commit batcher.
+File adds and deletes are collected for a short window (or until max_files
+are pending) and written as one commit through the Git Data API: read the
+branch head and its tree, create one tree with every change, create one
+commit, and fast-forward the branch. If the branch moved meanwhile the ref
+update is rejected and the batch is rebuilt on the new head, so concurrent
+writers never overwrite each other. Each change is checked against the
+head tree first and gets its own result (committed, unchanged, conflict or
+not_found) without failing the rest of the batch. A batch with a single
+change goes through the Contents API instead, after the same check.
+Batches run one at a time; changes arriving meanwhile form the next batch.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .github_api import GitHubAPI, GitHubAPIError, get_github_api
+from .github_scheduler import GitHubPriority
+
+# Rebuilds of a batch whose ref update lost a race with another writer
+REF_CONFLICT_RETRIES = 3
+
+
+def blob_sha(content: str) -> str:
+    """Git blob SHA-1 of text as it will be stored (UTF-8)"""
+    data = content.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FileChange:
+    """One file to write (content given) or delete (content None).
+
+    `sha` is the blob the file must currently have: required to overwrite
+    an existing file, optional for deletes. Without it an add only creates.
+    """
+    __slots__ = ("path", "content", "message", "sha")
+
+    def __init__(self, path: str, content: Optional[str] = None, message: str = "",
+                 sha: Optional[str] = None):
+        self.path = path.strip("/")
+        self.content = content
+        self.message = message
+        self.sha = sha
+
+    @property
+    def is_delete(self) -> bool:
+        return self.content is None
+
+
+class _RefConflict(Exception):
+    """The branch moved between reading its head and updating it."""
+
+
+class GitHubCommitBatcher:
+    """Coalesces file changes for one repository into as few commits as possible."""
+
+    def __init__(self, api: GitHubAPI, window: float = 0.2, max_files: int = 50):
+        self.api = api
+        self.window = max(0.0, window)
+        self.max_files = max(1, max_files)
+        self._pending: List[Tuple[FileChange, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._commit_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "files": 0, "commits": 0, "single_file_commits": 0,
+                       "ref_conflicts": 0, "failed_batches": 0, "rejected_files": 0,
+                       "commit_seconds": 0.0}
+
+    # -- public ----------------------------------------------------------------
+
+    async def add(self, path: str, content: str, message: str, sha: Optional[str] = None) -> Dict[str, Any]:
+        """Create `path` (or overwrite it if `sha` matches its current blob)."""
+        return await self._enqueue(FileChange(path, content, message, sha))
+
+    async def delete(self, path: str, message: str, sha: Optional[str] = None) -> Dict[str, Any]:
+        return await self._enqueue(FileChange(path, None, message, sha))
+
+    async def commit(self, changes: Sequence[FileChange]) -> List[Dict[str, Any]]:
+        """Queue many changes at once; results are in input order.
+
+        Raises GitHubAPIError if a batch could not be committed at all.
+        """
+        futures = [self._enqueue(change) for change in changes]
+        return list(await asyncio.gather(*futures))
+
+    # -- batching --------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending futures and the lock belong to a finished loop
+            self._pending = []
+            self._timer = None
+            self._commit_lock = asyncio.Lock()
+            self._loop = loop
+        return loop
+
+    def _enqueue(self, change: FileChange) -> asyncio.Future:
+        loop = self._ensure_loop()
+        future = loop.create_future()
+        self._pending.append((change, future))
+        if len(self._pending) >= self.max_files:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_files], self._pending[self.max_files:]
+        if self._pending:
+            self._timer = self._loop.call_later(self.window, self._flush)
+        if batch:
+            self._loop.create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[FileChange, asyncio.Future]]) -> None:
+        async with self._commit_lock:
+            started = time.perf_counter()
+            changes = [change for change, _ in batch]
+            try:
+                results = await self._commit_batch(changes)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed_batches"] += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["files"] += sum(r["status"] == "committed" for r in results)
+                self._stats["rejected_files"] += sum(r["status"] in ("conflict", "not_found") for r in results)
+                self._stats["commit_seconds"] += time.perf_counter() - started
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    # -- committing ------------------------------------------------------------
+
+    async def _commit_batch(self, changes: List[FileChange]) -> List[Dict[str, Any]]:
+        if len(changes) == 1:
+            return [await self._commit_single(changes[0])]
+        for attempt in range(REF_CONFLICT_RETRIES + 1):
+            try:
+                return await self._commit_tree(changes)
+            except _RefConflict:
+                with self._lock:
+                    self._stats["ref_conflicts"] += 1
+                if attempt == REF_CONFLICT_RETRIES:
+                    raise GitHubAPIError(f"Branch {self.api.branch} kept moving; batch not committed", 409)
+        raise AssertionError("unreachable")
+
+    async def _commit_single(self, change: FileChange) -> Dict[str, Any]:
+        """One change: a Contents API PUT/DELETE, checked like a batched change"""
+        try:
+            current = await self.api.file_sha(change.path, priority=GitHubPriority.WRITE)
+            status, error = self._check(change, current)
+            if status is not None:
+                return self._result(change, status, error=error)
+            if change.is_delete:
+                body = await self.api.delete_file(change.path, current, change.message)
+            else:
+                body = await self.api.put_file(change.path, change.content, change.message, change.sha)
+            commit_sha = (body.get("commit") or {}).get("sha", "")
+        except GitHubAPIError as e:
+            if e.status_code == 404:
+                return self._result(change, "not_found", error=str(e))
+            if e.status_code in (409, 422):
+                return self._result(change, "conflict", error=str(e))
+            raise
+        with self._lock:
+            self._stats["commits"] += 1
+            self._stats["single_file_commits"] += 1
+        return self._result(change, "committed", commit_sha)
+
+    async def _commit_tree(self, changes: List[FileChange]) -> List[Dict[str, Any]]:
+        head = await self.api.get_head()
+        tree, _ = await self.api.get_json(f"{self.api.repo_url}/git/trees/{head}?recursive=1",
+                                          conditional=False, priority=GitHubPriority.WRITE)
+        existing: Dict[str, str] = {item["path"]: item["sha"] for item in tree.get("tree", [])
+                                    if item.get("type") == "blob"}
+
+        async def current_sha(path: str) -> Optional[str]:
+            if path in existing or not tree.get("truncated"):
+                return existing.get(path)
+            return await self.api.file_sha(path, head, priority=GitHubPriority.WRITE)
+
+        results, accepted = await self._plan(changes, current_sha)
+        entries: List[Dict[str, Any]] = []
+        for i in accepted:
+            change = changes[i]
+            if change.is_delete:
+                entries.append({"path": change.path, "mode": "100644", "type": "blob", "sha": None})
+            else:
+                entries.append({"path": change.path, "mode": "100644", "type": "blob",
+                                "content": change.content})
+
+        commit_sha = ""
+        if entries:
+            new_tree = await self.api.create_tree(tree["sha"], entries)
+            commit_sha = await self.api.create_commit(self._message([changes[i] for i in accepted]),
+                                                      new_tree, [head])
+            try:
+                await self.api.update_head(commit_sha)
+            except GitHubAPIError as e:
+                if e.status_code in (409, 422):
+                    raise _RefConflict() from e
+                raise
+            with self._lock:
+                self._stats["commits"] += 1
+        for i in accepted:
+            results[i] = self._result(changes[i], "committed", commit_sha)
+        return results
+
+    async def _plan(self, changes: List[FileChange],
+                    current_sha: Callable[[str], Awaitable[Optional[str]]]
+                    ) -> Tuple[List[Optional[Dict[str, Any]]], List[int]]:
+        """Check each change against the file's current blob SHA.
+
+        Returns (results, accepted): results hold the outcome of rejected and
+        no-op changes (None for the rest), accepted the indexes to commit.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(changes)
+        accepted: List[int] = []
+        seen = set()
+        for i, change in enumerate(changes):
+            if change.path in seen:
+                results[i] = self._result(change, "conflict", error="Path changed twice in one batch")
+                continue
+            status, error = self._check(change, await current_sha(change.path))
+            if status is not None:
+                # Rejected and no-op changes leave the path free for later ones
+                results[i] = self._result(change, status, error=error)
+                continue
+            seen.add(change.path)
+            accepted.append(i)
+        return results, accepted
+
+    @staticmethod
+    def _check(change: FileChange, current: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """(status, error) if the change cannot or need not be applied, else (None, None)"""
+        if change.is_delete:
+            if current is None:
+                return "not_found", "File does not exist"
+            if change.sha and change.sha != current:
+                return "conflict", f"File is at {current}, not {change.sha}"
+            return None, None
+        if current is None:
+            if change.sha:
+                return "not_found", "File to update does not exist"
+            return None, None
+        if current == blob_sha(change.content):
+            return "unchanged", None
+        if change.sha != current:
+            return "conflict", "File already exists" if not change.sha else f"File is at {current}, not {change.sha}"
+        return None, None
+
+    @staticmethod
+    def _message(changes: List[FileChange]) -> str:
+        if len(changes) == 1:
+            return changes[0].message
+        lines = [f"- {change.message or change.path}" for change in changes]
+        return f"Update {len(changes)} files\n\n" + "\n".join(lines)
+
+    def _result(self, change: FileChange, status: str, commit_sha: str = "",
+                error: Optional[str] = None) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"path": change.path, "status": status, "commit_sha": commit_sha}
+        if status in ("committed", "unchanged") and not change.is_delete:
+            # Shaped like the Contents API's `content` object, for GitHubPRDIndex.record
+            result["content"] = {"name": change.path.rsplit("/", 1)[-1], "path": change.path,
+                                 "sha": blob_sha(change.content), "html_url": self.api.html_url(change.path)}
+        if error:
+            result["error"] = error
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["files_per_commit"] = round(stats["files"] / stats["commits"], 2) if stats["commits"] else 0.0
+        stats["avg_commit_ms"] = round(stats.pop("commit_seconds") / stats["batches"] * 1000, 1) \
+            if stats["batches"] else 0.0
+        return {"repository": f"{self.api.repo_owner}/{self.api.repo_name}",
+                "window_ms": round(self.window * 1000), "max_files": self.max_files,
+                "pending": len(self._pending), **stats}
+
+
+_batchers: Dict[Tuple[str, str], GitHubCommitBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_github_commit_batcher(repo_owner: str, repo_name: str) -> GitHubCommitBatcher:
+    """Shared batcher for a repository (window and batch size from config).
+
+    With PRD_SOURCE_BACKEND=local, batches are committed to the local working copy.
+    """
+    from ..config import config
+
+    key = (repo_owner, repo_name)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            if config.prd_source_backend == "local":
+                from .local_git_repo import LocalGitCommitBatcher, get_local_git_repo
+                batcher = LocalGitCommitBatcher(get_local_git_repo(repo_owner, repo_name),
+                                                window=config.github_commit_window_ms / 1000,
+                                                max_files=config.github_commit_max_files)
+            else:
+                batcher = GitHubCommitBatcher(get_github_api(repo_owner, repo_name),
+                                              window=config.github_commit_window_ms / 1000,
+                                              max_files=config.github_commit_max_files)
+            _batchers[key] = batcher
+        return batcher
+
+
+def all_github_commit_batchers() -> List[GitHubCommitBatcher]:
+    with _batchers_lock:
+        return list(_batchers.values())
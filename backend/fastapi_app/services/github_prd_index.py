@@ -0,0 +1,300 @@
+"""
+GitHub PRD index.
+Filename -> blob SHA, content hash and title for the PRD files in a GitHub
+directory (prds/queue by default). A refresh lists the repository tree with
+one conditional request and only downloads blobs it has not seen, so
+duplicate checks and deletes look files up without downloading anything,
+and an unchanged file is never fetched twice. Files are also keyed by the
+PRD ID and content hash in their front-matter (see prd_front_matter.py),
+so a database row finds its file with one dictionary lookup. The index can
+be persisted to a JSON file so it survives restarts.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.prd_front_matter import front_matter_identity
+from ..utils.prd_hash import calculate_prd_hash
+from .github_api import GitHubAPI, GitHubAPIError
+
+PRD_QUEUE_DIR = "prds/queue"
+
+# Bump when the stored per-file fields change
+INDEX_VERSION = 2
+
+_FIRST_H1_RE = re.compile(r'^[^\S\n]*# (.*)$', re.MULTILINE)
+
+
+def file_identity(content: str) -> Tuple[str, str]:
+    """(title, content_hash) of a PRD file as stored in GitHub.
+
+    The hash uses the same extraction the GitHub duplicate checks always
+    used: the last H1 before the end of the `## Description` section and the
+    raw lines of that section. The title is the first H1.
+    """
+    hash_title = ""
+    description = ""
+    capture_desc = False
+    for line in content.split('\n'):
+        line_stripped = line.strip()
+        if line_stripped.startswith('# '):
+            hash_title = line[2:].strip()
+        if line_stripped.startswith('## Description'):
+            capture_desc = True
+            continue
+        if capture_desc and line_stripped.startswith('##'):
+            break
+        if capture_desc:
+            description += line + "\n"
+
+    first_h1 = _FIRST_H1_RE.search(content)
+    title = first_h1.group(1).strip() if first_h1 else ""
+    return title, calculate_prd_hash(hash_title, description)
+
+
+class GitHubPRDIndex:
+    """Incrementally refreshed index of the PRD markdown files in one repo directory.
+
+    `api` is a GitHubAPI, or a LocalGitRepo (same listing and read methods).
+    """
+
+    def __init__(self, api: GitHubAPI, directory: str = PRD_QUEUE_DIR,
+                 index_path: Optional[str] = None):
+        self.api = api
+        self.directory = directory.strip("/")
+        self.index_path = Path(index_path) if index_path else None
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._by_id: Dict[str, str] = {}  # front-matter prd_id -> filename
+        self._by_hash: Dict[str, str] = {}  # content hash (computed or front-matter) -> filename
+        self._synced = False
+        self._refreshed_at: Optional[float] = None  # time.monotonic() of the last successful refresh
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._stats = {"refreshes": 0, "refresh_errors": 0, "listings": 0, "unchanged_listings": 0,
+                       "downloads": 0, "reused": 0, "removed": 0}
+        self._load()
+
+    async def refresh(self) -> bool:
+        """Bring the index up to date with the repository tree.
+
+        One conditional tree request (a 304 when nothing changed), plus one
+        download per file whose blob SHA is new, run concurrently. Callers
+        arriving while a refresh is running share it. Returns False (keeping
+        the previous state) if GitHub could not be listed.
+        """
+        # Shielded: a cancelled caller must not cancel the refresh others are awaiting
+        return await asyncio.shield(self.start_refresh())
+
+    def start_refresh(self) -> asyncio.Task:
+        """Start a refresh (or join the running one) without waiting for it."""
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._refresh_task = loop.create_task(self._refresh())
+        return task
+
+    async def _refresh(self) -> bool:
+        try:
+            tree, changed = await self.api.list_tree(self.directory)
+        except GitHubAPIError as e:
+            print(f"⚠️  Could not list GitHub {self.directory}/: {e}")
+            with self._lock:
+                self._stats["refresh_errors"] += 1
+            return False
+        with self._lock:
+            self._stats["listings"] += 1
+            if not changed and self._synced:
+                self._stats["unchanged_listings"] += 1
+                self._stats["refreshes"] += 1
+                self._refreshed_at = time.monotonic()
+                return True
+        # Only files directly in the directory, as the Contents API listed them
+        listing = [item for item in tree
+                   if item["path"] == f"{self.directory}/{item['name']}"
+                   and item["name"].endswith(".md") and item["name"] != "README.md"]
+
+        with self._lock:
+            known = {entry["sha"]: entry for entry in self._files.values()}
+        new_items = [item for item in listing if item["sha"] not in known]
+        contents = await self.api.read_files([(item["path"], item["sha"]) for item in new_items])
+        downloaded = {}
+        for item, content in zip(new_items, contents):
+            if isinstance(content, BaseException):
+                print(f"   ⚠️  Error reading file {item['name']}: {content}")
+                continue
+            downloaded[item["sha"]] = content
+
+        files: Dict[str, Dict[str, Any]] = {}
+        changed = False
+        complete = len(downloaded) == len(new_items)
+        with self._lock:
+            self._stats["downloads"] += len(new_items)
+            for item in listing:
+                name, sha = item["name"], item["sha"]
+                html_url = self.api.html_url(item["path"])
+                cached = known.get(sha)
+                if cached is not None:
+                    # Same blob (possibly renamed): nothing to download
+                    entry = dict(cached, name=name, path=item["path"], html_url=html_url)
+                    changed = changed or self._files.get(name) != entry
+                    self._stats["reused"] += 1
+                elif sha in downloaded:
+                    entry = self._entry(dict(item, html_url=html_url), downloaded[sha])
+                    changed = True
+                else:
+                    continue
+                files[name] = entry
+
+            removed = set(self._files) - set(files)
+            self._stats["removed"] += len(removed)
+            self._stats["refreshes"] += 1
+            self._files = files
+            self._reindex()
+            self._synced = complete
+            self._refreshed_at = time.monotonic()
+        if changed or removed:
+            self._save()
+        return True
+
+    def _entry(self, item: Dict[str, Any], content: str) -> Dict[str, Any]:
+        title, content_hash = file_identity(content)
+        prd_id, front_matter_hash = front_matter_identity(content)
+        name = item["name"]
+        return {
+            "name": name,
+            "path": item.get("path", f"{self.directory}/{name}"),
+            "sha": item.get("sha", ""),
+            "content_hash": content_hash,
+            "prd_id": prd_id,
+            "front_matter_hash": front_matter_hash,
+            "title": title,
+            "html_url": item.get("html_url", ""),
+        }
+
+    def _reindex(self) -> None:
+        """Rebuild the ID and hash lookups (call with the lock held); first file by name wins"""
+        self._by_id, self._by_hash = {}, {}
+        for name in sorted(self._files):
+            entry = self._files[name]
+            if entry.get("prd_id"):
+                self._by_id.setdefault(entry["prd_id"], name)
+            for content_hash in (entry.get("front_matter_hash"), entry.get("content_hash")):
+                if content_hash:
+                    self._by_hash.setdefault(content_hash, name)
+
+    def record(self, item: Dict[str, Any], content: str) -> None:
+        """Add or replace a file we just committed (`item` is the API's `content` object)."""
+        entry = self._entry(item, content)
+        with self._lock:
+            self._files[entry["name"]] = entry
+            self._reindex()
+        self._save()
+
+    def remove(self, name: str) -> None:
+        """Forget a file we just deleted."""
+        with self._lock:
+            removed = self._files.pop(name, None) is not None
+            if removed:
+                self._reindex()
+        if removed:
+            self._save()
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful refresh (None if never refreshed in this process)"""
+        with self._lock:
+            return time.monotonic() - self._refreshed_at if self._refreshed_at is not None else None
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._files.get(name)
+        return dict(entry) if entry else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """First file (by name) whose computed or front-matter content hash matches."""
+        with self._lock:
+            name = self._by_hash.get(content_hash)
+            return dict(self._files[name]) if name else None
+
+    def find_by_id(self, prd_id: str) -> Optional[Dict[str, Any]]:
+        """The file whose front-matter names this PRD ID."""
+        with self._lock:
+            name = self._by_id.get(prd_id)
+            return dict(self._files[name]) if name else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Indexed files sorted by name."""
+        with self._lock:
+            return [dict(self._files[name]) for name in sorted(self._files)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"repository": f"{self.api.repo_owner}/{self.api.repo_name}",
+                    "directory": self.directory, "files": len(self._files),
+                    "with_prd_id": len(self._by_id),
+                    "age_s": round(time.monotonic() - self._refreshed_at, 1) if self._refreshed_at is not None else None,
+                    "persistent": self.index_path is not None, **self._stats}
+
+    def _load(self) -> None:
+        if self.index_path is None or not self.index_path.exists():
+            return
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  GitHub PRD index unreadable ({e}), rebuilding")
+            return
+        if data.get("version") == INDEX_VERSION and data.get("directory") == self.directory:
+            self._files = data.get("files", {})
+            self._reindex()
+
+    def _save(self) -> None:
+        if self.index_path is None:
+            return
+        with self._lock:
+            data = {"version": INDEX_VERSION, "directory": self.directory, "files": self._files}
+            payload = json.dumps(data, indent=1, sort_keys=True)
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(payload, encoding='utf-8')
+            tmp_path.replace(self.index_path)
+        except OSError as e:
+            print(f"⚠️  Could not save GitHub PRD index: {e}")
+
+
+_indexes: Dict[Tuple[str, str, str], GitHubPRDIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_github_prd_index(repo_owner: str, repo_name: str,
+                         directory: str = PRD_QUEUE_DIR) -> GitHubPRDIndex:
+    """Shared index for a repository directory (persisted under GITHUB_PRD_INDEX_DIR if set).
+
+    With PRD_SOURCE_BACKEND=local the index reads the local working copy instead of GitHub.
+    """
+    from ..config import config
+    from .local_git_repo import get_prd_source
+
+    key = (repo_owner, repo_name, directory)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index_path = None
+            if config.github_prd_index_dir:
+                slug = re.sub(r"[^A-Za-z0-9]+", "-", f"{repo_owner}-{repo_name}-{directory}").strip("-")
+                index_path = str(Path(config.github_prd_index_dir) / f"{slug}.json")
+            index = _indexes[key] = GitHubPRDIndex(get_prd_source(repo_owner, repo_name),
+                                                   directory, index_path)
+        return index
+
+
+def all_github_prd_indexes() -> Iterable[GitHubPRDIndex]:
+    with _indexes_lock:
+        return list(_indexes.values())
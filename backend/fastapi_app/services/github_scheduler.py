@@ -0,0 +1,281 @@
+"""
+GitHub request scheduler.
+Every GitHub API call takes a slot from one scheduler per token. Slots are
+granted in priority order (commits and deletes, then single reads, then
+directory scans), limited by concurrency and by a token bucket that mirrors
+GitHub's own X-RateLimit-* headers: the bucket holds what GitHub says is
+remaining, minus requests still in flight, and refills when the window
+resets. Scans and reads may not spend the last `reserve` requests, so a
+burst of scans can never leave nothing for commits. A secondary rate limit
+(403/429 with Retry-After) pauses everything until GitHub allows traffic
+again.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+# GitHub asks clients to wait at least a minute after a secondary rate limit without Retry-After
+SECONDARY_BACKOFF_SECONDS = 60.0
+MAX_BACKOFF_SECONDS = 15 * 60.0
+
+
+class GitHubPriority(IntEnum):
+    """Lower value goes first."""
+    WRITE = 0  # commits and deletes
+    READ = 1   # single lookups
+    SCAN = 2   # directory listings and index downloads
+
+
+class _Waiter:
+    __slots__ = ("priority", "cost", "future", "queued_at")
+
+    def __init__(self, priority: GitHubPriority, cost: int, future: asyncio.Future):
+        self.priority = priority
+        self.cost = cost
+        self.future = future
+        self.queued_at = time.monotonic()
+
+
+class GitHubRequestScheduler:
+    """Priority, concurrency and rate-limit budget for one GitHub token."""
+
+    def __init__(self, max_in_flight: int = 10, reserve: int = 100, max_wait: float = 30.0):
+        self.max_in_flight = max(1, max_in_flight)
+        self.reserve = max(0, reserve)
+        self.max_wait = max_wait
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None  # epoch seconds
+        self.backoff_until = 0.0  # epoch seconds
+        self._consecutive_throttles = 0
+        self._in_flight = 0
+        self._reserved = 0  # budget taken by requests GitHub has not answered yet
+        self._queue: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self._stats: Dict[str, Any] = {"throttled": 0, "exhausted": 0, "timeouts": 0, "rejected": 0}
+        self._waits = {p.name.lower(): {"granted": 0, "total_wait": 0.0, "max_wait": 0.0}
+                       for p in GitHubPriority}
+
+    # -- budget --------------------------------------------------------------
+
+    def _available(self, now: float) -> Optional[int]:
+        """Requests left in the current window (None until GitHub has told us)"""
+        if self.remaining is None:
+            return None
+        if self.reset_at is not None and now >= self.reset_at and self.limit is not None:
+            # The window rolled over: the bucket is full again until GitHub says otherwise
+            self.remaining = self.limit
+            self.reset_at = None
+        return self.remaining - self._reserved
+
+    def _can_grant(self, waiter: _Waiter, now: float) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        if waiter.cost == 0:
+            return True
+        if now < self.backoff_until:
+            return False
+        available = self._available(now)
+        if available is None:
+            return True
+        floor = 0 if waiter.priority == GitHubPriority.WRITE else self._reserve()
+        return available - waiter.cost >= floor
+
+    def _reserve(self) -> int:
+        # Never hold back more than half the window (unauthenticated tokens get 60/hour)
+        return min(self.reserve, self.limit // 2) if self.limit else self.reserve
+
+    def _ready_at(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """When budget or backoff stops blocking `waiter` (None if only concurrency does)"""
+        if waiter.cost == 0:
+            return None
+        ready_at = self.backoff_until if now < self.backoff_until else None
+        available = self._available(now)
+        floor = 0 if waiter.priority == GitHubPriority.WRITE else self._reserve()
+        if available is not None and available - waiter.cost < floor and self._reserved == 0:
+            # Nothing in flight will hand budget back: wait for the window to reset
+            reset_at = self.reset_at if self.reset_at is not None else float("inf")
+            ready_at = max(ready_at or 0.0, reset_at)
+        return ready_at
+
+    # -- slots ---------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Waiters from a finished loop can never be woken; start over on this one
+            self._queue.clear()
+            self._in_flight = 0
+            self._reserved = 0
+            self._wakeup = None
+            self._loop = loop
+        return loop
+
+    async def acquire(self, priority: GitHubPriority, cost: int = 1) -> None:
+        """Wait for a slot.
+
+        Raises asyncio.TimeoutError after max_wait seconds, or straight away
+        if the budget cannot recover (reset or backoff) within max_wait.
+        """
+        loop = self._ensure_loop()
+        waiter = _Waiter(priority, cost, loop.create_future())
+        heapq.heappush(self._queue, (int(priority), next(self._sequence), waiter))
+        self._dispatch()
+        if not waiter.future.done():
+            now = time.time()
+            ready_at = self._ready_at(waiter, now)
+            if ready_at is not None and ready_at - now > self.max_wait:
+                waiter.future.cancel()
+                self._stats["rejected"] += 1
+                raise asyncio.TimeoutError()
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+            except asyncio.TimeoutError:
+                if waiter.future.done():
+                    return  # granted at the last moment
+                waiter.future.cancel()
+                self._stats["timeouts"] += 1
+                raise
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    self.finish(cost)
+                else:
+                    waiter.future.cancel()
+                raise
+
+    def _dispatch(self) -> None:
+        now = time.time()
+        blocked: List[Tuple[int, int, _Waiter]] = []
+        while self._queue and self._in_flight < self.max_in_flight:
+            entry = heapq.heappop(self._queue)
+            waiter = entry[2]
+            if waiter.future.done():
+                continue  # timed out or cancelled
+            if not self._can_grant(waiter, now):
+                blocked.append(entry)
+                continue
+            self._in_flight += 1
+            self._reserved += waiter.cost
+            wait = time.monotonic() - waiter.queued_at
+            waits = self._waits[waiter.priority.name.lower()]
+            waits["granted"] += 1
+            waits["total_wait"] += wait
+            waits["max_wait"] = max(waits["max_wait"], wait)
+            waiter.future.set_result(None)
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+        if self._queue:
+            self._schedule_wakeup(now)
+
+    def _schedule_wakeup(self, now: float) -> None:
+        """Re-run dispatch when the backoff ends or the window resets"""
+        if self._loop is None:
+            return
+        times = [t for t in (self.backoff_until, self.reset_at) if t and t > now]
+        if not times:
+            return
+        when = self._loop.time() + min(times) - now + 0.05
+        if self._wakeup is not None:
+            if self._wakeup.when() <= when:
+                return
+            self._wakeup.cancel()  # a new backoff ends before the pending wakeup
+
+        def wake() -> None:
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = self._loop.call_at(when, wake)
+
+    # -- feedback from responses ----------------------------------------------
+
+    def finish(self, cost: int = 1, status_code: Optional[int] = None, headers: Any = None,
+               body_text: str = "") -> Optional[float]:
+        """Return a slot and update the budget from the response (if there was one).
+
+        Returns how long to wait before retrying if the response was a rate
+        limit (primary or secondary), else None.
+        """
+        self._in_flight -= 1
+        self._reserved -= cost
+        try:
+            return self._observe(status_code, headers, body_text)
+        finally:
+            self._dispatch()
+
+    def _observe(self, status_code: Optional[int], headers: Any, body_text: str) -> Optional[float]:
+        if status_code is None:
+            return None
+        now = time.time()
+        limit = _int_header(headers, "X-RateLimit-Limit")
+        remaining = _int_header(headers, "X-RateLimit-Remaining")
+        reset = _int_header(headers, "X-RateLimit-Reset")
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            # Requests still in flight stay counted in _reserved
+            self.remaining = remaining
+        if reset is not None:
+            self.reset_at = float(reset)
+
+        if status_code not in (403, 429):
+            self._consecutive_throttles = 0
+            return None
+
+        retry_after = _int_header(headers, "Retry-After")
+        if remaining == 0:
+            self._stats["exhausted"] += 1
+            wait = max(1.0, (self.reset_at or now + SECONDARY_BACKOFF_SECONDS) - now)
+        elif retry_after is not None or "secondary rate limit" in body_text.lower():
+            self._stats["throttled"] += 1
+            self._consecutive_throttles += 1
+            wait = float(retry_after) if retry_after is not None else min(
+                MAX_BACKOFF_SECONDS, SECONDARY_BACKOFF_SECONDS * 2 ** (self._consecutive_throttles - 1))
+        else:
+            return None  # an ordinary 403 (permissions)
+        self.backoff_until = max(self.backoff_until, now + wait)
+        return wait
+
+    def retry_after(self) -> float:
+        """Seconds until budget or backoff is expected to allow requests again"""
+        now = time.time()
+        times = [t for t in (self.backoff_until, self.reset_at) if t and t > now]
+        return round(min(times) - now, 1) if times else 1.0
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        available = self._available(now)
+        queued: Dict[str, int] = {p.name.lower(): 0 for p in GitHubPriority}
+        for _, _, waiter in self._queue:
+            if not waiter.future.done():
+                queued[waiter.priority.name.lower()] += 1
+        waits = {
+            name: {"granted": w["granted"],
+                   "avg_wait_ms": round(w["total_wait"] / w["granted"] * 1000, 1) if w["granted"] else 0.0,
+                   "max_wait_ms": round(w["max_wait"] * 1000, 1)}
+            for name, w in self._waits.items()
+        }
+        return {
+            "limit": self.limit,
+            "remaining": available,
+            "reserve": self._reserve(),
+            "reset_in_s": round(self.reset_at - now, 1) if self.reset_at else None,
+            "backoff_in_s": round(self.backoff_until - now, 1) if self.backoff_until > now else 0.0,
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": queued,
+            "priorities": waits,
+            **self._stats,
+        }
+
+
+def _int_header(headers: Any, name: str) -> Optional[int]:
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,309 @@
+"""
+Local git working-copy backend for PRD files.
+With PRD_SOURCE_BACKEND=local the PRD index and commit batcher work against
+a clone on disk instead of the GitHub REST API. Directory listings walk the
+folders; blob SHAs are computed once per file version and cached by mtime
+and size. Reads are plain file reads, and each batch of changes becomes one
+local commit. Commits are pushed together after PRD_LOCAL_PUSH_INTERVAL
+seconds, and the clone is pulled every PRD_LOCAL_PULL_INTERVAL seconds so
+files committed elsewhere show up. With PRD_LOCAL_REPO_PUSH=false nothing
+touches the network.
+"""
+import asyncio
+import hashlib
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .github_api import GitHubAPIError
+from .github_commit_batcher import FileChange, GitHubCommitBatcher
+
+# Used only when the working copy has no git identity configured
+COMMIT_AUTHOR_NAME = "AI Agent Factory"
+COMMIT_AUTHOR_EMAIL = "prd-bot@ai-agent-factory.local"
+
+
+class LocalGitError(GitHubAPIError):
+    """A git command or file operation on the working copy failed."""
+
+
+class LocalGitRepo:
+    """A git working copy, read like GitHubAPI's tree listing and written with local commits."""
+
+    def __init__(self, path: str, repo_owner: str, repo_name: str, remote: str = "origin",
+                 push: bool = True, push_interval: float = 5.0, pull_interval: float = 60.0):
+        self.path = Path(path).resolve()
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.remote = remote
+        self.push_interval = max(0.0, push_interval)
+        self.pull_interval = max(0.0, pull_interval)
+        self._git_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.branch = self._git("rev-parse", "--abbrev-ref", "HEAD").strip()
+        # Push/pull only if allowed and the remote exists: otherwise the clone stays offline
+        self.sync_enabled = push and remote in self._git("remote").split()
+        self._identity: List[str] = []
+        if not self._git("config", "user.email", check=False).strip():
+            self._identity = ["-c", f"user.name={COMMIT_AUTHOR_NAME}", "-c", f"user.email={COMMIT_AUTHOR_EMAIL}"]
+        self._blob_shas: Dict[str, Tuple[int, int, str]] = {}  # path -> (mtime_ns, size, sha)
+        self._signatures: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        self._last_pull = 0.0
+        self._push_timer: Optional[asyncio.TimerHandle] = None
+        self._push_task: Optional[asyncio.Task] = None
+        self._stats = {"listings": 0, "unchanged_listings": 0, "hashed_files": 0, "commits": 0,
+                       "unpushed_commits": 0, "pushes": 0, "push_failures": 0, "pulls": 0,
+                       "pull_failures": 0}
+
+    def html_url(self, path: str) -> str:
+        return f"https://github.com/{self.repo_owner}/{self.repo_name}/blob/{self.branch}/{path}"
+
+    # -- git -------------------------------------------------------------------
+
+    def _git(self, *args: str, check: bool = True) -> str:
+        try:
+            completed = subprocess.run(["git", *args], cwd=self.path, capture_output=True, text=True,
+                                       timeout=120, env={**os.environ, "GIT_TERMINAL_PROMPT": "0"})
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise LocalGitError(f"git {args[0]} failed: {e}") from e
+        if check and completed.returncode != 0:
+            raise LocalGitError(f"git {args[0]} failed: {completed.stderr.strip() or completed.stdout.strip()}")
+        return completed.stdout
+
+    # -- reads (the subset of GitHubAPI used by GitHubPRDIndex) ------------------
+
+    async def list_tree(self, directory: str = "", priority: Any = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Files under `directory`, recursively, as GitHubAPI.list_tree returns them.
+
+        `changed` is False when no file was added, removed or modified since
+        the previous listing of the same directory.
+        """
+        await self._maybe_pull()
+        return await asyncio.to_thread(self._list, directory.strip("/"))
+
+    def _list(self, directory: str) -> Tuple[List[Dict[str, Any]], bool]:
+        root = self.path / directory if directory else self.path
+        entries = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d != ".git")
+            for filename in sorted(filenames):
+                full = Path(dirpath) / filename
+                path = full.relative_to(self.path).as_posix()
+                try:
+                    sha, size = self._blob_sha(path, full)
+                except OSError:
+                    continue  # removed while listing
+                entries.append({"name": filename, "path": path, "sha": sha, "size": size})
+        signature = tuple((entry["path"], entry["sha"]) for entry in entries)
+        with self._lock:
+            changed = self._signatures.get(directory) != signature
+            self._signatures[directory] = signature
+            self._stats["listings"] += 1
+            if not changed:
+                self._stats["unchanged_listings"] += 1
+        return entries, changed
+
+    def _blob_sha(self, path: str, full: Path) -> Tuple[str, int]:
+        stat = full.stat()
+        with self._lock:
+            cached = self._blob_shas.get(path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], stat.st_size
+        data = full.read_bytes()
+        sha = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        with self._lock:
+            self._blob_shas[path] = (stat.st_mtime_ns, stat.st_size, sha)
+            self._stats["hashed_files"] += 1
+        return sha, stat.st_size
+
+    async def read_files(self, items: Sequence[Tuple[str, str]], priority: Any = None) -> List[Any]:
+        """File texts for (path, sha) pairs, in order; a failed read is returned as its exception."""
+        def read_all() -> List[Any]:
+            results: List[Any] = []
+            for path, _ in items:
+                try:
+                    results.append((self.path / path).read_text(encoding="utf-8"))
+                except (OSError, UnicodeDecodeError) as e:
+                    results.append(LocalGitError(f"Could not read {path}: {e}"))
+            return results
+
+        return await asyncio.to_thread(read_all)
+
+    async def file_sha(self, path: str, ref: Optional[str] = None, priority: Any = None) -> Optional[str]:
+        """Blob SHA of `path` in the working copy, or None if there is no such file."""
+        def sha() -> Optional[str]:
+            full = self.path / path
+            try:
+                return self._blob_sha(path, full)[0] if full.is_file() else None
+            except OSError:
+                return None
+
+        return await asyncio.to_thread(sha)
+
+    # -- writes ----------------------------------------------------------------
+
+    async def commit(self, changes: Sequence[FileChange], message: str) -> str:
+        """Apply the changes to the working copy as one local commit; returns its SHA.
+
+        The push happens later, together with other commits (see schedule_push).
+        """
+        return await asyncio.to_thread(self._commit, list(changes), message)
+
+    def _commit(self, changes: List[FileChange], message: str) -> str:
+        paths = [change.path for change in changes]
+        with self._git_lock:
+            try:
+                for change in changes:
+                    full = self.path / change.path
+                    if change.is_delete:
+                        full.unlink(missing_ok=True)
+                    else:
+                        full.parent.mkdir(parents=True, exist_ok=True)
+                        full.write_text(change.content, encoding="utf-8")
+            except OSError as e:
+                raise LocalGitError(f"Could not write the working copy: {e}") from e
+            self._git("add", "-A", "--", *paths)
+            # Only these paths: anything else staged in the working copy stays out of the commit
+            self._git(*self._identity, "commit", "-q", "-m", message, "--", *paths)
+            commit_sha = self._git("rev-parse", "HEAD").strip()
+        with self._lock:
+            self._stats["commits"] += 1
+            self._stats["unpushed_commits"] += 1
+        return commit_sha
+
+    def schedule_push(self) -> None:
+        """Push after push_interval seconds, taking every commit made until then"""
+        if not self.sync_enabled or self._push_timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+
+        def start() -> None:
+            self._push_timer = None
+            self._push_task = loop.create_task(self.push())
+
+        self._push_timer = loop.call_later(self.push_interval, start)
+
+    async def push(self) -> bool:
+        """Push now; on a non-fast-forward, rebase onto the remote and push again."""
+        if not self.sync_enabled:
+            return False
+        try:
+            await asyncio.to_thread(self._push)
+            return True
+        except LocalGitError as e:
+            print(f"⚠️  Could not push PRD commits to {self.remote}/{self.branch}: {e}")
+            with self._lock:
+                self._stats["push_failures"] += 1
+            return False
+
+    def _push(self) -> None:
+        with self._git_lock:
+            try:
+                self._git("push", "-q", self.remote, self.branch)
+            except LocalGitError:
+                # Someone else pushed first: replay our commits on top of theirs
+                self._pull()
+                self._git("push", "-q", self.remote, self.branch)
+        with self._lock:
+            self._stats["pushes"] += 1
+            self._stats["unpushed_commits"] = 0
+
+    async def _maybe_pull(self) -> None:
+        if not self.sync_enabled or not self.pull_interval:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_pull < self.pull_interval:
+                return
+            self._last_pull = now
+        try:
+            ahead = await asyncio.to_thread(self._locked_pull)
+        except LocalGitError as e:
+            # A stale working copy is still a usable index
+            print(f"⚠️  Could not pull {self.remote}/{self.branch}: {e}")
+            with self._lock:
+                self._stats["pull_failures"] += 1
+            return
+        if ahead:
+            # Commits left unpushed (e.g. by a previous run) go out with the next push
+            with self._lock:
+                self._stats["unpushed_commits"] = ahead
+            self.schedule_push()
+
+    def _locked_pull(self) -> int:
+        """Pull, then count local commits the remote does not have"""
+        with self._git_lock:
+            self._pull()
+            return int(self._git("rev-list", "--count", f"{self.remote}/{self.branch}..HEAD").strip() or 0)
+
+    def _pull(self) -> None:
+        try:
+            # Rebasing rewrites our unpushed commits, so it needs a committer identity too
+            self._git(*self._identity, "pull", "-q", "--rebase", "--autostash", self.remote, self.branch)
+        except LocalGitError:
+            self._git("rebase", "--abort", check=False)
+            raise
+        with self._lock:
+            self._stats["pulls"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"repository": f"{self.repo_owner}/{self.repo_name}", "path": str(self.path),
+                    "branch": self.branch, "sync": self.sync_enabled, "cached_blob_shas": len(self._blob_shas),
+                    **self._stats}
+
+
+class LocalGitCommitBatcher(GitHubCommitBatcher):
+    """GitHubCommitBatcher whose batches become local commits, pushed in batches."""
+
+    api: LocalGitRepo
+
+    async def _commit_batch(self, changes: List[FileChange]) -> List[Dict[str, Any]]:
+        results, accepted = await self._plan(changes, self.api.file_sha)
+        commit_sha = ""
+        if accepted:
+            commit_sha = await self.api.commit([changes[i] for i in accepted],
+                                               self._message([changes[i] for i in accepted]))
+            with self._lock:
+                self._stats["commits"] += 1
+            self.api.schedule_push()
+        for i in accepted:
+            results[i] = self._result(changes[i], "committed", commit_sha)
+        return results
+
+
+_repos: Dict[Tuple[str, str], LocalGitRepo] = {}
+_repos_lock = threading.Lock()
+
+
+def get_local_git_repo(repo_owner: str, repo_name: str) -> LocalGitRepo:
+    """Shared working copy for a repository (path and sync settings from config)."""
+    from ..config import config
+
+    key = (repo_owner, repo_name)
+    with _repos_lock:
+        repo = _repos.get(key)
+        if repo is None:
+            repo = _repos[key] = LocalGitRepo(config.prd_local_repo_path, repo_owner, repo_name,
+                                              push=config.prd_local_repo_push,
+                                              push_interval=config.prd_local_push_interval,
+                                              pull_interval=config.prd_local_pull_interval)
+        return repo
+
+
+def all_local_git_repos() -> List[LocalGitRepo]:
+    with _repos_lock:
+        return list(_repos.values())
+
+
+def get_prd_source(repo_owner: str, repo_name: str):
+    """GitHubAPI, or the local working copy when PRD_SOURCE_BACKEND=local"""
+    from ..config import config
+    from .github_api import get_github_api
+
+    if config.prd_source_backend == "local":
+        return get_local_git_repo(repo_owner, repo_name)
+    return get_github_api(repo_owner, repo_name)
@@ -0,0 +1,105 @@
+"""
+Batch PRD Parser
+Parses many PRD documents in parallel across a process pool.
+
+PRDParser is pure Python and CPU-bound, so threads do not help; documents are
+fanned out to worker processes in chunks (one PRDParser per worker) and the
+results are returned in input order.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .prd_parser import PRDParser
+
+# A document is either raw content or a (content, filename) pair
+PRDDocument = Union[str, Tuple[str, Optional[str]]]
+
+# Below this many documents the pool start-up cost outweighs the parallelism
+MIN_PARALLEL_DOCUMENTS = 8
+
+# Aim for a few chunks per worker so a slow chunk does not leave cores idle
+CHUNKS_PER_WORKER = 4
+
+_worker_parser: Optional[PRDParser] = None
+
+
+def _init_worker(mode: str = 'regex') -> None:
+    """Build one parser per worker process (compiles the section patterns once)."""
+    global _worker_parser
+    _worker_parser = PRDParser(mode=mode)
+
+
+def _parse_one(parser: PRDParser, content: str, filename: Optional[str], validate: bool) -> Dict[str, Any]:
+    """Parse a single document; failures are reported in the result, not raised."""
+    try:
+        parsed_data = parser.parse_prd_content(content, filename)
+        if validate:
+            parsed_data['validation'] = parser.validate_prd_structure(parsed_data)
+        return parsed_data
+    except Exception as e:
+        return {'original_filename': filename, 'error': f"Parsing failed: {str(e)}"}
+
+
+def _parse_chunk(chunk: List[Tuple[str, Optional[str]]], validate: bool,
+                 mode: str = 'regex') -> List[Dict[str, Any]]:
+    parser = _worker_parser or PRDParser(mode=mode)
+    return [_parse_one(parser, content, filename, validate) for content, filename in chunk]
+
+
+def _normalize_documents(documents: Iterable[PRDDocument]) -> List[Tuple[str, Optional[str]]]:
+    return [doc if isinstance(doc, tuple) else (doc, None) for doc in documents]
+
+
+def _chunk(items: Sequence[Tuple[str, Optional[str]]], size: int) -> List[List[Tuple[str, Optional[str]]]]:
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def default_workers() -> int:
+    """Worker count: PRD_PARSE_WORKERS if set, else the number of CPUs."""
+    from ..config import config
+
+    workers = config.prd_parse_workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def parse_prd_batch(documents: Iterable[PRDDocument],
+                    max_workers: Optional[int] = None,
+                    chunksize: Optional[int] = None,
+                    validate: bool = True,
+                    mode: str = 'regex') -> List[Dict[str, Any]]:
+    """Parse PRD documents in parallel.
+
+    Args:
+        documents: Raw PRD contents, or (content, filename) pairs
+        max_workers: Worker processes (defaults to default_workers())
+        chunksize: Documents sent to a worker per task (defaults to an even
+            split into CHUNKS_PER_WORKER chunks per worker)
+        validate: Attach validate_prd_structure() output as 'validation'
+        mode: PRDParser section mode ('regex' or 'ast')
+
+    Returns:
+        One result per document, in input order. Documents that fail to
+        parse yield {'original_filename': ..., 'error': ...}.
+    """
+    docs = _normalize_documents(documents)
+    if not docs:
+        return []
+
+    workers = min(max_workers or default_workers(), len(docs))
+    if workers <= 1 or len(docs) < MIN_PARALLEL_DOCUMENTS:
+        return _parse_chunk(docs, validate, mode)
+
+    if not chunksize or chunksize < 1:
+        chunksize = max(1, math.ceil(len(docs) / (workers * CHUNKS_PER_WORKER)))
+
+    results: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(mode,)) as pool:
+        # map() yields chunk results in submission order
+        for chunk_results in pool.map(partial(_parse_chunk, validate=validate, mode=mode),
+                                      _chunk(docs, chunksize)):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,152 @@
+"""
+PRD Type Classifier
+Decides whether a PRD describes a platform change or an agent by scoring the
+weighted keywords present in the document.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+# Keyword weights: strong, specific terms count more than generic ones
+PLATFORM_KEYWORDS: Dict[str, float] = {
+    'platform': 3.0, 'infrastructure': 3.0, 'factory': 2.0, 'architecture': 2.0,
+    'framework': 2.0, 'orchestrator': 2.0, 'ci/cd': 2.0, 'scalability': 1.5,
+    'system': 1.0, 'foundation': 1.0, 'engine': 1.0, 'deployment': 1.0,
+    'pipeline': 1.0, 'monitoring': 1.0, 'logging': 1.0, 'operational': 1.0,
+    'authentication': 1.0, 'authorization': 1.0, 'database': 1.0, 'api': 1.0,
+    'backend': 1.0, 'frontend': 1.0, 'dashboard': 1.0, 'admin': 1.0,
+    'core': 0.5, 'base': 0.5, 'ui': 0.5, 'ux': 0.5, 'management': 0.5,
+}
+
+AGENT_KEYWORDS: Dict[str, float] = {
+    'ai agent': 4.0, 'agent': 3.0, 'chatbot': 3.0, 'artificial intelligence': 2.0,
+    'machine learning': 2.0, 'assistant': 2.0, 'automation': 2.0,
+    'nlp': 2.0, 'openai': 2.0, 'anthropic': 2.0, 'claude': 2.0,
+    'ai': 1.0, 'model': 1.0, 'prediction': 1.0, 'recommendation': 1.0,
+    'chat': 1.0, 'conversation': 1.0, 'intelligent': 1.0, 'workflow': 1.0,
+    'task': 0.5, 'process': 0.5, 'execution': 0.5, 'analysis': 0.5,
+}
+
+# Phrases that settle the type on their own
+PLATFORM_PHRASES = ('platform prd', 'improve platform', 'enhance system')
+AGENT_PHRASES = ('agent prd', 'create agent', 'build agent')
+
+# A declaration is a line of its own: "PRD Type: platform", "- **Type:** agent",
+# a "category: platform" front-matter key. Prose such as "message type:
+# platform-specific payloads" or "prototype: agent" is not one.
+_DECLARED_TYPE_RE = re.compile(
+    r'^[ \t]*[-*]?[ \t]*\**[ \t]*(?:prd\s+)?\b(?:type|category)\**[ \t]*[:=][ \t*]*'
+    r'(platform|agent)[ \t*]*$', re.MULTILINE)
+
+# Terms shorter than this must stand as whole words ('ai' is not 'email', 'ui'
+# is not 'build'); longer ones also match inside words, so 'agents' and
+# 'systems' count. 'bot' and 'ml' are left out: 'chatbot', 'machine learning'
+# and 'model' carry the same evidence without a whole-word scan past every
+# 'both' and 'html'
+MIN_SUBSTRING_TERM = 4
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _has_word(text: str, term: str) -> bool:
+    """True if `term` occurs in `text` with no word character on either side"""
+    size = len(term)
+    index = text.find(term)
+    while index >= 0:
+        end = index + size
+        if not (index and _is_word_char(text[index - 1])) and \
+                not (end < len(text) and _is_word_char(text[end])):
+            return True
+        index = text.find(term, end)
+    return False
+
+
+def _declared_type(text: str) -> Optional[str]:
+    """Type from the first declaration line, found without a full regex pass.
+
+    Only lines holding 'type' or 'category' can declare a type, so the anchored
+    pattern is tried on those lines alone.
+    """
+    first = None
+    for key in ('type', 'category'):
+        index = text.find(key)
+        while index >= 0 and (first is None or index < first.start()):
+            line_start = text.rfind('\n', 0, index) + 1
+            match = _DECLARED_TYPE_RE.match(text, line_start)
+            if match:
+                first = match
+                break
+            line_end = text.find('\n', index)
+            if line_end < 0:
+                break
+            index = text.find(key, line_end)
+    return first.group(1) if first else None
+
+
+class PRDTypeClassifier:
+    """Weighted keyword classifier for PRD type"""
+
+    def __init__(self, platform_keywords: Optional[Dict[str, float]] = None,
+                 agent_keywords: Optional[Dict[str, float]] = None):
+        self.platform_keywords = platform_keywords or PLATFORM_KEYWORDS
+        self.agent_keywords = agent_keywords or AGENT_KEYWORDS
+        self.phrases = {phrase: 'platform' for phrase in PLATFORM_PHRASES}
+        self.phrases.update({phrase: 'agent' for phrase in AGENT_PHRASES})
+
+        terms = set(self.platform_keywords) | set(self.agent_keywords)
+        self._terms = [(term, len(term) < MIN_SUBSTRING_TERM) for term in sorted(terms)]
+
+    def classify(self, content: str, filename: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Classify PRD content as 'platform' or 'agent'.
+
+        Evidence, strongest first: an explicit type declaration, a type hint in
+        the filename, a decisive phrase, then the weighted keyword scores.
+
+        Returns:
+            {'prd_type', 'confidence' (0.5-1.0), 'platform_score', 'agent_score', 'reason'}
+        """
+        # The whole document: a declaration or keywords may sit anywhere in it
+        text = content.lower()
+        found = {term for term, whole_word in self._terms
+                 if (_has_word(text, term) if whole_word else term in text)}
+
+        platform_score = sum(weight for k, weight in self.platform_keywords.items() if k in found)
+        agent_score = sum(weight for k, weight in self.agent_keywords.items() if k in found)
+
+        def verdict(prd_type: str, confidence: float, reason: str) -> Dict[str, Any]:
+            return {
+                'prd_type': prd_type,
+                'confidence': round(confidence, 3),
+                'platform_score': platform_score,
+                'agent_score': agent_score,
+                'reason': reason,
+            }
+
+        declared = _declared_type(text)
+        if declared:
+            return verdict(declared, 1.0, 'declared')
+
+        if filename:
+            filename_lower = filename.lower()
+            if 'platform' in filename_lower:
+                return verdict('platform', 0.9, 'filename')
+            if 'agent' in filename_lower:
+                return verdict('agent', 0.9, 'filename')
+
+        # Only scanned for when no declaration or filename settled the type
+        phrase_types = {kind for phrase, kind in self.phrases.items() if phrase in text}
+        if len(phrase_types) == 1:
+            return verdict(phrase_types.pop(), 0.85, 'phrase')
+
+        total = platform_score + agent_score
+        if total == 0:
+            return verdict('agent', 0.5, 'default')  # Default to agent
+        prd_type = 'platform' if platform_score > agent_score else 'agent'
+        return verdict(prd_type, 0.5 + 0.5 * abs(platform_score - agent_score) / total, 'keywords')
+
+
+# Shared instance (holds no per-call state, so it is thread-safe)
+prd_type_classifier = PRDTypeClassifier()
@@ -0,0 +1,216 @@
+"""
+PRD Markdown Block Parser
+Tokenises PRD markdown once into a flat list of blocks (headings, fenced code,
+text runs) and maps headings to PRD sections through a section schema.
+
+Used by PRDParser in 'ast' mode. Unlike the line regexes it ignores heading-like
+lines inside code fences and recognises setext headings (a line underlined with
+=== or ---). Headings that are not in the schema stay part of the current
+section, exactly as in the regex parser, so both modes return the same result
+for ordinary PRDs.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_LIST_ITEM_RE = re.compile(r'^(?:[*+-]|\d+[.)])(?:\s|$)')
+
+# Lines that can start or end a block: ATX headings, code fences and setext
+# underlines. Each match starts at the newline before the line (the content is
+# searched with a leading newline), which lets the regex engine skip straight
+# from line to line; everything between matches is text.
+_STRUCTURE_RE = re.compile(
+    r'\n[^\S\n]*(?:'
+    r'(#+)([^\n]*)'                       # heading: markers, text
+    r'|(`{3,}|~{3,})([^\n]*)'             # fence: marker, info string
+    r'|(=+|-+)[^\S\n]*(?=\n|$)'           # setext underline
+    r')')
+
+
+class Block(NamedTuple):
+    """One block of the document: lines[start:end] of the source."""
+    kind: str        # 'heading', 'code' or 'text'
+    start: int
+    end: int
+    level: int = 0   # heading level
+    text: str = ''   # heading text without the # markers
+
+
+def tokenize_blocks(content: str) -> List[Block]:
+    """Split markdown into heading, fenced code and text blocks.
+
+    Line numbers refer to content.split('\\n'). Text blocks cover everything
+    between headings and fences, blank lines included. Parsing is deliberately
+    lenient, like the line regexes it replaces: leading indentation is ignored
+    and '#' needs no following space.
+    """
+    blocks: List[Block] = []
+    text_start = 0    # first line not yet assigned to a block
+    fence = ''        # closing marker of the open code fence
+    fence_start = 0
+    index = -1        # line number of the current match
+    position = 0
+    content = '\n' + content
+    line_count = content.count('\n')
+
+    for match in _STRUCTURE_RE.finditer(content):
+        start = match.start()
+        index += content.count('\n', position, start + 1)
+        position = start + 1
+        heading, heading_text, marker, info, underline = match.groups()
+
+        if fence:
+            if marker and marker[0] == fence[0] and len(marker) >= len(fence) and not info.strip():
+                blocks.append(Block('code', fence_start, index + 1))
+                fence = ''
+                text_start = index + 1
+            continue
+
+        if heading:
+            if index > text_start:
+                blocks.append(Block('text', text_start, index))
+            blocks.append(Block('heading', index, index + 1, len(heading), heading_text.strip()))
+            text_start = index + 1
+        elif marker:
+            if index > text_start:
+                blocks.append(Block('text', text_start, index))
+            fence = marker
+            fence_start = index
+        elif index > text_start:
+            # Setext underline: the previous line is the heading text if it
+            # is plain paragraph text
+            previous = content[content.rfind('\n', 0, start) + 1:start].strip()
+            if not previous or _LIST_ITEM_RE.match(previous):
+                continue
+            if index - 1 > text_start:
+                blocks.append(Block('text', text_start, index - 1))
+            blocks.append(Block('heading', index - 1, index + 1, 1 if underline[0] == '=' else 2, previous))
+            text_start = index + 1
+
+    if fence:
+        # An unclosed fence runs to the end of the document
+        blocks.append(Block('code', fence_start, line_count))
+    elif text_start < line_count:
+        blocks.append(Block('text', text_start, line_count))
+    return blocks
+
+
+def heading_key(text: str) -> str:
+    """Normalise heading text for schema lookup.
+
+    Mirrors the regex patterns: up to two '*' may wrap the name directly,
+    trailing whitespace is ignored and matching is case-insensitive.
+    """
+    text = text.rstrip()
+    if text.startswith('**'):
+        text = text[2:]
+    elif text.startswith('*'):
+        text = text[1:]
+    if text.endswith('**'):
+        text = text[:-2]
+    elif text.endswith('*'):
+        text = text[:-1]
+    return text.casefold()
+
+
+class SectionSchema:
+    """Maps (heading level, heading text) to PRD section names."""
+
+    def __init__(self, sections: Iterable[Tuple[str, int, str]]):
+        """
+        Args:
+            sections: (section name, heading level, heading text) entries;
+                a section may appear more than once to accept aliases
+        """
+        self.sections = tuple(sections)
+        self._lookup: Dict[Tuple[int, str], str] = {}
+        for name, level, heading in self.sections:
+            # First entry wins, like the first matching regex pattern
+            self._lookup.setdefault((level, heading_key(heading)), name)
+
+    def section_for(self, level: int, text: str) -> Optional[str]:
+        """Section name for a heading, or None if the schema does not know it"""
+        return self._lookup.get((level, heading_key(text)))
+
+    def extend(self, sections: Iterable[Tuple[str, int, str]]) -> 'SectionSchema':
+        """New schema with extra entries (existing headings keep their mapping)"""
+        return SectionSchema(self.sections + tuple(sections))
+
+    @property
+    def names(self) -> List[str]:
+        return list(dict.fromkeys(name for name, _, _ in self.sections))
+
+
+# The headings recognised by PRDParser.section_patterns
+DEFAULT_SECTION_SCHEMA = SectionSchema([
+    ('title', 1, 'Title'),
+    ('description', 2, 'Description'),
+    ('problem_statement', 2, 'Problem Statement'),
+    ('target_users', 2, 'Target Users'),
+    ('user_stories', 2, 'User Stories'),
+    ('requirements', 2, 'Requirements'),
+    ('functional_requirements', 3, 'Functional Requirements'),
+    ('non_functional_requirements', 3, 'Non-Functional Requirements'),
+    ('platform_requirements', 3, 'Platform Requirements'),
+    ('infrastructure_requirements', 3, 'Infrastructure Requirements'),
+    ('operational_requirements', 3, 'Operational Requirements'),
+    ('acceptance_criteria', 2, 'Acceptance Criteria'),
+    ('technical_requirements', 2, 'Technical Requirements'),
+    ('performance_requirements', 2, 'Performance Requirements'),
+    ('security_requirements', 2, 'Security Requirements'),
+    ('integration_requirements', 2, 'Integration Requirements'),
+    ('deployment_requirements', 2, 'Deployment Requirements'),
+    ('success_metrics', 2, 'Success Metrics'),
+    ('timeline', 2, 'Timeline'),
+    ('dependencies', 2, 'Dependencies'),
+    ('risks', 2, 'Risks'),
+    ('assumptions', 2, 'Assumptions'),
+    ('agent_capabilities', 2, 'Agent Capabilities'),
+])
+
+# Section schema per PRD type; both templates currently share the default
+_SECTION_SCHEMAS: Dict[str, SectionSchema] = {
+    'platform': DEFAULT_SECTION_SCHEMA,
+    'agent': DEFAULT_SECTION_SCHEMA,
+}
+
+
+def register_section_schema(prd_type: str, schema: SectionSchema) -> None:
+    """Use `schema` for PRDs of `prd_type` in 'ast' parser mode"""
+    _SECTION_SCHEMAS[prd_type] = schema
+
+
+def get_section_schema(prd_type: Optional[str] = None) -> SectionSchema:
+    """Schema registered for `prd_type`, falling back to the default"""
+    return _SECTION_SCHEMAS.get(prd_type, DEFAULT_SECTION_SCHEMA)
+
+
+def sections_from_blocks(lines: List[str], blocks: List[Block],
+                         schema: SectionSchema) -> Dict[str, List[str]]:
+    """Group non-blank lines under the schema sections, like PRDParser._identify_sections
+
+    A section runs from its heading to the next heading the schema knows;
+    unknown headings, code and text in between are all part of it.
+    """
+    sections: Dict[str, List[str]] = {}
+    current_section = None
+    content_start = 0
+
+    for block in blocks:
+        if block.kind != 'heading':
+            continue
+        section_found = schema.section_for(block.level, block.text)
+        if not section_found:
+            continue
+        if current_section:
+            current_content = [line for line in lines[content_start:block.start] if line.strip()]
+            if current_content:
+                sections[current_section] = current_content
+        current_section = section_found
+        content_start = block.end
+
+    if current_section:
+        current_content = [line for line in lines[content_start:] if line.strip()]
+        if current_content:
+            sections[current_section] = current_content
+    return sections
@@ -0,0 +1,264 @@
+"""
+PRD markdown rendering.
+Each PRD type has a markdown template that is compiled once into a list of
+render steps, so a render only formats the PRD's fields. Rendered documents
+are cached by PRD ID and `updated_at`; the ETag is derived from that key
+too, so a conditional request is answered without rendering anything.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.prd import PRDResponse, PRDType
+
+# Bump when a template changes, so cached documents and client ETags go stale
+TEMPLATE_VERSION = "1"
+
+RenderStep = Callable[[PRDResponse], str]
+
+# {field}, {field|filter}, {item:field} (a Document Information line) and
+# {section:field|style} (a headed section); item and section placeholders
+# stand on their own line and render nothing when the field is empty
+_PLACEHOLDER_RE = re.compile(r'\{(?:(item|section):)?(\w+)(?:\|(\w+))?\}')
+
+_LABELS = {
+    "problem_statement": "Problem Statement",
+    "target_users": "Target Users",
+    "user_stories": "User Stories",
+    "requirements": "Requirements",
+    "acceptance_criteria": "Acceptance Criteria",
+    "technical_requirements": "Technical Requirements",
+    "performance_requirements": "Performance Requirements",
+    "security_requirements": "Security Requirements",
+    "integration_requirements": "Integration Requirements",
+    "deployment_requirements": "Deployment Requirements",
+    "success_metrics": "Success Metrics",
+    "timeline": "Timeline",
+    "dependencies": "Dependencies",
+    "dependencies_list": "Related PRDs",
+    "risks": "Risks",
+    "assumptions": "Assumptions",
+    "category": "Category",
+    "priority": "Priority",
+    "effort_estimate": "Effort Estimate",
+    "business_value": "Business Value",
+    "technical_complexity": "Technical Complexity",
+    "assignee": "Assignee",
+    "target_sprint": "Target Sprint",
+    "github_repo_url": "Repository",
+}
+
+_HEADER = """# Product Requirements Document (PRD)
+## {title}
+
+---
+
+### 📋 **Document Information**
+- **PRD ID**: `{id}`
+- **Status**: {status|title}
+- **Type**: {prd_type|title}
+- **Created**: {created_at|datetime}
+- **Last Updated**: {updated_at|datetime}
+{item:category}
+{item:priority|title}
+{item:effort_estimate|title}
+{item:business_value}
+{item:technical_complexity}
+{item:assignee}
+{item:target_sprint}
+{item:github_repo_url}
+
+---
+
+### 🎯 **Project Overview**
+
+**Description:**
+{description}
+
+"""
+
+_FOOTER = """---
+
+*Generated by AI Agent Factory*"""
+
+# Agents lead with who uses them and how they plug in
+AGENT_TEMPLATE = _HEADER + """{section:problem_statement}
+{section:target_users}
+{section:user_stories}
+{section:requirements|numbered}
+{section:acceptance_criteria}
+{section:technical_requirements}
+{section:integration_requirements}
+{section:deployment_requirements}
+{section:performance_requirements}
+{section:security_requirements}
+{section:success_metrics}
+{section:timeline}
+{section:dependencies}
+{section:dependencies_list}
+{section:risks}
+{section:assumptions}
+""" + _FOOTER
+
+# Platform work leads with the technical and operational requirements
+PLATFORM_TEMPLATE = _HEADER + """{section:problem_statement}
+{section:target_users}
+{section:requirements|numbered}
+{section:technical_requirements}
+{section:performance_requirements}
+{section:security_requirements}
+{section:integration_requirements}
+{section:deployment_requirements}
+{section:user_stories}
+{section:acceptance_criteria}
+{section:success_metrics}
+{section:timeline}
+{section:dependencies}
+{section:dependencies_list}
+{section:risks}
+{section:assumptions}
+""" + _FOOTER
+
+
+def _value(prd: PRDResponse, field: str) -> Any:
+    value = getattr(prd, field, None)
+    # Enums are stored as their values (use_enum_values), but be safe
+    return getattr(value, "value", value)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and not value)
+
+
+def _format(value: Any, filter_name: Optional[str]) -> str:
+    if value is None:
+        return ""
+    if filter_name == "datetime" and isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S UTC')
+    text = str(value)
+    if filter_name == "title":
+        return text.replace("_", " ").title()
+    return text
+
+
+def _block(value: Any, style: Optional[str]) -> str:
+    """Section body: text as is, lists as bullets (or numbered), dicts as labelled bullets"""
+    if isinstance(value, dict):
+        return "\n".join(f"- **{key}**: {item}" for key, item in value.items())
+    if isinstance(value, list):
+        if style == "numbered":
+            return "\n".join(f"{i}. {item}" for i, item in enumerate(value, 1))
+        return "\n".join(f"- {item}" for item in value)
+    return str(value).strip()
+
+
+def _step(kind: Optional[str], field: str, option: Optional[str]) -> RenderStep:
+    if kind == "item":
+        label = _LABELS.get(field, field)
+
+        def render_item(prd: PRDResponse) -> str:
+            value = _value(prd, field)
+            return "" if _is_empty(value) else f"- **{label}**: {_format(value, option)}\n"
+        return render_item
+
+    if kind == "section":
+        heading = f"### **{_LABELS.get(field, field)}**\n\n"
+
+        def render_section(prd: PRDResponse) -> str:
+            value = _value(prd, field)
+            return "" if _is_empty(value) else f"{heading}{_block(value, option)}\n\n"
+        return render_section
+
+    def render_field(prd: PRDResponse) -> str:
+        return _format(_value(prd, field), option)
+    return render_field
+
+
+def compile_template(template: str) -> List[RenderStep]:
+    """Turn a template into render steps (literal text and field formatters)."""
+    steps: List[RenderStep] = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        literal = template[position:match.start()]
+        if literal:
+            steps.append(lambda prd, text=literal: text)
+        kind, field, option = match.groups()
+        steps.append(_step(kind, field, option))
+        position = match.end()
+        # Line placeholders carry their own newline
+        if kind and template.startswith("\n", position):
+            position += 1
+    if template[position:]:
+        steps.append(lambda prd, text=template[position:]: text)
+    return steps
+
+
+_COMPILED = {
+    PRDType.AGENT.value: compile_template(AGENT_TEMPLATE),
+    PRDType.PLATFORM.value: compile_template(PLATFORM_TEMPLATE),
+}
+
+
+def render_prd_markdown(prd: PRDResponse) -> str:
+    """Render a PRD with the compiled template for its type."""
+    steps = _COMPILED.get(_value(prd, "prd_type")) or _COMPILED[PRDType.AGENT.value]
+    return "".join(step(prd) for step in steps)
+
+
+def markdown_etag(prd: PRDResponse) -> str:
+    """ETag of the PRD's rendered markdown, known without rendering it."""
+    key = f"{TEMPLATE_VERSION}\0{prd.id}\0{prd.updated_at.isoformat()}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class PRDMarkdownCache:
+    """LRU of rendered PRD markdown keyed by PRD ID and updated_at."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()  # prd id -> (etag, markdown)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "renders": 0, "evictions": 0}
+
+    def render(self, prd: PRDResponse) -> Tuple[str, str]:
+        """(markdown, etag) for the PRD; rendered only if it changed since the cached copy."""
+        etag = markdown_etag(prd)
+        with self._lock:
+            cached = self._entries.get(prd.id)
+            if cached is not None and cached[0] == etag:
+                self._entries.move_to_end(prd.id)
+                self._stats["hits"] += 1
+                return cached[1], etag
+            self._stats["misses"] += 1
+        markdown = render_prd_markdown(prd)
+        with self._lock:
+            self._stats["renders"] += 1
+            if self.max_entries:
+                # One entry per PRD: a newer version replaces the old one
+                self._entries[prd.id] = (etag, markdown)
+                self._entries.move_to_end(prd.id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return markdown, etag
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and hit rate for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["template_version"] = TEMPLATE_VERSION
+        return stats
@@ -3,16 +3,74 @@ Comprehensive PRD Parser Service
 Extracts all fields from PRD templates and maps them to database schema
 """
 
+import copy
+import hashlib
 import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, date
 import json
 
+from ..utils.prd_front_matter import strip_front_matter
+from .prd_classifier import prd_type_classifier
+from .prd_markdown import get_section_schema, sections_from_blocks, tokenize_blocks
+
+
+# Bump when parser output changes so cached parse results are invalidated
+PARSER_VERSION = "6"
+
+# Section tokenisers: 'regex' matches header lines against section_patterns,
+# 'ast' tokenises markdown blocks and maps headings through a section schema
+PARSER_MODES = ('regex', 'ast')
+
+# Inline field markers, in priority order (first match wins for a line)
+_INLINE_FIELD_PATTERNS = [
+    (re.compile(r'\*\*Description:\*\*', re.IGNORECASE), 'description'),
+    (re.compile(r'\*\*Problem Statement:\*\*', re.IGNORECASE), 'problem_statement'),
+    (re.compile(r'\*\*Description\*\*:', re.IGNORECASE), 'description'),
+    (re.compile(r'\*\*Problem Statement\*\*:', re.IGNORECASE), 'problem_statement'),
+]
+_INLINE_REQUIREMENTS_RE = re.compile(r'\*\*Requirements?:\*\*', re.IGNORECASE)
+_INLINE_VALUE_RE = re.compile(r':\s*(.+)')
+_LEADING_BOLD_RE = re.compile(r'^\*\*\s*')
+_TRAILING_BOLD_RE = re.compile(r'\s*\*\*$')
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.+?)\*')
+_LIST_MARKER_RE = re.compile(r'^[\*\-\+]\s*')
+
+# Unanchored hints for whole-document searches (a `^` pattern under MULTILINE
+# is tried at every position; these let the regex engine skip ahead instead).
+# Each hint matches a superset of the lines it stands for.
+_TITLE_SECTION_HINT_RE = re.compile(r'## (?:\*\*)?title', re.IGNORECASE)
+_INLINE_DESCRIPTION_RE = re.compile(r'\*\*Description(?::\*\*|\*\*:)', re.IGNORECASE)
+_DESCRIPTION_HEADER_HINT_RE = re.compile(r'##[^\S\n]*\*?\*?Description', re.IGNORECASE)
+_HEADING_START_RE = re.compile(r'\n[^\S\n]*#')
+
+# Sections parsed as bullet lists
+_LIST_SECTIONS = frozenset([
+    'target_users', 'user_stories', 'requirements',
+    'functional_requirements', 'non_functional_requirements',
+    'platform_requirements', 'infrastructure_requirements',
+    'operational_requirements', 'agent_capabilities',
+    'acceptance_criteria', 'technical_requirements',
+    'security_requirements', 'integration_requirements',
+    'deployment_requirements', 'success_metrics',
+    'key_milestones', 'dependencies', 'risks', 'assumptions',
+])
+
+
+def _line_bounds(content: str, pos: int) -> Tuple[int, int]:
+    """Start and end offsets of the line containing `pos`"""
+    end = content.find('\n', pos)
+    return content.rfind('\n', 0, pos) + 1, len(content) if end == -1 else end
+
 
 class PRDParser:
     """Comprehensive PRD parser that extracts all template fields"""
     
-    def __init__(self):
+    def __init__(self, mode: str = 'regex'):
+        if mode not in PARSER_MODES:
+            raise ValueError(f"Unknown PRD parser mode: {mode!r} (expected one of {', '.join(PARSER_MODES)})")
+        self.mode = mode
         self.section_patterns = {
             'title': r'^#\s*\*?\*?Title\*?\*?\s*$',
             'description': r'^##\s*\*?\*?Description\*?\*?\s*$',
@@ -38,18 +96,61 @@ class PRDParser:
             'assumptions': r'^##\s*\*?\*?Assumptions\*?\*?\s*$',
             'agent_capabilities': r'^##\s*\*?\*?Agent Capabilities\*?\*?\s*$',
         }
+        self._section_regex = self._compile_section_patterns(self.section_patterns)
+
+    @property
+    def cache_version(self) -> str:
+        """Parser version for cache keys; modes can differ on edge cases"""
+        return PARSER_VERSION if self.mode == 'regex' else f"{PARSER_VERSION}-{self.mode}"
+
+    @staticmethod
+    def _compile_section_patterns(section_patterns: Dict[str, str]) -> re.Pattern:
+        """Compile all section header patterns into one alternation.
+
+        Each pattern becomes a named group, so a single match classifies a line
+        and `lastgroup` names the section. Alternatives are tried in dict order,
+        matching the original first-match-wins loop.
+        """
+        alternation = '|'.join(
+            f'(?P<{name}>{pattern})' for name, pattern in section_patterns.items()
+        )
+        return re.compile(alternation, re.IGNORECASE)
     
     def parse_prd_content(self, content: str, filename: str = None) -> Dict[str, Any]:
         """
         Parse PRD content and extract all fields according to template structure
         """
+        # file_content keeps the front-matter; the fields come from the markdown after it
+        result = self._empty_result(content, filename)
+        content = strip_front_matter(content)
         lines = content.split('\n')
         
-        # Initialize result with defaults
-        result = {
+        # Extract title first
+        result['title'] = self._extract_title(lines, content)
+        
+        # Determine PRD type based on content
+        result['prd_type'], result['prd_type_confidence'] = self._determine_prd_type(content, filename)
+        
+        # First, try to extract inline fields (e.g., **Description:** value)
+        self._extract_inline_fields(content, result, lines)
+        
+        # Parse all sections
+        sections = self._identify_sections(lines, result['prd_type'], content)
+        
+        for section_name, section_content in sections.items():
+            if section_name in result:
+                self._apply_section(result, section_name, self._parse_section(section_name, section_content))
+        
+        return result
+    
+    @staticmethod
+    def _empty_result(content: str, filename: str = None) -> Dict[str, Any]:
+        """Result dict with every field at its default"""
+        return {
             'title': 'Untitled PRD',
             'description': '',
             'prd_type': 'agent',  # Default to agent
+            'prd_type_confidence': 0.5,
             'problem_statement': '',
             'target_users': [],
             'user_stories': [],
@@ -77,56 +178,149 @@ class PRDParser:
             'original_filename': filename,
             'file_content': content
         }
+    
+    def parse_prd_incremental(self, content: str, filename: str = None,
+                              previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Parse PRD content, reusing sections unchanged since a previous parse.
+
+        Each section is fingerprinted (SHA-256 of its lines); sections whose
+        fingerprint matches `previous` reuse the stored parsed value instead of
+        being re-extracted. Document-level fields (title, type, inline fields)
+        are always recomputed.
+
+        Args:
+            content: New PRD markdown
+            filename: Original filename (affects type detection)
+            previous: Return value of an earlier parse_prd_incremental call
+
+        Returns:
+            {
+                'result': same dict as parse_prd_content,
+                'sections': {name: {'fingerprint', 'value'}} - pass back as `previous`,
+                'changes': {'added', 'modified', 'removed', 'unchanged'} section names,
+                'updates': result fields whose value differs from the previous result
+            }
+        """
+        previous_sections = (previous or {}).get('sections', {})
+        previous_result = (previous or {}).get('result')
         
-        # Extract title first
+        result = self._empty_result(content, filename)
+        content = strip_front_matter(content)
+        lines = content.split('\n')
         result['title'] = self._extract_title(lines)
+        result['prd_type'], result['prd_type_confidence'] = self._determine_prd_type(content, filename)
+        self._extract_inline_fields(content, result, lines)
         
-        # Determine PRD type based on content
-        result['prd_type'] = self._determine_prd_type(content, filename)
-        
-        # First, try to extract inline fields (e.g., **Description:** value)
-        self._extract_inline_fields(content, result)
-        
-        # Parse all sections
-        sections = self._identify_sections(lines)
+        sections = self._identify_sections(lines, result['prd_type'], content)
+        section_state: Dict[str, Dict[str, Any]] = {}
+        changes: Dict[str, List[str]] = {'added': [], 'modified': [], 'removed': [], 'unchanged': []}
         
         for section_name, section_content in sections.items():
+            fingerprint = self.fingerprint_section(section_content)
+            cached = previous_sections.get(section_name)
+            if cached and cached['fingerprint'] == fingerprint:
+                value = copy.deepcopy(cached['value'])
+                changes['unchanged'].append(section_name)
+            else:
+                value = self._parse_section(section_name, section_content)
+                changes['modified' if cached else 'added'].append(section_name)
+            
+            section_state[section_name] = {'fingerprint': fingerprint, 'value': value}
             if section_name in result:
-                if section_name in ['target_users', 'user_stories', 'requirements', 
-                                  'functional_requirements', 'non_functional_requirements',
-                                  'platform_requirements', 'infrastructure_requirements',
-                                  'operational_requirements', 'agent_capabilities',
-                                  'acceptance_criteria', 'technical_requirements',
-                                  'security_requirements', 'integration_requirements',
-                                  'deployment_requirements', 'success_metrics',
-                                  'key_milestones', 'dependencies', 'risks', 'assumptions']:
-                    parsed_value = self._parse_list_section(section_content)
-                    # Only override if we don't already have a value from inline extraction
-                    if not result[section_name] or (isinstance(result[section_name], list) and len(result[section_name]) == 0):
-                        result[section_name] = parsed_value
-                elif section_name == 'performance_requirements':
-                    parsed_value = self._parse_performance_requirements(section_content)
-                    if not result[section_name]:
-                        result[section_name] = parsed_value
-                elif section_name == 'timeline':
-                    timeline_data = self._parse_timeline(section_content)
-                    if not result['timeline']:
-                        result['timeline'] = timeline_data['timeline']
-                    if not result['start_date']:
-                        result['start_date'] = timeline_data['start_date']
-                    if not result['target_completion_date']:
-                        result['target_completion_date'] = timeline_data['target_completion_date']
-                    if not result['key_milestones']:
-                        result['key_milestones'] = timeline_data['key_milestones']
-                else:
-                    parsed_value = self._parse_text_section(section_content)
-                    # Only override if we don't already have a value from inline extraction
-                    if not result[section_name] or (isinstance(result[section_name], str) and not result[section_name].strip()):
-                        result[section_name] = parsed_value
+                self._apply_section(result, section_name, copy.deepcopy(value))
         
-        return result
+        changes['removed'] = [name for name in previous_sections if name not in sections]
+        
+        if previous_result is None:
+            updates = dict(result)
+        else:
+            updates = {key: value for key, value in result.items() if previous_result.get(key) != value}
+        
+        return {'result': result, 'sections': section_state, 'changes': changes, 'updates': updates}
     
-    def _extract_title(self, lines: List[str]) -> str:
+    @staticmethod
+    def fingerprint_section(section_content: List[str]) -> str:
+        """Stable fingerprint of a section's raw lines."""
+        return hashlib.sha256('\n'.join(section_content).encode('utf-8')).hexdigest()
+    
+    def _parse_section(self, section_name: str, section_content: List[str]) -> Any:
+        """Extract the value of one section (depends only on its own lines)."""
+        if section_name in _LIST_SECTIONS:
+            return self._parse_list_section(section_content)
+        elif section_name == 'performance_requirements':
+            return self._parse_performance_requirements(section_content)
+        elif section_name == 'timeline':
+            return self._parse_timeline(section_content)
+        else:
+            return self._parse_text_section(section_content)
+    
+    def _apply_section(self, result: Dict[str, Any], section_name: str, parsed_value: Any) -> None:
+        """Merge a parsed section into the result without overriding inline values."""
+        if section_name in _LIST_SECTIONS:
+            # Only override if we don't already have a value from inline extraction
+            if not result[section_name] or (isinstance(result[section_name], list) and len(result[section_name]) == 0):
+                result[section_name] = parsed_value
+        elif section_name == 'performance_requirements':
+            if not result[section_name]:
+                result[section_name] = parsed_value
+        elif section_name == 'timeline':
+            if not result['timeline']:
+                result['timeline'] = parsed_value['timeline']
+            if not result['start_date']:
+                result['start_date'] = parsed_value['start_date']
+            if not result['target_completion_date']:
+                result['target_completion_date'] = parsed_value['target_completion_date']
+            if not result['key_milestones']:
+                result['key_milestones'] = parsed_value['key_milestones']
+        else:
+            # Only override if we don't already have a value from inline extraction
+            if not result[section_name] or (isinstance(result[section_name], str) and not result[section_name].strip()):
+                result[section_name] = parsed_value
+    
+    def extract_identity(self, content: str) -> Tuple[str, str]:
+        """Best-effort (title, description) without a full parse.
+
+        Title extraction is the parser's own; the description is the first
+        inline **Description:** value or else the last `## Description`
+        section. It usually equals the full parse, but callers must confirm
+        a match (e.g. against stored content) before relying on it.
+        """
+        content = strip_front_matter(content)
+        title = self._extract_title(content.split('\n'), content)
+
+        for hint in _INLINE_DESCRIPTION_RE.finditer(content):
+            line_start, line_end = _line_bounds(content, hint.start())
+            value = _INLINE_VALUE_RE.search(content[line_start:line_end].strip())
+            if value:
+                description = value.group(1).strip()
+                description = _LEADING_BOLD_RE.sub('', description)
+                description = _TRAILING_BOLD_RE.sub('', description)
+                description = _ITALIC_RE.sub(r'\1', _BOLD_RE.sub(r'\1', description))
+                if description:
+                    return title, description
+
+        # Like _identify_sections, the last non-empty Description section wins
+        headers = []
+        for hint in _DESCRIPTION_HEADER_HINT_RE.finditer(content):
+            line_start, line_end = _line_bounds(content, hint.start())
+            match = self._section_regex.match(content[line_start:line_end].strip())
+            if match and match.lastgroup == 'description':
+                headers.append(line_end)
+        for header_end in reversed(headers):
+            # The section runs to the next line that is a known section header
+            section_end = len(content)
+            for heading in _HEADING_START_RE.finditer(content, header_end):
+                line_start, line_end = _line_bounds(content, heading.start() + 1)
+                if self._section_regex.match(content[line_start:line_end].strip()):
+                    section_end = heading.start()
+                    break
+            section = [line for line in content[header_end:section_end].split('\n') if line.strip()]
+            if section:
+                return title, self._parse_text_section(section)
+        return title, ''
+
+    def _extract_title(self, lines: List[str], content: Optional[str] = None) -> str:
         """Extract title from PRD content with improved logic"""
         if not lines:
             return "Untitled PRD"
@@ -144,8 +338,8 @@ class PRDParser:
             text = re.sub(r'`(.+?)`', r'\1', text)
             return text.strip()
 
-        # First, look for explicit title sections
-        for i, line in enumerate(lines):
+        # First, look for explicit title sections (only if the document may have one)
+        for i, line in enumerate(lines if content is None or _TITLE_SECTION_HINT_RE.search(content) else ()):
             line = line.strip()
             if line.lower() in ['## title', '## **title**', '### title', '### **title**']:
                 # Found a title section, get the next non-empty line
@@ -207,93 +401,83 @@ class PRDParser:
 
         return "Untitled PRD"
     
-    def _extract_inline_fields(self, content: str, result: Dict[str, Any]) -> None:
-        """Extract fields from inline format like **Field:** value"""
-        lines = content.split('\n')
+    def _extract_inline_fields(self, content: str, result: Dict[str, Any],
+                               lines: Optional[List[str]] = None) -> None:
+        """Extract fields from inline format like **Field:** value
+
+        Single forward pass. A **Requirements:** line switches on list
+        collection, which runs until the next heading; the first block that
+        yields items fills `requirements`.
+        """
+        if lines is None:
+            lines = content.split('\n')
         
-        # Map of inline field patterns to result keys
-        field_patterns = {
-            r'\*\*Description:\*\*': 'description',
-            r'\*\*Problem Statement:\*\*': 'problem_statement',
-            r'\*\*Description\*\*:': 'description',
-            r'\*\*Problem Statement\*\*:': 'problem_statement',
-        }
+        collecting = False  # inside a **Requirements:** block
+        requirements: List[str] = []
+        requirements_open = not result['requirements']
         
         for line in lines:
             line_stripped = line.strip()
             if not line_stripped:
                 continue
             
-            # Check for inline field patterns
-            for pattern, field_key in field_patterns.items():
-                if re.search(pattern, line_stripped, re.IGNORECASE):
+            if collecting:
+                if line_stripped.startswith('-') or line_stripped.startswith('*'):
+                    # Extract requirement text
+                    req_text = _LIST_MARKER_RE.sub('', line_stripped)
+                    req_text = _BOLD_RE.sub(r'\1', req_text)
+                    req_text = _ITALIC_RE.sub(r'\1', req_text)
+                    if req_text.strip():
+                        requirements.append(req_text.strip())
+                elif line_stripped.startswith('#'):
+                    # Hit another section, stop
+                    collecting = False
+                    if requirements:
+                        result['requirements'] = requirements
+                        requirements_open = False
+            
+            # Every inline marker is bold, so lines without ** can't match
+            if '**' not in line_stripped:
+                continue
+            
+            # Check for inline field patterns (first matching pattern wins)
+            for pattern, field_key in _INLINE_FIELD_PATTERNS:
+                if pattern.search(line_stripped):
                     # Extract value after the colon
-                    match = re.search(r':\s*(.+)', line_stripped)
+                    match = _INLINE_VALUE_RE.search(line_stripped)
                     if match:
                         value = match.group(1).strip()
                         # Remove any remaining markdown formatting (including leading/trailing **)
-                        value = re.sub(r'^\*\*\s*', '', value)  # Remove leading **
-                        value = re.sub(r'\s*\*\*$', '', value)  # Remove trailing **
-                        value = re.sub(r'\*\*(.+?)\*\*', r'\1', value)  # Remove inline **
-                        value = re.sub(r'\*(.+?)\*', r'\1', value)  # Remove inline *
+                        value = _LEADING_BOLD_RE.sub('', value)  # Remove leading **
+                        value = _TRAILING_BOLD_RE.sub('', value)  # Remove trailing **
+                        value = _BOLD_RE.sub(r'\1', value)  # Remove inline **
+                        value = _ITALIC_RE.sub(r'\1', value)  # Remove inline *
                         if value and (not result[field_key] or (isinstance(result[field_key], str) and not result[field_key].strip())):
                             result[field_key] = value
                     break
             
-            # Also check for Requirements inline format
-            if re.search(r'\*\*Requirements?:\*\*', line_stripped, re.IGNORECASE):
-                # Look for list items on following lines
+            # Also check for Requirements inline format; a nested marker inside
+            # an open block is just another line of that block
+            if requirements_open and not collecting and _INLINE_REQUIREMENTS_RE.search(line_stripped):
+                collecting = True
                 requirements = []
-                for next_line in lines[lines.index(line) + 1:]:
-                    next_line_stripped = next_line.strip()
-                    if not next_line_stripped:
-                        continue
-                    if next_line_stripped.startswith('-') or next_line_stripped.startswith('*'):
-                        # Extract requirement text
-                        req_text = re.sub(r'^[\*\-\+]\s*', '', next_line_stripped)
-                        req_text = re.sub(r'\*\*(.+?)\*\*', r'\1', req_text)
-                        req_text = re.sub(r'\*(.+?)\*', r'\1', req_text)
-                        if req_text.strip():
-                            requirements.append(req_text.strip())
-                    elif next_line_stripped.startswith('#'):
-                        # Hit another section, stop
-                        break
-                if requirements and (not result['requirements'] or len(result['requirements']) == 0):
-                    result['requirements'] = requirements
-    
-    def _determine_prd_type(self, content: str, filename: str = None) -> str:
-        """Determine PRD type based on content and filename"""
-        content_lower = content.lower()
-        
-        # Check filename for type indicators
-        if filename:
-            filename_lower = filename.lower()
-            if 'platform' in filename_lower:
-                return 'platform'
-            elif 'agent' in filename_lower:
-                return 'agent'
-        
-        # Check content for type indicators
-        platform_indicators = [
-            'platform', 'infrastructure', 'system', 'deployment', 
-            'scalability', 'monitoring', 'operational'
-        ]
-        
-        agent_indicators = [
-            'ai agent', 'agent', 'artificial intelligence', 'machine learning',
-            'automation', 'chatbot', 'assistant', 'intelligent'
-        ]
-        
-        platform_score = sum(1 for indicator in platform_indicators if indicator in content_lower)
-        agent_score = sum(1 for indicator in agent_indicators if indicator in content_lower)
         
-        if platform_score > agent_score:
-            return 'platform'
-        else:
-            return 'agent'  # Default to agent
+        if collecting and requirements and requirements_open:
+            result['requirements'] = requirements
+    
+    def _determine_prd_type(self, content: str, filename: str = None) -> Tuple[str, float]:
+        """Determine PRD type and classifier confidence from content and filename"""
+        verdict = prd_type_classifier.classify(content, filename)
+        return verdict['prd_type'], verdict['confidence']
     
-    def _identify_sections(self, lines: List[str]) -> Dict[str, List[str]]:
+    def _identify_sections(self, lines: List[str], prd_type: str = None,
+                           content: str = None) -> Dict[str, List[str]]:
         """Identify and extract all sections from PRD content"""
+        if self.mode == 'ast':
+            if content is None:
+                content = '\n'.join(lines)
+            return sections_from_blocks(lines, tokenize_blocks(content), get_section_schema(prd_type))
+        
         sections = {}
         current_section = None
         current_content = []
@@ -301,12 +485,9 @@ class PRDParser:
         for line in lines:
             line_stripped = line.strip()
             
-            # Check if this line is a section header
-            section_found = None
-            for section_name, pattern in self.section_patterns.items():
-                if re.match(pattern, line_stripped, re.IGNORECASE):
-                    section_found = section_name
-                    break
+            # Check if this line is a section header (one match against all patterns)
+            match = self._section_regex.match(line_stripped)
+            section_found = match.lastgroup if match else None
             
             if section_found:
                 # Save previous section
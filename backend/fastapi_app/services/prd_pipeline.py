@@ -0,0 +1,401 @@
+"""
+Staged PRD ingestion pipeline.
+Every ingest path (file upload, incoming/save submissions, bulk import) runs
+decode -> precheck -> parse -> dedupe -> persist -> publish, where precheck
+returns exact duplicates before the (expensive) parse. The stages are connected by
+bounded asyncio queues and each one runs its own workers, so under burst load
+all stages work at once and throughput is set by the slowest stage rather than
+the sum of all of them. A full queue holds back the stage feeding it; a full
+entry queue rejects new submissions with IngestQueueFullError. The persist
+stage takes whatever is queued (up to its batch size) and stores it with one
+database insert.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from fastapi import UploadFile
+
+from ..models.prd import PRDResponse
+from ..utils.errors import IngestQueueFullError
+from ..utils.prd_hash import calculate_prd_hash
+
+STAGE_NAMES = ('decode', 'precheck', 'parse', 'dedupe', 'persist', 'publish')
+
+# Workers per stage; parse is capped by the parse pool, the others mostly wait on I/O
+DEFAULT_STAGE_WORKERS = {'decode': 2, 'precheck': 4, 'parse': 4, 'dedupe': 4, 'persist': 4, 'publish': 1}
+
+# Stages whose handler takes a list of jobs (drained from the queue together)
+BATCH_STAGES = ('persist',)
+
+# A document as submitted: an upload, raw bytes or already-decoded text
+IngestSource = Union[UploadFile, bytes, str]
+
+# Listeners are called as listener(outcome, prd) with outcome 'created' or 'duplicate'
+IngestListener = Callable[[str, PRDResponse], Optional[Awaitable[None]]]
+
+
+class IngestJob:
+    """One document moving through the pipeline."""
+
+    def __init__(self, source: IngestSource, filename: str, content_digest: Optional[str],
+                 future: "asyncio.Future[PRDResponse]"):
+        self.source = source
+        self.filename = filename
+        self.content_digest = content_digest
+        self.future = future
+        self.submitted_at = time.perf_counter()
+        self.content: Optional[str] = None
+        self.prd_data = None
+        self.content_hash: Optional[str] = None
+        # Hash the precheck found absent, and the persist generation it saw
+        self.checked_hash: Optional[str] = None
+        self.checked_generation = -1
+        self.result: Optional[PRDResponse] = None
+        self.outcome: Optional[str] = None  # 'created', 'duplicate' or 'failed'
+        self.error: Optional[BaseException] = None
+        # Identical documents that arrived while this one was in flight
+        self.followers: List["IngestJob"] = []
+
+    @property
+    def abandoned(self) -> bool:
+        """Nobody is waiting for this job any more (e.g. the client disconnected)."""
+        return self.future.done() and not self.followers
+
+
+class PipelineStage:
+    """A pipeline stage: a bounded input queue drained by a fixed set of workers.
+
+    A `batched` stage's worker takes every job already queued (up to
+    batch_size) and the handler always gets them as a list, even of one,
+    returning one outcome per job (an exception fails just that job).
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Any]],
+                 workers: int, queue_size: int, batched: bool = False, batch_size: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.batched = batched
+        self.batch_size = max(1, batch_size) if batched else 1
+        self.next_stage: Optional["PipelineStage"] = None
+        self.queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+        self._stats = {"processed": 0, "failed": 0, "skipped": 0, "batches": 0,
+                       "seconds_total": 0.0, "seconds_max": 0.0}
+
+    def start(self, on_error: Callable[[IngestJob, BaseException], None],
+              on_drop: Callable[[IngestJob], None]) -> None:
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._work(on_error, on_drop), name=f"prd-ingest-{self.name}-{i}")
+                       for i in range(self.workers)]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._busy = 0
+
+    async def _work(self, on_error: Callable[[IngestJob, BaseException], None],
+                    on_drop: Callable[[IngestJob], None]) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                jobs = []
+                for job in batch:
+                    if job.abandoned:
+                        self._stats["skipped"] += 1
+                        on_drop(job)
+                    else:
+                        jobs.append(job)
+                if not jobs:
+                    continue
+                self._busy += 1
+                started_at = time.perf_counter()
+                try:
+                    if self.batched:
+                        outcomes = await self.handler(jobs)
+                    else:
+                        outcomes = [await self.handler(jobs[0])]
+                except Exception as e:
+                    outcomes = [e] * len(jobs)
+                finally:
+                    self._busy -= 1
+                    elapsed = time.perf_counter() - started_at
+                    self._stats["batches"] += 1
+                    self._stats["seconds_total"] += elapsed
+                    self._stats["seconds_max"] = max(self._stats["seconds_max"], elapsed)
+                for job, forward in zip(jobs, outcomes):
+                    if isinstance(forward, BaseException):
+                        self._stats["failed"] += 1
+                        on_error(job, forward)
+                        continue
+                    self._stats["processed"] += 1
+                    # A handler may also name a later stage to skip ahead to
+                    target = forward if isinstance(forward, PipelineStage) else self.next_stage if forward else None
+                    if target is not None:
+                        # Blocks while the target stage is full: backpressure
+                        await target.queue.put(job)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self._stats["batches"]
+        stats = {
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue": self.queue_size,
+            "processed": self._stats["processed"],
+            "failed": self._stats["failed"],
+            "skipped": self._stats["skipped"],
+            "avg_ms": round(self._stats["seconds_total"] / batches * 1000, 2) if batches else 0.0,
+            "max_ms": round(self._stats["seconds_max"] * 1000, 2),
+        }
+        if self.batched:
+            stats["batch_size"] = self.batch_size
+            stats["batches"] = batches
+            stats["avg_batch"] = round((self._stats["processed"] + self._stats["failed"]) / batches, 2) if batches else 0.0
+        return stats
+
+
+class PRDIngestPipeline:
+    """decode -> precheck -> parse -> dedupe -> persist -> publish for PRD documents.
+
+    The stage handlers call back into PRDService for the actual work, so the
+    pipeline only decides ordering, concurrency and backpressure. Workers are
+    started lazily on the running event loop (and restarted if it changes).
+    """
+
+    def __init__(self, service, stage_workers: Optional[Dict[str, int]] = None,
+                 queue_size: int = 32, persist_batch_size: int = 32):
+        self.service = service
+        workers = dict(DEFAULT_STAGE_WORKERS)
+        workers.update(stage_workers or {})
+        handlers = {
+            'decode': self._decode, 'precheck': self._precheck, 'parse': self._parse, 'dedupe': self._dedupe,
+            'persist': self._persist, 'publish': self._publish,
+        }
+        self.stages = [PipelineStage(name, handlers[name], workers[name], queue_size,
+                                     batched=name in BATCH_STAGES, batch_size=persist_batch_size)
+                       for name in STAGE_NAMES]
+        self._stages_by_name = {stage.name: stage for stage in self.stages}
+        for stage, next_stage in zip(self.stages, self.stages[1:]):
+            stage.next_stage = next_stage
+        self._listeners: List[IngestListener] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # content hash -> job being deduplicated/persisted for that content
+        self._in_flight: Dict[str, IngestJob] = {}
+        self._stats = {"submitted": 0, "created": 0, "duplicates": 0, "fast_duplicates": 0, "coalesced": 0,
+                       "failed": 0, "abandoned": 0, "rejected": 0, "latency_seconds_total": 0.0}
+
+    def add_listener(self, listener: IngestListener) -> None:
+        """Call `listener(outcome, prd)` for every ingested PRD (sync or async)."""
+        self._listeners.append(listener)
+
+    async def submit(self, source: IngestSource, filename: str,
+                     content_digest: Optional[str] = None, wait: bool = False) -> PRDResponse:
+        """Ingest one document and return the created (or existing duplicate) PRD.
+
+        Raises IngestQueueFullError when the pipeline is full, unless `wait`
+        is set, in which case the call waits for room instead.
+        """
+        if isinstance(source, str):
+            # Resubmitted text that was ingested recently is answered without queueing
+            if content_digest is None:
+                self.service.check_document_size(source)
+                content_digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+            existing = await self.service._find_recent_duplicate(source, content_digest)
+            if existing is not None:
+                for counter in ("submitted", "duplicates", "fast_duplicates"):
+                    self._stats[counter] += 1
+                await self._notify('duplicate', existing)
+                return existing
+        job = await self._enqueue(source, filename, content_digest, wait)
+        return await job.future
+
+    async def submit_many(self, documents: Union[Iterable[Tuple[IngestSource, str]],
+                                                 AsyncIterable[Tuple[IngestSource, str]]]) -> List[IngestJob]:
+        """Ingest many documents, waiting for room as the pipeline fills.
+
+        `documents` may be an async iterable, so a producer (e.g. an archive
+        being read) is only pulled as fast as the pipeline takes documents.
+        Returns the finished jobs in input order; a failed document has
+        `outcome == 'failed'` and its exception in `error`.
+        """
+        if isinstance(documents, AsyncIterable):
+            jobs = [await self._enqueue(source, filename, None, wait=True)
+                    async for source, filename in documents]
+        else:
+            jobs = [await self._enqueue(source, filename, None, wait=True)
+                    for source, filename in documents]
+        await asyncio.gather(*(job.future for job in jobs), return_exceptions=True)
+        return jobs
+
+    async def _enqueue(self, source: IngestSource, filename: str,
+                       content_digest: Optional[str], wait: bool) -> IngestJob:
+        self._ensure_started()
+        job = IngestJob(source, filename, content_digest, self._loop.create_future())
+        entry = self.stages[0].queue
+        if wait:
+            await entry.put(job)
+        else:
+            try:
+                entry.put_nowait(job)
+            except asyncio.QueueFull:
+                self._stats["rejected"] += 1
+                raise IngestQueueFullError(
+                    "PRD ingest pipeline is at capacity, retry shortly",
+                    {"queued": entry.qsize(), "max_queue": entry.maxsize})
+        self._stats["submitted"] += 1
+        return job
+
+    def _ensure_started(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self.stop()
+        self._loop = loop
+        for stage in self.stages:
+            stage.start(self._fail, self._drop)
+
+    def stop(self) -> None:
+        """Cancel the stage workers; jobs still queued are dropped."""
+        for stage in self.stages:
+            stage.stop()
+        self._in_flight.clear()
+        self._loop = None
+
+    # Stage handlers: return True to pass the job on to the next stage (or a
+    # later stage to skip to), False when the job leaves the pipeline
+
+    async def _decode(self, job: IngestJob) -> bool:
+        source = job.source
+        if isinstance(source, str):
+            if job.content_digest is None:
+                self.service.check_document_size(source)
+                job.content_digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+            job.content = source
+        elif isinstance(source, bytes):
+            job.content, job.content_digest = self.service._decode_bytes(source)
+        else:
+            job.content, job.content_digest = await self.service._read_upload_text(source)
+        job.source = None  # drop the upload/bytes once decoded
+        return True
+
+    async def _precheck(self, job: IngestJob) -> Union[bool, PipelineStage]:
+        generation = self.service.persist_generation
+        existing, checked_hash = await self.service._find_exact_duplicate(job.content, job.content_digest)
+        if existing is not None:
+            job.result, job.outcome = existing, 'duplicate'
+            self._stats["fast_duplicates"] += 1
+            return self._stages_by_name['publish']
+        job.checked_hash, job.checked_generation = checked_hash, generation
+        return True
+
+    async def _parse(self, job: IngestJob) -> bool:
+        job.prd_data = await self.service._parse_to_prd_create(
+            job.content, job.filename, job.content_digest)
+        job.content_hash = calculate_prd_hash(job.prd_data.title, job.prd_data.description)
+        return True
+
+    async def _dedupe(self, job: IngestJob) -> bool:
+        leader = self._in_flight.get(job.content_hash)
+        if leader is not None:
+            # Same content is already past this point: share its result
+            leader.followers.append(job)
+            self._stats["coalesced"] += 1
+            return False
+        self._in_flight[job.content_hash] = job
+        if (job.content_hash == job.checked_hash
+                and job.checked_generation == self.service.persist_generation):
+            # The precheck looked this hash up and no insert finished since it began
+            return True
+        existing = await self.service._find_duplicate(job.content_hash, job.prd_data.title)
+        if existing is not None:
+            job.result, job.outcome = existing, 'duplicate'
+        return True
+
+    async def _persist(self, jobs: List[IngestJob]) -> List[Union[bool, BaseException]]:
+        # One insert for every job still without a stored PRD; a failed row fails only its job
+        new = [job for job in jobs if job.result is None]
+        failed: Dict[int, BaseException] = {}
+        if new:
+            results = await self.service._persist_prds([(job.prd_data, job.content_hash) for job in new])
+            for job, result in zip(new, results):
+                if isinstance(result, BaseException):
+                    failed[id(job)] = result
+                else:
+                    job.result, job.outcome = result, 'created'
+        return [failed.get(id(job), True) for job in jobs]
+
+    async def _publish(self, job: IngestJob) -> bool:
+        self._finish(job)
+        await self._notify(job.outcome, job.result)
+        return False
+
+    async def _notify(self, outcome: str, prd: PRDResponse) -> None:
+        for listener in self._listeners:
+            try:
+                result = listener(outcome, prd)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️  PRD ingest listener failed: {e}")
+
+    def _release(self, job: IngestJob) -> None:
+        if job.content_hash is not None and self._in_flight.get(job.content_hash) is job:
+            del self._in_flight[job.content_hash]
+
+    def _finish(self, job: IngestJob) -> None:
+        self._release(job)
+        now = time.perf_counter()
+        for waiting in [job] + job.followers:
+            if waiting is not job:
+                waiting.result, waiting.outcome = job.result, 'duplicate'
+            self._stats["created" if waiting.outcome == 'created' else "duplicates"] += 1
+            self._stats["latency_seconds_total"] += now - waiting.submitted_at
+            if waiting.content_digest is not None:
+                self.service.remember_content(waiting.content_digest, job.result.id)
+            if not waiting.future.done():
+                waiting.future.set_result(job.result)
+
+    def _drop(self, job: IngestJob) -> None:
+        self._release(job)
+        self._stats["abandoned"] += 1
+
+    def _fail(self, job: IngestJob, error: BaseException) -> None:
+        self._release(job)
+        for waiting in [job] + job.followers:
+            self._stats["failed"] += 1
+            waiting.outcome, waiting.error = 'failed', error
+            if not waiting.future.done():
+                waiting.future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage queue depth, utilisation and latency, plus pipeline totals."""
+        stages = {stage.name: stage.stats() for stage in self.stages}
+        finished = self._stats["created"] + self._stats["duplicates"]
+        # Busiest stage per worker: the one bounding throughput under load
+        slowest = max(stages, key=lambda name: stages[name]["avg_ms"] / stages[name]["workers"])
+        return {
+            "running": self._loop is not None,
+            "submitted": self._stats["submitted"],
+            "created": self._stats["created"],
+            "duplicates": self._stats["duplicates"],
+            "fast_duplicates": self._stats["fast_duplicates"],
+            "coalesced": self._stats["coalesced"],
+            "failed": self._stats["failed"],
+            "abandoned": self._stats["abandoned"],
+            "rejected": self._stats["rejected"],
+            "in_flight": self._stats["submitted"] - finished - self._stats["failed"] - self._stats["abandoned"],
+            "avg_latency_ms": round(self._stats["latency_seconds_total"] / finished * 1000, 2) if finished else 0.0,
+            "slowest_stage": slowest if finished else None,
+            "stages": stages,
+        }
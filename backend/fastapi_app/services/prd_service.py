@@ -1,19 +1,56 @@
 """
 PRD service for business logic operations.
 """
+import asyncio
+import codecs
+import hashlib
+import io
 import uuid
+import zipfile
 import re
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple, Union
 from datetime import datetime
 from fastapi import HTTPException, UploadFile
+from pydantic import ValidationError
 
 from ..models.prd import (
     PRDCreate, PRDUpdate, PRDResponse, PRDType, PRDStatus,
-    PRDListResponse, PRDMarkdownResponse
+    PRDListResponse, PRDMarkdownResponse, PRDBatchGetItem, PRDBatchGetResponse,
+    PRDContentUpdateResponse, PRDSectionChanges, PRDImportResult, PRDImportResponse,
+    MAX_ARCHIVE_DOCUMENTS
 )
 from ..utils.simple_data_manager import data_manager
 from ..utils.prd_hash import calculate_prd_hash
+from ..utils.prd_front_matter import front_matter_identity, with_front_matter
+from ..utils.delta import filter_changed_since, next_watermark
+from ..utils.parse_cache import ParseCache
+from ..utils.parse_pool import ParseWorkerPool
+from ..utils.errors import IngestQueueFullError, InvalidArchiveError, ParsePoolSaturatedError
+from ..utils.prd_archive import iter_archive
+from ..config import config
 from .prd_parser import PRDParser
+from .prd_classifier import prd_type_classifier
+from .prd_markdown_renderer import PRDMarkdownCache, markdown_etag
+from .prd_pipeline import IngestJob, PRDIngestPipeline
+from .github_api import GitHubAPIError
+from .github_prd_index import get_github_prd_index
+from .github_commit_batcher import get_github_commit_batcher
+
+# Read uploads in 64 KiB pieces so oversized files are rejected early
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Content digests of recently ingested documents remembered for the duplicate fast path
+RECENT_CONTENT_INDEX_SIZE = 4096
+
+# Parsed fields stored on a PRD record (the subset a content update may rewrite)
+PRD_CONTENT_FIELDS = (
+    'title', 'description', 'requirements', 'problem_statement', 'target_users',
+    'user_stories', 'acceptance_criteria', 'technical_requirements',
+    'performance_requirements', 'security_requirements', 'integration_requirements',
+    'deployment_requirements', 'success_metrics', 'timeline', 'dependencies',
+    'risks', 'assumptions', 'file_content',
+)
 
 
 class PRDService:
@@ -26,13 +63,42 @@ class PRDService:
             "statuses": ["backlog", "planned", "in_progress", "review", "completed"],
             "priorities": ["low", "medium", "high", "critical"]
         }
-        self.parser = PRDParser()
+        self.parser = PRDParser(mode=config.prd_parser_mode)
+        self.parse_cache = ParseCache(
+            max_entries=config.prd_parse_cache_size,
+            cache_dir=config.prd_parse_cache_dir,
+            version=self.parser.cache_version)
+        self.markdown_cache = PRDMarkdownCache(max_entries=config.prd_markdown_cache_size)
+        self.parse_pool = ParseWorkerPool(
+            max_workers=config.prd_parse_pool_workers,
+            max_queue=config.prd_parse_queue_limit)
+        # Every ingest path (uploads, incoming/save, bulk import) goes through here
+        self.ingest_pipeline = PRDIngestPipeline(
+            self,
+            stage_workers={'parse': config.prd_parse_pool_workers, **config.prd_ingest_stage_workers},
+            queue_size=config.prd_ingest_queue_size,
+            persist_batch_size=config.prd_ingest_persist_batch)
+        # Per-PRD section fingerprints from the last incremental parse
+        self._section_states: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Bumped when a PRD insert finishes, so a duplicate check can tell
+        # whether anything was stored since it started looking
+        self.persist_generation = 0
+        # SHA-256 of recently ingested content -> PRD ID (exact-duplicate fast path)
+        self._recent_content: "OrderedDict[str, str]" = OrderedDict()
 
     async def create_prd(self, prd_data: PRDCreate) -> PRDResponse:
         """Create a new PRD with content hash-based duplicate detection."""
         # Calculate content hash for duplicate detection
         content_hash = calculate_prd_hash(prd_data.title, prd_data.description)
-        print(f"🔍 Creating PRD: '{prd_data.title}'")
+        existing_prd = await self._find_duplicate(content_hash, prd_data.title)
+        if existing_prd is not None:
+            # CRITICAL: Must return here to prevent duplicate creation
+            return existing_prd
+        return await self._persist_prd(prd_data, content_hash)
+
+    async def _find_duplicate(self, content_hash: str, title: str) -> Optional[PRDResponse]:
+        """Return the stored PRD with this content hash, if there is one."""
+        print(f"🔍 Creating PRD: '{title}'")
         print(f"   Content hash: {content_hash[:16]}...")
         
         # Check for duplicate by content hash (deterministic, reliable)
@@ -42,33 +108,147 @@ class PRDService:
         if existing_prd:
             print(f"⚠️  DUPLICATE DETECTED! PRD with same content already exists")
             print(f"   Existing ID: {existing_prd.get('id')}")
-            print(f"   Title: '{prd_data.title}'")
+            print(f"   Title: '{title}'")
             print(f"   Hash: {content_hash[:16]}...")
             print(f"   ✅ Returning existing PRD (no duplicate created)")
             # Return existing PRD instead of creating duplicate
-            # CRITICAL: Must return here to prevent duplicate creation
-            try:
-                if isinstance(existing_prd.get("created_at"), str):
-                    existing_prd["created_at"] = datetime.fromisoformat(existing_prd["created_at"].replace('Z', '+00:00'))
-                if isinstance(existing_prd.get("updated_at"), str):
-                    existing_prd["updated_at"] = datetime.fromisoformat(existing_prd["updated_at"].replace('Z', '+00:00'))
-                return PRDResponse(**existing_prd)
-            except Exception as e:
-                # If datetime parsing fails, still return the existing PRD
-                # Use current time as fallback for datetime fields
-                print(f"   ⚠️  Warning: Datetime parsing failed, using fallback: {e}")
-                if "created_at" not in existing_prd or not isinstance(existing_prd.get("created_at"), datetime):
-                    existing_prd["created_at"] = datetime.utcnow()
-                if "updated_at" not in existing_prd or not isinstance(existing_prd.get("updated_at"), datetime):
-                    existing_prd["updated_at"] = datetime.utcnow()
-                return PRDResponse(**existing_prd)
+            return self._existing_prd_response(existing_prd)
         
         print(f"   ✅ No duplicate found - creating new PRD")
+        return None
+
+    async def _find_exact_duplicate(self, content: str,
+                                    content_digest: str) -> Tuple[Optional[PRDResponse], Optional[str]]:
+        """Fast duplicate check before the full parse.
+
+        Content ingested recently is found by its SHA-256; otherwise a
+        cheaply extracted title and description are hashed and looked up.
+        A stored PRD only counts if its file content is byte-for-byte the
+        same, so a wrong guess costs a lookup, never a wrong answer. Returns
+        the existing PRD (or None) and, if nothing is stored under it, the
+        hash that was checked.
+        """
+        existing = await self._find_recent_duplicate(content, content_digest)
+        if existing is not None:
+            return existing, None
+
+        title, description = self.parser.extract_identity(content)
+        if not description:
+            # PRDCreate rejects an empty description; let the full path report it
+            return None, None
+        content_hash = calculate_prd_hash(title, description)
+        existing_prd = await data_manager.get_prd_by_hash(content_hash)
+        if existing_prd is None:
+            return None, content_hash
+        if existing_prd.get("file_content") != content:
+            return None, None
+        print(f"⚡ Duplicate PRD content matched before parsing: {existing_prd.get('id')}")
+        self.remember_content(content_digest, existing_prd["id"])
+        return self._existing_prd_response(existing_prd), content_hash
+
+    async def _find_recent_duplicate(self, content: str, content_digest: str) -> Optional[PRDResponse]:
+        """The stored PRD for recently ingested content with this SHA-256, if unchanged."""
+        prd_id = self._recent_content.get(content_digest)
+        if prd_id is None:
+            return None
+        existing_prd = await data_manager.get_prd(prd_id)
+        if existing_prd is None or existing_prd.get("file_content") != content:
+            # Deleted or edited since: forget it
+            self._recent_content.pop(content_digest, None)
+            return None
+        self._recent_content.move_to_end(content_digest)
+        return self._existing_prd_response(existing_prd)
+
+    def remember_content(self, content_digest: str, prd_id: str) -> None:
+        """Record which PRD holds this content, for the duplicate fast path."""
+        self._recent_content[content_digest] = prd_id
+        self._recent_content.move_to_end(content_digest)
+        while len(self._recent_content) > RECENT_CONTENT_INDEX_SIZE:
+            self._recent_content.popitem(last=False)
+
+    @staticmethod
+    def _existing_prd_response(existing_prd: Dict[str, Any]) -> PRDResponse:
+        """PRDResponse for a stored PRD returned in place of a duplicate."""
+        try:
+            if isinstance(existing_prd.get("created_at"), str):
+                existing_prd["created_at"] = datetime.fromisoformat(existing_prd["created_at"].replace('Z', '+00:00'))
+            if isinstance(existing_prd.get("updated_at"), str):
+                existing_prd["updated_at"] = datetime.fromisoformat(existing_prd["updated_at"].replace('Z', '+00:00'))
+            return PRDResponse(**existing_prd)
+        except Exception as e:
+            # If datetime parsing fails, still return the existing PRD
+            # Use current time as fallback for datetime fields
+            print(f"   ⚠️  Warning: Datetime parsing failed, using fallback: {e}")
+            if "created_at" not in existing_prd or not isinstance(existing_prd.get("created_at"), datetime):
+                existing_prd["created_at"] = datetime.utcnow()
+            if "updated_at" not in existing_prd or not isinstance(existing_prd.get("updated_at"), datetime):
+                existing_prd["updated_at"] = datetime.utcnow()
+            return PRDResponse(**existing_prd)
+
+    async def _persist_prd(self, prd_data: PRDCreate, content_hash: str) -> PRDResponse:
+        """Store a new PRD (falls back to in-memory storage if the database fails)."""
+        result = (await self._persist_prds([(prd_data, content_hash)]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _persist_prds(self, items: List[Tuple[PRDCreate, str]]) -> List[Union[PRDResponse, BaseException]]:
+        """Store new PRDs with one database insert; results (or errors) in input order.
+
+        If the batch insert fails, each PRD is stored on its own, so one bad
+        record only fails itself.
+        """
+        try:
+            return await self._insert_prds(items)
+        finally:
+            # Only once the insert is done: a lookup that ran alongside it may
+            # have missed these rows, and must not be taken as current
+            self.persist_generation += 1
+
+    async def _insert_prds(self, items: List[Tuple[PRDCreate, str]]) -> List[Union[PRDResponse, BaseException]]:
+        records = []
+        taken = set()
+        for prd_data, content_hash in items:
+            prd_id = await self._front_matter_prd_id(prd_data.file_content)
+            if prd_id is None or prd_id in taken:
+                prd_id = str(uuid.uuid4())
+            taken.add(prd_id)
+            records.append(self._prd_record(prd_id, prd_data, content_hash))
+
+        if len(records) > 1:
+            try:
+                return [self._to_prd_response(saved) for saved in await data_manager.create_prds(records)]
+            except Exception as e:
+                print(f"Database batch insert of {len(records)} PRDs failed, storing one by one: {e}")
+        results: List[Union[PRDResponse, BaseException]] = []
+        for record in records:
+            try:
+                results.append(await self._store_prd_record(record))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _store_prd_record(self, prd_dict: Dict[str, Any]) -> PRDResponse:
+        # Try to save to database (will fallback to local database if Supabase fails)
+        try:
+            saved_prd = await data_manager.create_prd(prd_dict)
+            if saved_prd:
+                return self._to_prd_response(saved_prd)
+        except Exception as e:
+            print(f"Database save failed, using in-memory storage: {e}")
         
-        prd_id = str(uuid.uuid4())
+        # Fallback to in-memory storage
+        if not hasattr(self, '_prds_db'):
+            self._prds_db: Dict[str, Dict[str, Any]] = {}
+        self._prds_db[prd_dict["id"]] = prd_dict
+        return PRDResponse(**prd_dict)
+
+    @staticmethod
+    def _prd_record(prd_id: str, prd_data: PRDCreate, content_hash: str) -> Dict[str, Any]:
+        """The stored row for a new PRD."""
         now = datetime.utcnow()
 
-        prd_dict = {
+        return {
             "id": prd_id,
             "title": prd_data.title,
             "description": prd_data.description,
@@ -104,22 +284,45 @@ class PRDService:
             "original_filename": prd_data.original_filename,
             "file_content": prd_data.file_content}
 
-        # Try to save to database (will fallback to local database if Supabase fails)
+    async def _front_matter_prd_id(self, content: Optional[str]) -> Optional[str]:
+        """The PRD ID in the file's front-matter, if it is a UUID not yet in use.
+
+        Keeping it as the row ID lets the row find its file with one index
+        lookup (GitHubPRDIndex.find_by_id).
+        """
+        prd_id, _ = front_matter_identity(content or "")
+        if not prd_id:
+            return None
         try:
-            saved_prd = await data_manager.create_prd(prd_dict)
-            if saved_prd:
-                # Convert datetime strings back to datetime objects for response
-                saved_prd["created_at"] = datetime.fromisoformat(saved_prd["created_at"].replace('Z', '+00:00'))
-                saved_prd["updated_at"] = datetime.fromisoformat(saved_prd["updated_at"].replace('Z', '+00:00'))
-                return PRDResponse(**saved_prd)
-        except Exception as e:
-            print(f"Database save failed, using in-memory storage: {e}")
-        
-        # Fallback to in-memory storage
-        if not hasattr(self, '_prds_db'):
-            self._prds_db: Dict[str, Dict[str, Any]] = {}
-        self._prds_db[prd_id] = prd_dict
-        return PRDResponse(**prd_dict)
+            prd_id = str(uuid.UUID(prd_id))
+        except ValueError:
+            return None
+        try:
+            taken = await data_manager.get_prd(prd_id) is not None
+        except Exception:
+            taken = False
+        if taken or prd_id in getattr(self, '_prds_db', {}):
+            return None
+        return prd_id
+
+    async def with_identity_front_matter(self, content: str) -> Tuple[str, str, str]:
+        """(content, prd_id, content_hash) with the PRD ID and database content hash in the front-matter.
+
+        The hash comes from a full parse, so it is the one the database row
+        will carry; a PRD ID already in the front-matter is kept.
+        """
+        prd_id, _ = front_matter_identity(content)
+        prd_id = prd_id or str(uuid.uuid4())
+        try:
+            parsed, _ = await self.parse_pool.run(self._parse_and_detect_type, content, None, None)
+        except ParsePoolSaturatedError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=e.message,
+                headers={"Retry-After": "1"}
+            )
+        content_hash = calculate_prd_hash(parsed["title"], parsed["description"])
+        return with_front_matter(content, prd_id, content_hash), prd_id, content_hash
 
     async def get_prd(self, prd_id: str) -> PRDResponse:
         """Get a PRD by ID."""
@@ -128,10 +331,8 @@ class PRDService:
             if data_manager.is_connected():
                 prd_data = await data_manager.get_prd(prd_id)
                 if prd_data:
-                    # Convert datetime strings back to datetime objects
-                    prd_data["created_at"] = datetime.fromisoformat(prd_data["created_at"].replace('Z', '+00:00'))
-                    prd_data["updated_at"] = datetime.fromisoformat(prd_data["updated_at"].replace('Z', '+00:00'))
-                    return PRDResponse(**prd_data)
+                    # Timestamps may be strings or (in-memory records) datetimes already
+                    return self._to_prd_response(prd_data)
         except Exception as e:
             print(f"Database get failed, trying in-memory storage: {e}")
         
@@ -143,24 +344,81 @@ class PRDService:
 
         return PRDResponse(**self._prds_db[prd_id])
 
+    async def batch_get_prds(self, prd_ids: List[str]) -> PRDBatchGetResponse:
+        """Get several PRDs by ID with a single storage lookup.
+
+        Results follow request order; unknown IDs get a not-found marker. A
+        storage failure is a 503, not a batch of not-found markers.
+        """
+        unique_ids = list(dict.fromkeys(prd_ids))
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            for prd in await data_manager.get_prds_by_ids(unique_ids):
+                found[str(prd["id"])] = prd
+        except Exception as e:
+            print(f"❌ Database batch get of {len(unique_ids)} PRDs failed: {e}")
+            raise HTTPException(status_code=503, detail="PRD storage is unavailable, retry shortly")
+
+        # Fallback to in-memory storage for anything the database didn't return
+        for prd_id in unique_ids:
+            if prd_id not in found and prd_id in getattr(self, '_prds_db', {}):
+                found[prd_id] = self._prds_db[prd_id]
+
+        responses: Dict[str, PRDResponse] = {}
+        for prd_id, prd in found.items():
+            try:
+                responses[prd_id] = self._to_prd_response(prd)
+            except Exception as e:
+                print(f"❌ Error creating PRDResponse for PRD {prd_id}: {e}")
+
+        return PRDBatchGetResponse(
+            results=[
+                PRDBatchGetItem(id=prd_id, found=prd_id in responses, prd=responses.get(prd_id))
+                for prd_id in prd_ids
+            ],
+            not_found=[prd_id for prd_id in unique_ids if prd_id not in responses]
+        )
+
+    @staticmethod
+    def _to_prd_response(prd: Dict[str, Any]) -> PRDResponse:
+        """Build a PRDResponse from a stored record without mutating it."""
+        prd = dict(prd)
+        for field in ("created_at", "updated_at"):
+            if isinstance(prd.get(field), str):
+                prd[field] = datetime.fromisoformat(prd[field].replace('Z', '+00:00'))
+        return PRDResponse(**prd)
+
     async def get_prds(
         self,
         skip: int = 0,
         limit: int = 100,
         prd_type: Optional[PRDType] = None,
-        status: Optional[PRDStatus] = None
+        status: Optional[PRDStatus] = None,
+        updated_since: Optional[datetime] = None,
+        deleted_since: Optional[datetime] = None
     ) -> PRDListResponse:
-        """Get a list of PRDs with optional filtering."""
+        """Get a list of PRDs with optional filtering.
+
+        When `updated_since` is given only PRDs changed at or after it are
+        returned (oldest change first); `deleted_since` adds the IDs of PRDs
+        deleted since then. The response watermark is the value to send on
+        the next delta request.
+        """
+        tombstones = await data_manager.get_tombstones("prds", deleted_since)
+        deleted_ids = [t["record_id"] for t in tombstones]
+
         # Try to get from database first (will fallback to local database if Supabase fails)
         try:
             # Pass status parameter to database manager for efficient filtering
             status_value = status.value if status else None
-            prds_data = await data_manager.get_prds(skip, limit)
+            prds_data = await data_manager.get_prds(skip, limit, updated_since=updated_since)
             if prds_data:
                 # Convert datetime strings back to datetime objects
                 for prd in prds_data:
-                    prd["created_at"] = datetime.fromisoformat(prd["created_at"].replace('Z', '+00:00'))
-                    prd["updated_at"] = datetime.fromisoformat(prd["updated_at"].replace('Z', '+00:00'))
+                    if isinstance(prd.get("created_at"), str):
+                        prd["created_at"] = datetime.fromisoformat(prd["created_at"].replace('Z', '+00:00'))
+                    if isinstance(prd.get("updated_at"), str):
+                        prd["updated_at"] = datetime.fromisoformat(prd["updated_at"].replace('Z', '+00:00'))
                 
                 # Apply remaining filters (prd_type filtering still done in memory)
                 filtered_prds = prds_data
@@ -172,7 +430,10 @@ class PRDService:
                     total=len(filtered_prds),
                     page=skip // limit + 1,
                     size=limit,
-                    has_next=len(filtered_prds) == limit
+                    has_next=len(filtered_prds) == limit,
+                    deleted_ids=deleted_ids,
+                    # Watermark covers the unfiltered page so filtered-out changes aren't refetched
+                    watermark=next_watermark(prds_data, tombstones, updated_since, deleted_since)
                 )
         except Exception as e:
             print(f"Database get_prds failed, using in-memory storage: {e}")
@@ -180,7 +441,7 @@ class PRDService:
         # Fallback to in-memory storage
         if not hasattr(self, '_prds_db'):
             self._prds_db: Dict[str, Dict[str, Any]] = {}
-        prds = list(self._prds_db.values())
+        prds = filter_changed_since(self._prds_db.values(), updated_since)
 
         # Apply filters
         if prd_type:
@@ -188,8 +449,9 @@ class PRDService:
         if status:
             prds = [p for p in prds if p["status"] == status.value]
 
-        # Sort by created_at descending
-        prds.sort(key=lambda x: x["created_at"], reverse=True)
+        # Sort by created_at descending (delta queries keep oldest change first)
+        if updated_since is None:
+            prds.sort(key=lambda x: x["created_at"], reverse=True)
 
         # Apply pagination
         total = len(prds)
@@ -200,7 +462,9 @@ class PRDService:
             total=total,
             page=skip // limit + 1,
             size=limit,
-            has_next=skip + limit < total
+            has_next=skip + limit < total,
+            deleted_ids=deleted_ids,
+            watermark=next_watermark(prds, tombstones, updated_since, deleted_since)
         )
 
     async def update_prd(
@@ -314,11 +578,14 @@ class PRDService:
     async def _delete_prd_from_github(self, prd_data: Dict[str, Any]) -> bool:
         """Delete PRD file from GitHub repository (helper method).
         
-        Uses multiple matching strategies in order of reliability:
-        1. Content hash matching (most reliable - same as duplicate detection)
+        Files are looked up in the GitHub PRD index (one conditional tree
+        request, downloads only for blobs it has not seen), using multiple
+        matching strategies in order of reliability:
+        1. PRD ID in the file's front-matter
         2. Exact filename match (if original_filename is stored)
-        3. Filename pattern matching (based on title slug)
-        4. Title/description content comparison
+        3. Content hash (front-matter or computed from the file)
+        4. Filename pattern matching (based on title slug)
+        The first three are single dictionary lookups in the index.
         
         Returns:
             bool: True if deletion succeeded, False otherwise
@@ -327,12 +594,11 @@ class PRDService:
             from ..config import config
             from ..utils.prd_hash import calculate_prd_hash, normalize_text
             import os
-            import requests
             import re
-            import base64
             
+            # The local working-copy backend commits without the GitHub API
             github_token = config.github_token or os.getenv("GITHUB_TOKEN")
-            if not github_token:
+            if not github_token and config.prd_source_backend != "local":
                 print("⚠️  Error: GitHub token not available, cannot delete from GitHub")
                 return False
             
@@ -360,179 +626,60 @@ class PRDService:
                 text = re.sub(r"[^a-z0-9]+", "-", text)
                 return text.strip("-") or "prd"
             
-            # Search for the file in GitHub
-            headers = {
-                'Authorization': f'token {github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            # Get all files in prds/queue/
-            url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/prds/queue'
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code != 200:
-                print(f"⚠️  Error: Could not list GitHub files: {response.status_code}")
-                if response.status_code == 404:
-                    print(f"   Directory prds/queue/ may not exist in repository")
-                return False
-            
-            files = response.json()
-            if not isinstance(files, list):
-                print(f"⚠️  Error: Unexpected response format from GitHub API")
+            # One conditional tree request; files are only downloaded when their blob SHA is new
+            index = get_github_prd_index(repo_owner, repo_name)
+            # A stale index is still safe to delete from: GitHub rejects the delete if the blob SHA moved on
+            if not await index.refresh() and not len(index):
                 return False
             
             matched_file = None
             match_strategy = None
             
-            # Strategy 1: Exact filename match (if original_filename is stored)
-            if original_filename:
-                for file_info in files:
-                    file_name = file_info.get("name", "")
-                    if file_name == original_filename or file_name == f"prds/queue/{original_filename}":
-                        matched_file = file_info
-                        match_strategy = "exact_filename"
-                        print(f"✅ Matched file by exact filename: {file_name}")
-                        break
+            # Strategy 1: PRD ID written into the file's front-matter
+            prd_id = prd_data.get("id")
+            if prd_id:
+                matched_file = index.find_by_id(prd_id)
+                if matched_file:
+                    match_strategy = "prd_id"
+                    print(f"✅ Matched file by PRD ID: {matched_file['name']}")
             
-            # Strategy 2: Content hash matching (most reliable)
+            # Strategy 2: Exact filename match (if original_filename is stored)
+            if not matched_file and original_filename:
+                matched_file = index.get(original_filename) or index.get(original_filename.rsplit("/", 1)[-1])
+                if matched_file:
+                    match_strategy = "exact_filename"
+                    print(f"✅ Matched file by exact filename: {matched_file['name']}")
+            
+            # Strategy 3: Content hash (same hash as duplicate detection)
             if not matched_file and content_hash:
-                title_slug = slugify(title)
-                for file_info in files:
-                    file_name = file_info.get("name", "")
-                    if file_name.endswith(".md") and file_name != "README.md":
-                        # Check if filename contains hash (format: YYYY-MM-DD_slug_HASH.md)
-                        # Extract hash from filename if present
-                        file_base = file_name.replace(".md", "")
-                        if "_" in file_base:
-                            parts = file_base.split("_")
-                            if len(parts) >= 3:
-                                # Format: date_slug_hash
-                                file_hash_part = parts[-1]
-                                # Compare with first 8 chars of our hash
-                                if content_hash[:8].lower() == file_hash_part.lower():
-                                    # Verify by reading file content
-                                    file_path = file_info.get("path", "")
-                                    file_content_url = file_info.get("download_url")
-                                    if file_content_url:
-                                        try:
-                                            file_response = requests.get(file_content_url, timeout=10)
-                                            if file_response.status_code == 200:
-                                                file_content = file_response.text
-                                                # Extract title and description from file
-                                                file_lines = file_content.split('\n')
-                                                file_title = ""
-                                                file_description = ""
-                                                capture_desc = False
-                                                
-                                                for line in file_lines:
-                                                    if line.strip().startswith('# '):
-                                                        file_title = line[2:].strip()
-                                                    if line.strip().startswith('## Description'):
-                                                        capture_desc = True
-                                                        continue
-                                                    if capture_desc and line.strip().startswith('##'):
-                                                        break
-                                                    if capture_desc:
-                                                        file_description += line + "\n"
-                                                
-                                                # Calculate hash of file content
-                                                file_hash = calculate_prd_hash(file_title, file_description)
-                                                if file_hash == content_hash:
-                                                    matched_file = file_info
-                                                    match_strategy = "content_hash"
-                                                    print(f"✅ Matched file by content hash: {file_name}")
-                                                    break
-                                        except Exception as e:
-                                            print(f"   ⚠️  Error reading file {file_name}: {e}")
-                                            continue
+                matched_file = index.find_by_hash(content_hash)
+                if matched_file:
+                    match_strategy = "content_hash"
+                    print(f"✅ Matched file by content hash: {matched_file['name']}")
             
-            # Strategy 3: Filename pattern matching (based on title slug)
+            # Strategy 4: Filename pattern matching (based on title slug)
             if not matched_file:
                 title_slug = slugify(title)
-                # Try different filename patterns
-                patterns = [
-                    f"*{title_slug}*.md",
-                    f"*{title_slug.replace('-', '_')}*.md",
-                ]
-                
-                for file_info in files:
-                    file_name = file_info.get("name", "")
-                    if file_name.endswith(".md") and file_name != "README.md":
-                        file_base = file_name.replace(".md", "").lower()
-                        # Remove date prefix if present (YYYY-MM-DD_)
-                        if "_" in file_base:
-                            file_slug = "_".join(file_base.split("_")[1:])  # Skip date part
-                        else:
-                            file_slug = file_base
-                        
-                        # Check if title slug matches file slug
-                        if title_slug in file_slug or file_slug in title_slug:
-                            # Verify by reading file and comparing title
-                            file_content_url = file_info.get("download_url")
-                            if file_content_url:
-                                try:
-                                    file_response = requests.get(file_content_url, timeout=10)
-                                    if file_response.status_code == 200:
-                                        file_content = file_response.text
-                                        file_lines = file_content.split('\n')
-                                        for line in file_lines:
-                                            if line.strip().startswith('# '):
-                                                file_title = line[2:].strip()
-                                                # Normalize and compare
-                                                if normalize_text(file_title) == normalize_text(title):
-                                                    matched_file = file_info
-                                                    match_strategy = "filename_pattern"
-                                                    print(f"✅ Matched file by filename pattern: {file_name}")
-                                                    break
-                                except Exception as e:
-                                    print(f"   ⚠️  Error reading file {file_name}: {e}")
-                                    continue
-                        
-                        if matched_file:
-                            break
-            
-            # Strategy 4: Content comparison (read all files and compare title/description)
-            if not matched_file and description:
-                print(f"   🔍 Trying content comparison for '{title}'...")
-                for file_info in files:
-                    file_name = file_info.get("name", "")
-                    if file_name.endswith(".md") and file_name != "README.md":
-                        file_content_url = file_info.get("download_url")
-                        if file_content_url:
-                            try:
-                                file_response = requests.get(file_content_url, timeout=10)
-                                if file_response.status_code == 200:
-                                    file_content = file_response.text
-                                    file_lines = file_content.split('\n')
-                                    file_title = ""
-                                    file_description = ""
-                                    capture_desc = False
-                                    
-                                    for line in file_lines:
-                                        if line.strip().startswith('# '):
-                                            file_title = line[2:].strip()
-                                        if line.strip().startswith('## Description'):
-                                            capture_desc = True
-                                            continue
-                                        if capture_desc and line.strip().startswith('##'):
-                                            break
-                                        if capture_desc:
-                                            file_description += line + "\n"
-                                    
-                                    # Compare normalized title and description
-                                    if (normalize_text(file_title) == normalize_text(title) and
-                                        normalize_text(file_description[:500]) == normalize_text(description[:500])):
-                                        matched_file = file_info
-                                        match_strategy = "content_comparison"
-                                        print(f"✅ Matched file by content comparison: {file_name}")
-                                        break
-                            except Exception as e:
-                                print(f"   ⚠️  Error reading file {file_name}: {e}")
-                                continue
+                normalized_title = normalize_text(title)
+                for file_info in index.entries():
+                    file_base = file_info["name"][:-len(".md")].lower()
+                    # Remove date prefix if present (YYYY-MM-DD_)
+                    if "_" in file_base:
+                        file_slug = "_".join(file_base.split("_")[1:])  # Skip date part
+                    else:
+                        file_slug = file_base
+                    
+                    # Check if title slug matches file slug, then verify the title
+                    if ((title_slug in file_slug or file_slug in title_slug)
+                            and normalize_text(file_info["title"]) == normalized_title):
+                        matched_file = file_info
+                        match_strategy = "filename_pattern"
+                        print(f"✅ Matched file by filename pattern: {file_info['name']}")
+                        break
             
             if not matched_file:
                 print(f"⚠️  Error: Could not find PRD file in GitHub for '{title}'")
-                print(f"   Tried strategies: exact_filename, content_hash, filename_pattern, content_comparison")
+                print(f"   Tried strategies: prd_id, exact_filename, content_hash, filename_pattern")
                 if original_filename:
                     print(f"   Original filename: {original_filename}")
                 if content_hash:
@@ -543,24 +690,24 @@ class PRDService:
             file_path = matched_file["path"]
             file_sha = matched_file["sha"]
             
-            delete_url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}'
-            delete_data = {
-                "message": f"Delete PRD: {title} (via website)",
-                "sha": file_sha,
-                "branch": "main"
-            }
-            
-            delete_response = requests.delete(delete_url, headers=headers, json=delete_data, timeout=10)
-            
-            if delete_response.status_code in [200, 204]:
-                print(f"✅ Deleted PRD file from GitHub: {file_path} (matched via {match_strategy})")
-                return True
-            else:
-                error_detail = delete_response.json().get("message", "Unknown error") if delete_response.text else "No error message"
-                print(f"⚠️  Error: Failed to delete from GitHub: {delete_response.status_code}")
-                print(f"   Error: {error_detail}")
+            # Deletes arriving together (bulk deletes) are written as one commit
+            batcher = get_github_commit_batcher(repo_owner, repo_name)
+            try:
+                result = await batcher.delete(file_path, f"Delete PRD: {title} (via website)", sha=file_sha)
+            except GitHubAPIError as e:
+                print(f"⚠️  Error: Failed to delete from GitHub: {e.status_code}")
+                print(f"   Error: {e}")
                 print(f"   File path: {file_path}")
                 return False
+            if result["status"] != "committed":
+                print(f"⚠️  Error: Failed to delete from GitHub: {result['status']}")
+                print(f"   Error: {result.get('error')}")
+                print(f"   File path: {file_path}")
+                return False
+            
+            print(f"✅ Deleted PRD file from GitHub: {file_path} (matched via {match_strategy})")
+            index.remove(matched_file["name"])
+            return True
         
         except Exception as e:
             # Log the error but return False so caller knows deletion failed
@@ -589,23 +736,191 @@ class PRDService:
                 detail="File must be a .md or .txt file"
             )
 
-        content = await file.read()
+        return await self._ingest(file, file.filename)
+
+    async def _ingest(self, source, filename: str, content_digest: Optional[str] = None) -> PRDResponse:
+        """Run one document through the ingest pipeline, mapping overload to 503."""
+        try:
+            return await self.ingest_pipeline.submit(source, filename, content_digest)
+        except (IngestQueueFullError, ParsePoolSaturatedError) as e:
+            raise HTTPException(
+                status_code=503,
+                detail=e.message,
+                headers={"Retry-After": "1"}
+            )
+
+    async def import_prds(self, documents: List[Tuple[str, str]]) -> PRDImportResponse:
+        """Bulk import (content, filename) pairs through the ingest pipeline.
+
+        Documents are fed in as the pipeline has room, so a large import is
+        paced by the slowest stage instead of being rejected; each document
+        succeeds or fails on its own.
+        """
+        jobs = await self.ingest_pipeline.submit_many(documents)
+        return self._import_response([self._import_result(job) for job in jobs])
+
+    async def import_prd_archive(self, file: UploadFile) -> PRDImportResponse:
+        """Bulk import the .md/.txt members of a zip or tar archive.
+
+        Members are read one at a time from the upload (never extracted to
+        disk) as the ingest pipeline has room, so parsing runs in parallel
+        with reading. Byte-identical members are reported as duplicates of
+        the first without being parsed again; everything else is deduped
+        against the store by the pipeline and inserted in batches.
+        """
+        max_bytes = config.prd_max_archive_bytes
+        size = getattr(file, "size", None)
+        if size is not None and size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"PRD archive exceeds the maximum size of {max_bytes} bytes"
+            )
+        members = iter_archive(file.file, config.prd_max_document_bytes, MAX_ARCHIVE_DOCUMENTS)
+        try:
+            # Opening the archive happens on the first read
+            first = await asyncio.to_thread(next, members, None)
+        except InvalidArchiveError as e:
+            raise HTTPException(status_code=400, detail=e.message)
+
+        # One slot per member in archive order; pipeline documents fill theirs at the end
+        results: List[Optional[PRDImportResult]] = []
+        submitted: List[int] = []
+        first_by_digest: Dict[str, int] = {}
+        copies: List[Tuple[int, int, str]] = []
+
+        async def documents():
+            member = first
+            while member is not None:
+                if member.data is None:
+                    results.append(PRDImportResult(
+                        filename=member.name, status=member.status, error=member.error))
+                else:
+                    digest = hashlib.sha256(member.data).hexdigest()
+                    if digest in first_by_digest:
+                        copies.append((len(results), first_by_digest[digest], member.name))
+                        results.append(None)
+                    else:
+                        first_by_digest[digest] = len(results)
+                        submitted.append(len(results))
+                        results.append(None)
+                        yield member.data, member.name
+                # Reading (and inflating) the next member is blocking I/O
+                member = await asyncio.to_thread(next, members, None)
+
+        jobs = await self.ingest_pipeline.submit_many(documents())
+        for slot, job in zip(submitted, jobs):
+            results[slot] = self._import_result(job)
+        for slot, original, filename in copies:
+            source = results[original]
+            # A copy of a failed document fails for the same reason
+            results[slot] = PRDImportResult(
+                filename=filename, status='failed' if source.status == 'failed' else 'duplicate',
+                prd_id=source.prd_id, title=source.title, error=source.error,
+                duplicate_of=source.filename)
+        return self._import_response(results)
+
+    @staticmethod
+    def _import_result(job: IngestJob) -> PRDImportResult:
+        """Report entry for a finished ingest job"""
+        if job.outcome == 'failed':
+            if isinstance(job.error, HTTPException):
+                error = job.error.detail
+            elif isinstance(job.error, ValidationError):
+                error = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in job.error.errors())
+            else:
+                error = str(job.error)
+            return PRDImportResult(filename=job.filename, status='failed', error=error)
+        return PRDImportResult(
+            filename=job.filename, status=job.outcome,
+            prd_id=job.result.id, title=job.result.title)
+
+    @staticmethod
+    def _import_response(results: List[PRDImportResult]) -> PRDImportResponse:
+        counts = {status: sum(1 for r in results if r.status == status)
+                  for status in ('created', 'duplicate', 'failed', 'skipped')}
+        return PRDImportResponse(results=results, **counts)
+
+    async def _read_upload_text(self, file: UploadFile) -> Tuple[str, str]:
+        """Read an upload as UTF-8 text in chunks, enforcing the size limit.
+
+        Bytes are decoded and hashed as they arrive, so only the decoded text
+        is kept and an oversized upload is rejected as soon as it crosses the
+        limit. Returns the text and the SHA-256 of its UTF-8 bytes.
+        """
+        max_bytes = config.prd_max_document_bytes
+        size = getattr(file, "size", None)
+        if size is not None and size > max_bytes:
+            raise self._document_too_large(max_bytes)
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        digest = hashlib.sha256()
+        parts: List[str] = []
+        total = 0
         try:
-            content_str = content.decode('utf-8')
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    raise self._document_too_large(max_bytes)
+                digest.update(chunk)
+                parts.append(decoder.decode(chunk))
+            parts.append(decoder.decode(b'', final=True))
         except UnicodeDecodeError:
             raise HTTPException(
                 status_code=400,
                 detail="File must be UTF-8 encoded"
             )
 
-        # Parse the file content
-        parsed_data = self._parse_prd_content(content_str, file.filename)
+        return ''.join(parts), digest.hexdigest()
+
+    def _decode_bytes(self, data: bytes) -> Tuple[str, str]:
+        """Decode an in-memory document as UTF-8, enforcing the size limit."""
+        max_bytes = config.prd_max_document_bytes
+        if len(data) > max_bytes:
+            raise self._document_too_large(max_bytes)
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=400,
+                detail="File must be UTF-8 encoded"
+            )
+        return text, hashlib.sha256(data).hexdigest()
+
+    def check_document_size(self, content: str) -> None:
+        """Enforce the document size limit on already-decoded text."""
+        max_bytes = config.prd_max_document_bytes
+        # A character is 1-4 UTF-8 bytes, so only encode when the bounds disagree
+        if len(content) > max_bytes or (
+                len(content) * 4 > max_bytes and len(content.encode('utf-8')) > max_bytes):
+            raise self._document_too_large(max_bytes)
+
+    @staticmethod
+    def _document_too_large(max_bytes: int) -> HTTPException:
+        return HTTPException(
+            status_code=413,
+            detail=f"PRD document exceeds the maximum size of {max_bytes} bytes"
+        )
+
+    async def create_prd_from_content(self, content_str: str, filename: str,
+                                      content_digest: Optional[str] = None) -> PRDResponse:
+        """Parse PRD markdown and create the PRD (with duplicate detection).
 
-        # Detect PRD type
-        detected_type = self._detect_prd_type(content_str)
+        `content_digest` is the SHA-256 of the UTF-8 content when the caller
+        already computed it; text submitted directly is size-checked by the
+        pipeline's decode stage.
+        """
+        return await self._ingest(content_str, filename, content_digest)
+
+    async def _parse_to_prd_create(self, content_str: str, filename: str,
+                                   content_digest: Optional[str] = None) -> PRDCreate:
+        """Parse PRD markdown off the event loop into a PRDCreate (pipeline parse stage)."""
+        parsed_data, detected_type = await self.parse_pool.run(
+            self._parse_and_detect_type, content_str, filename, content_digest)
 
-        # Create PRD
-        prd_data = PRDCreate(
+        return PRDCreate(
             title=parsed_data["title"],
             description=parsed_data["description"],
             requirements=parsed_data["requirements"],
@@ -624,36 +939,136 @@ class PRDService:
             dependencies=parsed_data.get("dependencies"),
             risks=parsed_data.get("risks"),
             assumptions=parsed_data.get("assumptions"),
-            original_filename=file.filename,
+            original_filename=filename,
             file_content=content_str)
 
-        return await self.create_prd(prd_data)
+    async def update_prd_content(self, prd_id: str, content: str,
+                                 filename: Optional[str] = None) -> PRDContentUpdateResponse:
+        """Re-parse changed PRD markdown and apply only what changed.
+
+        Sections whose fingerprint matches the previous version are reused
+        rather than re-extracted, and only the PRD fields affected by changed
+        sections are written back.
+        """
+        self.check_document_size(content)
+
+        existing = None
+        try:
+            existing = await data_manager.get_prd(prd_id)
+        except Exception as e:
+            print(f"Database get failed, trying in-memory storage: {e}")
+        if not existing:
+            existing = getattr(self, '_prds_db', {}).get(prd_id)
+        if not existing:
+            raise HTTPException(status_code=404, detail="PRD not found")
+
+        filename = filename or existing.get("original_filename")
+        previous = self._section_states.get(prd_id)
+        previous_content = existing.get("file_content") or ""
+        if previous is not None and previous['result'].get('file_content') != previous_content:
+            # Stored content changed behind our back; rebuild from what is stored
+            previous = None
+
+        try:
+            parsed, detected_type = await self.parse_pool.run(
+                self._reparse_and_detect_type, content, filename, previous, previous_content)
+        except ParsePoolSaturatedError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=e.message,
+                headers={"Retry-After": "1"}
+            )
+
+        result = parsed['result']
+        update_data = {field: result[field] for field in PRD_CONTENT_FIELDS if field in parsed['updates']}
+        if detected_type != existing.get("prd_type"):
+            update_data["prd_type"] = detected_type
+        if filename != existing.get("original_filename"):
+            update_data["original_filename"] = filename
+        if "title" in update_data or "description" in update_data:
+            update_data["content_hash"] = calculate_prd_hash(result["title"], result["description"])
+
+        updated = existing
+        if update_data:
+            updated = await data_manager.update_prd(prd_id, update_data)
+            if updated is None:
+                # Record only lives in the service's in-memory fallback
+                existing.update(update_data)
+                existing["updated_at"] = datetime.utcnow()
+                updated = existing
+
+        self._remember_section_state(prd_id, parsed)
+
+        return PRDContentUpdateResponse(
+            prd=self._to_prd_response(updated),
+            changes=PRDSectionChanges(**parsed['changes']),
+            updated_fields=sorted(update_data)
+        )
+
+    def _reparse_and_detect_type(self, content: str, filename: Optional[str],
+                                 previous: Optional[Dict[str, Any]],
+                                 previous_content: str) -> Tuple[Dict[str, Any], str]:
+        """Incrementally parse new content (blocking; run on the parse pool)."""
+        if previous is None and previous_content:
+            # No section state for the stored version (e.g. after a restart)
+            previous = self.parser.parse_prd_incremental(previous_content, filename)
+        parsed = self.parser.parse_prd_incremental(content, filename, previous)
+        return parsed, parsed['result']['prd_type']
+
+    def _remember_section_state(self, prd_id: str, parsed: Dict[str, Any]) -> None:
+        """Keep the latest section state per PRD, bounded like the parse cache."""
+        self._section_states[prd_id] = parsed
+        self._section_states.move_to_end(prd_id)
+        while len(self._section_states) > max(1, config.prd_parse_cache_size):
+            self._section_states.popitem(last=False)
+
+    async def get_prd_markdown(self, prd_id: str, if_none_match: Optional[str] = None) -> PRDMarkdownResponse:
+        """Get PRD as markdown (rendered once per PRD version).
 
-    async def get_prd_markdown(self, prd_id: str) -> PRDMarkdownResponse:
-        """Get PRD as markdown."""
+        Raises a 304 without rendering if `if_none_match` names the current
+        version's ETag.
+        """
         prd = await self.get_prd(prd_id)
-        markdown_content = self._generate_prd_markdown(prd)
-        filename = f"PRD_{prd.title.replace(' ', '_')}_{prd.id[:8]}.md"
+        etag = markdown_etag(prd)
+        if if_none_match and (if_none_match.strip() == "*" or etag in
+                              [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        return self._markdown_response(prd)
 
+    def _markdown_response(self, prd: PRDResponse) -> PRDMarkdownResponse:
+        markdown_content, etag = self.markdown_cache.render(prd)
         return PRDMarkdownResponse(
-            prd_id=prd_id,
+            prd_id=prd.id,
             markdown=markdown_content,
-            filename=filename
+            filename=f"PRD_{prd.title.replace(' ', '_')}_{prd.id[:8]}.md",
+            etag=etag
         )
 
-    def _parse_prd_content(self, content: str, filename: str = None) -> Dict[str, Any]:
-        """Parse PRD content using comprehensive parser."""
+    async def export_prd_markdown(self, prd_ids: List[str]) -> Tuple[bytes, List[str]]:
+        """Zip of the PRDs' markdown (from the render cache) and the IDs not found."""
+        batch = await self.batch_get_prds(prd_ids)
+        if not any(item.found for item in batch.results):
+            raise HTTPException(status_code=404, detail="None of the requested PRDs were found")
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            written = set()
+            for item in batch.results:
+                if item.found and item.id not in written:
+                    written.add(item.id)
+                    markdown = self._markdown_response(item.prd)
+                    archive.writestr(markdown.filename, markdown.markdown)
+        return buffer.getvalue(), batch.not_found
+
+    def _parse_prd_content(self, content: str, filename: str = None,
+                           content_digest: Optional[str] = None) -> Dict[str, Any]:
+        """Parse PRD content using comprehensive parser.
+
+        Results are cached by content hash, so re-uploading an identical file
+        skips parsing and validation entirely.
+        """
         try:
-            # Use the comprehensive PRD parser
-            parsed_data = self.parser.parse_prd_content(content, filename)
-            
-            # Validate the parsed structure
-            validation = self.parser.validate_prd_structure(parsed_data)
-            
-            # Add validation info to parsed data
-            parsed_data['validation'] = validation
-            
-            return parsed_data
+            return self.parse_cache.get_or_parse(
+                content, lambda: self._parse_and_validate(content, filename), filename, content_digest)
         except Exception as e:
             # Return basic structure if parsing fails
             return {
@@ -677,119 +1092,31 @@ class PRDService:
                 "validation": {"is_valid": False, "errors": [f"Parsing failed: {str(e)}"], "warnings": [], "completeness_score": 0}
             }
 
+    def _parse_and_detect_type(self, content: str, filename: str = None,
+                               content_digest: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """Parse PRD content and detect its type (blocking; run on the parse pool)."""
+        parsed_data = self._parse_prd_content(content, filename, content_digest)
+        # The parser already classified the document; only the fallback
+        # structure returned on a parse failure lacks a type
+        return parsed_data, parsed_data.get('prd_type') or self._detect_prd_type(content, filename)
 
-    def _detect_prd_type(self, content: str) -> str:
-        """Detect if PRD is for platform or agent based on content."""
-        content_lower = content.lower()
-
-        # Platform indicators (high weight)
-        platform_keywords = [
-            'platform',
-            'factory',
-            'infrastructure',
-            'system',
-            'architecture',
-            'framework',
-            'core',
-            'base',
-            'foundation',
-            'engine',
-            'orchestrator',
-            'deployment',
-            'ci/cd',
-            'pipeline',
-            'monitoring',
-            'logging',
-            'authentication',
-            'authorization',
-            'database',
-            'api',
-            'backend',
-            'frontend',
-            'ui',
-            'ux',
-            'dashboard',
-            'admin',
-            'management']
-
-        # Agent indicators (high weight)
-        agent_keywords = [
-            'agent', 'bot', 'assistant', 'automation', 'workflow', 'task',
-            'process', 'execution', 'ai', 'ml', 'model', 'prediction',
-            'analysis', 'recommendation', 'chat', 'conversation', 'nlp',
-            'openai', 'anthropic', 'claude'
-        ]
-
-        # Count keyword occurrences
-        platform_score = sum(
-            1 for keyword in platform_keywords if keyword in content_lower)
-        agent_score = sum(
-            1 for keyword in agent_keywords if keyword in content_lower)
-
-        # Additional heuristics
-        if any(pattern in content_lower for pattern in [
-            'prd type', 'platform prd', 'agent prd', 'type:', 'category:'
-        ]):
-            if 'platform' in content_lower:
-                return 'platform'
-            elif 'agent' in content_lower:
-                return 'agent'
-
-        # Check for specific patterns
-        if 'create agent' in content_lower or 'build agent' in content_lower:
-            return 'agent'
-        if 'improve platform' in content_lower or 'enhance system' in content_lower:
-            return 'platform'
-
-        # Default based on scores
-        if platform_score > agent_score:
-            return 'platform'
-        else:
-            return 'agent'
-
-    def _generate_prd_markdown(self, prd: PRDResponse) -> str:
-        """Generate standardized markdown PRD."""
-        try:
-            markdown = f"""# Product Requirements Document (PRD)
-## {prd.title}
-
----
-
-### 📋 **Document Information**
-- **PRD ID**: `{prd.id}`
-- **Status**: {prd.status.title()}
-- **Type**: {prd.prd_type.title()}
-- **Created**: {prd.created_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
-- **Last Updated**: {prd.updated_at.strftime('%Y-%m-%d %H:%M:%S UTC')}
-
----
+    def _parse_and_validate(self, content: str, filename: str = None) -> Dict[str, Any]:
+        """Run the comprehensive parser and attach validation info."""
+        # Use the comprehensive PRD parser
+        parsed_data = self.parser.parse_prd_content(content, filename)
 
-### 🎯 **Project Overview**
-
-**Description:**
-{prd.description}
-
-**Requirements:**
-"""
+        # Validate the parsed structure
+        validation = self.parser.validate_prd_structure(parsed_data)
 
-            # Add requirements
-            for i, requirement in enumerate(prd.requirements, 1):
-                markdown += f"{i}. {requirement}\n"
+        # Add validation info to parsed data
+        parsed_data['validation'] = validation
 
-            markdown += "\n---\n\n*Generated by AI Agent Factory*"
+        return parsed_data
 
-            return markdown
 
-        except Exception as e:
-            # Return a simple fallback markdown
-            return f"""# {prd.title}
-
-**Description:** {prd.description}
-
-**Requirements:**
-{chr(10).join(f"- {req}" for req in prd.requirements)}
-
-*Error generating full markdown: {str(e)}*"""
+    def _detect_prd_type(self, content: str, filename: str = None) -> str:
+        """Detect if PRD is for platform or agent based on content."""
+        return prd_type_classifier.classify(content, filename)['prd_type']
 
     def get_roadmap_data(self) -> Dict[str, Any]:
         """Get roadmap data."""
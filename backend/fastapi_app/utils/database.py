@@ -7,6 +7,7 @@ import time
 from typing import Optional, Dict, Any, List
 from supabase import create_client, Client
 from ..config import config
+from .delta import TOMBSTONES_TABLE, to_utc
 # Removed local_database import - using only Supabase now
 
 
@@ -268,10 +269,14 @@ class DatabaseManager:
         
         return await self._retry_operation(_create)
     
-    async def get_devin_tasks(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get Devin tasks from the database."""
+    async def get_devin_tasks(self, skip: int = 0, limit: int = 100,
+                              updated_since: Optional[Any] = None) -> List[Dict[str, Any]]:
+        """Get Devin tasks from the database, optionally only those updated since a timestamp."""
         async def _get():
-            result = self.client.table('devin_tasks').select('*').range(skip, skip + limit - 1).execute()
+            query = self.client.table('devin_tasks').select('*')
+            if updated_since:
+                query = query.gte('updated_at', to_utc(updated_since).isoformat()).order('updated_at')
+            result = query.range(skip, skip + limit - 1).execute()
             return result.data or []
         
         try:
@@ -304,6 +309,27 @@ class DatabaseManager:
             print(f"Error updating Devin task: {e}")
             return None
 
+    # Delta sync
+    async def get_tombstones(self, table_name: str, since: Optional[Any]) -> List[Dict[str, Any]]:
+        """Get records deleted from a table at or after `since`."""
+        if since is None:
+            return []
+
+        async def _get():
+            result = (self.client.table(TOMBSTONES_TABLE)
+                      .select('record_id, deleted_at')
+                      .eq('table_name', table_name)
+                      .gte('deleted_at', to_utc(since).isoformat())
+                      .order('deleted_at')
+                      .execute())
+            return result.data or []
+
+        try:
+            return await self._retry_operation(_get)
+        except Exception as e:
+            print(f"Error getting tombstones for {table_name}: {e}")
+            return []
+
 
 # Global database manager instance
 db_manager = DatabaseManager()
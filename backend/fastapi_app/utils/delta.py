@@ -0,0 +1,65 @@
+"""
+Delta query helpers.
+Timestamp normalisation and watermark bookkeeping for `updated_since` /
+`deleted_since` list queries.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Table that records deletes so delta consumers can see them
+# (see scripts/maintenance/add-delta-sync-support.sql)
+TOMBSTONES_TABLE = "deleted_records"
+
+
+def to_utc(value: Union[str, datetime, None]) -> Optional[datetime]:
+    """Convert an ISO string or datetime into a timezone-aware UTC datetime.
+
+    Naive values are treated as UTC, which matches how the services store
+    `datetime.utcnow().isoformat()` timestamps.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def changed_since(record: Dict[str, Any], since: Optional[datetime]) -> bool:
+    """Return True if the record's updated_at is at or after `since`."""
+    if since is None:
+        return True
+    updated_at = to_utc(record.get("updated_at") or record.get("created_at"))
+    return updated_at is not None and updated_at >= to_utc(since)
+
+
+def filter_changed_since(records: Iterable[Dict[str, Any]],
+                         since: Optional[datetime]) -> List[Dict[str, Any]]:
+    """Keep records changed since `since`, oldest change first."""
+    changed = [r for r in records if changed_since(r, since)]
+    if since is not None:
+        changed.sort(key=lambda r: to_utc(r.get("updated_at") or r.get("created_at")))
+    return changed
+
+
+def next_watermark(records: Iterable[Dict[str, Any]],
+                   tombstones: Iterable[Dict[str, Any]] = (),
+                   *since: Optional[datetime]) -> Optional[datetime]:
+    """Compute the watermark a client should send on its next delta request.
+
+    This is the newest `updated_at` / `deleted_at` observed in the response,
+    falling back to the watermark the client sent when nothing changed.
+    Boundary records are compared with `>=`, so a record sharing the
+    watermark timestamp may be delivered twice but is never skipped.
+    """
+    candidates = [to_utc(s) for s in since if s is not None]
+    for record in records:
+        candidates.append(to_utc(record.get("updated_at") or record.get("created_at")))
+    for tombstone in tombstones:
+        candidates.append(to_utc(tombstone.get("deleted_at")))
+    candidates = [c for c in candidates if c is not None]
+    return max(candidates) if candidates else None
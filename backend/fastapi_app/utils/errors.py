@@ -39,11 +39,26 @@ class InvalidFileTypeError(AgentFactoryException):
     pass
 
 
+class InvalidArchiveError(InvalidFileTypeError):
+    """Exception raised when an uploaded archive is not a readable zip or tar file."""
+    pass
+
+
 class ServiceUnavailableError(AgentFactoryException):
     """Exception raised when external service is unavailable."""
     pass
 
 
+class ParsePoolSaturatedError(ServiceUnavailableError):
+    """Exception raised when the PRD parse pool has no free worker or queue slot."""
+    pass
+
+
+class IngestQueueFullError(ServiceUnavailableError):
+    """Exception raised when the PRD ingest pipeline cannot accept another document."""
+    pass
+
+
 def handle_service_exception(exc: AgentFactoryException) -> HTTPException:
     """Convert service exceptions to HTTP exceptions."""
     if isinstance(exc, PRDNotFoundError):
@@ -0,0 +1,42 @@
+"""
+Shared async HTTP clients.
+One pooled httpx.AsyncClient per use (GitHub, MCP server, ...) instead of a
+blocking `requests` call per request: connections are kept alive and reused,
+and every call has a timeout. httpx connection pools belong to the event
+loop that opened them, so the client is created lazily on first use in a
+loop and replaced if the app later runs on a different loop (as tests do).
+"""
+import asyncio
+from typing import Dict, Optional
+
+import httpx
+
+
+class SharedAsyncClient:
+    """Lazily created, loop-bound httpx.AsyncClient with pool limits and timeouts."""
+
+    def __init__(self, timeout: float = 10.0, connect_timeout: float = 5.0,
+                 max_connections: int = 10, max_keepalive_connections: int = 5,
+                 keepalive_expiry: float = 30.0, headers: Optional[Dict[str, str]] = None):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections,
+                                   keepalive_expiry=keepalive_expiry)
+        self.headers = headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """The client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            # A pool from another (finished) loop cannot be reused or awaited here
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, headers=self.headers)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
@@ -0,0 +1,190 @@
+"""
+PRD parse cache.
+Content-addressed cache for parsed PRD documents: identical uploads (e.g.
+re-runs of reconcile-prds.py or watch-incoming-prds.py) skip parsing entirely.
+Entries live in an in-process LRU and, optionally, in a directory of JSON files
+that survives restarts and is shared between workers. Dates and datetimes are
+tagged in the JSON so a disk hit returns the same types as a memory hit; a
+result holding any other non-JSON value is kept in memory only.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Bump when the on-disk entry format changes (entries live under v<N>/)
+DISK_FORMAT_VERSION = 2
+
+_DATETIME_TAG = "__datetime__"
+_DATE_TAG = "__date__"
+
+
+def _encode_value(value: Any) -> Dict[str, str]:
+    """json.dump `default`: tag dates and datetimes, refuse anything else"""
+    # datetime is a date subclass, so check it first
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, date):
+        return {_DATE_TAG: value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    """json.load `object_hook`: restore tagged dates and datetimes"""
+    if len(obj) == 1:
+        if _DATETIME_TAG in obj:
+            return datetime.fromisoformat(obj[_DATETIME_TAG])
+        if _DATE_TAG in obj:
+            return date.fromisoformat(obj[_DATE_TAG])
+    return obj
+
+
+def content_key(content: str, filename: Optional[str] = None, version: str = "",
+                digest: Optional[str] = None) -> str:
+    """Cache key for a document: SHA-256 of the raw content.
+
+    The filename feeds into `original_filename` and PRD type detection, so it
+    is folded into the key; the parser version invalidates entries written by
+    an older parser. Callers that already hashed the UTF-8 bytes (e.g. while
+    streaming an upload) can pass `digest` to avoid re-encoding the content.
+    """
+    digest = digest or hashlib.sha256(content.encode('utf-8')).hexdigest()
+    if not filename and not version:
+        return digest
+    suffix = hashlib.sha256(f"{version}\0{filename or ''}".encode('utf-8')).hexdigest()[:16]
+    return f"{digest}-{suffix}"
+
+
+class ParseCache:
+    """LRU of parse results with an optional on-disk store behind it."""
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[str] = None, version: str = ""):
+        self.max_entries = max(0, max_entries)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.version = version
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "disk_errors": 0}
+
+        if self.cache_dir:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                print(f"⚠️  Parse cache directory unavailable ({e}), using memory only")
+                self.cache_dir = None
+
+    def key(self, content: str, filename: Optional[str] = None, digest: Optional[str] = None) -> str:
+        return content_key(content, filename, self.version, digest)
+
+    def get(self, content: str, filename: Optional[str] = None,
+            digest: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached parse result, or None on a miss."""
+        key = self.key(content, filename, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry)
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, entry)
+        return copy.deepcopy(entry)
+
+    def put(self, content: str, result: Dict[str, Any], filename: Optional[str] = None,
+            digest: Optional[str] = None) -> None:
+        """Store a parse result (a private copy is kept)."""
+        key = self.key(content, filename, digest)
+        entry = copy.deepcopy(result)
+        with self._lock:
+            self._stats["stores"] += 1
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def get_or_parse(self, content: str, parse: Callable[[], Dict[str, Any]],
+                     filename: Optional[str] = None, digest: Optional[str] = None) -> Dict[str, Any]:
+        """Return the cached result for `content`, calling `parse` on a miss."""
+        digest = digest or hashlib.sha256(content.encode('utf-8')).hexdigest()
+        cached = self.get(content, filename, digest)
+        if cached is not None:
+            return cached
+        result = parse()
+        self.put(content, result, filename, digest)
+        return result
+
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset counters (disk entries are kept)."""
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and hit rate for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["disk_hits"] + stats["misses"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = round((stats["hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["disk_enabled"] = self.cache_dir is not None
+        return stats
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Insert into the LRU; caller holds the lock."""
+        if self.max_entries == 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key: str) -> Path:
+        # Two-level fan-out keeps directories small
+        return self.cache_dir / f"v{DISK_FORMAT_VERSION}" / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f, object_hook=_decode_object)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                # A TypeError (value that cannot round-trip) leaves the entry memory-only
+                json.dump(entry, f, default=_encode_value)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            with self._lock:
+                self._stats["disk_errors"] += 1
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
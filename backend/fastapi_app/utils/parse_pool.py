@@ -0,0 +1,104 @@
+"""
+PRD parse worker pool.
+Runs CPU-bound PRD parsing off the event loop on a bounded thread pool.
+Once every worker is busy and the wait queue is full, new work is rejected
+immediately with ParsePoolSaturatedError instead of piling up behind it.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from .errors import ParsePoolSaturatedError
+
+T = TypeVar("T")
+
+
+class ParseWorkerPool:
+    """Bounded executor for parse jobs with queue and latency metrics."""
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prd-parse")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._stats = {
+            "submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+            "wait_seconds_total": 0.0, "wait_seconds_max": 0.0, "run_seconds_total": 0.0,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Jobs accepted at once: one per worker plus the wait queue."""
+        return self.max_workers + self.max_queue
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run `func(*args)` on a worker thread and await the result.
+
+        Raises ParsePoolSaturatedError without queueing when the pool is full.
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats["rejected"] += 1
+                raise ParsePoolSaturatedError(
+                    "PRD parser is at capacity, retry shortly",
+                    {"in_flight": self._in_flight, "capacity": self.capacity})
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+
+        enqueued_at = time.perf_counter()
+
+        def job() -> T:
+            started_at = time.perf_counter()
+            waited = started_at - enqueued_at
+            with self._lock:
+                self._running += 1
+                self._stats["wait_seconds_total"] += waited
+                self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._stats["run_seconds_total"] += time.perf_counter() - started_at
+
+        future = self._executor.submit(job)
+        # Release the slot when the job really finishes (or is cancelled before
+        # starting), not when the awaiting request goes away
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, worker utilisation and latency counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            in_flight, running = self._in_flight, self._running
+        started = stats["completed"] + stats["failed"]
+        return {
+            "workers": self.max_workers,
+            "busy_workers": running,
+            "queued": max(0, in_flight - running),
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "submitted": stats["submitted"],
+            "completed": stats["completed"],
+            "failed": stats["failed"],
+            "rejected": stats["rejected"],
+            "avg_wait_ms": round(stats["wait_seconds_total"] / started * 1000, 2) if started else 0.0,
+            "max_wait_ms": round(stats["wait_seconds_max"] * 1000, 2),
+            "avg_run_ms": round(stats["run_seconds_total"] / started * 1000, 2) if started else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
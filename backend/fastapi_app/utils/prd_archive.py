@@ -0,0 +1,117 @@
+"""
+PRD archive reader
+Reads the members of an uploaded zip or tar archive (optionally gzip/bz2/xz
+compressed) one at a time, straight from the upload's file object: nothing
+is extracted to disk and only the member being read is held in memory.
+
+Tar archives are read in stream mode, so the upload is consumed front to
+back exactly once. Zip archives need their central directory, which sits at
+the end of the file, so they are read from the (seekable) upload file.
+Member sizes are checked against their headers before reading, and reads are
+capped, so a member that lies about its size cannot grow past the limit.
+"""
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+
+from .errors import InvalidArchiveError
+
+PRD_EXTENSIONS: Tuple[str, ...] = ('.md', '.txt')
+
+
+class ArchiveMember(NamedTuple):
+    """One file in the archive; `data` is None when it was not read."""
+    name: str
+    data: Optional[bytes]
+    status: Optional[str] = None   # 'skipped' or 'failed' when data is None
+    error: Optional[str] = None
+
+
+def _ignored(name: str) -> bool:
+    """Archive noise that is not worth a line in the report (macOS metadata)"""
+    base = name.rsplit('/', 1)[-1]
+    return name.startswith('__MACOSX/') or base.startswith('._') or base == '.DS_Store'
+
+
+def iter_archive(fileobj: BinaryIO, max_member_bytes: int, max_members: int,
+                 extensions: Tuple[str, ...] = PRD_EXTENSIONS) -> Iterator[ArchiveMember]:
+    """Members of a zip or tar archive, in archive order.
+
+    Files without one of `extensions` and files past the first `max_members`
+    PRD documents come back as 'skipped'; files over `max_member_bytes` as
+    'failed'. Raises InvalidArchiveError if `fileobj` is neither format; an
+    archive that turns out to be corrupt part-way ends with a 'failed' entry.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except zipfile.BadZipFile as e:
+            raise InvalidArchiveError(f"Invalid zip archive: {e}")
+        members = _zip_members(archive, max_member_bytes)
+    else:
+        fileobj.seek(0)
+        try:
+            archive = tarfile.open(fileobj=fileobj, mode='r|*')
+        except tarfile.TarError:
+            raise InvalidArchiveError("File must be a zip or tar archive")
+        members = _tar_members(archive, max_member_bytes)
+
+    documents = 0
+    with archive:
+        while True:
+            try:
+                name, size, read = next(members)
+            except StopIteration:
+                return
+            except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+                # Truncated or corrupt after the members already read
+                yield ArchiveMember('(archive)', None, 'failed', f"Archive is truncated or corrupt: {e}")
+                return
+            if not name.lower().endswith(extensions):
+                yield ArchiveMember(name, None, 'skipped', "Not a .md or .txt file")
+            elif documents >= max_members:
+                yield ArchiveMember(name, None, 'skipped',
+                                    f"Archive holds more than {max_members} documents")
+            elif size > max_member_bytes:
+                yield ArchiveMember(name, None, 'failed', _too_large(max_member_bytes))
+            else:
+                documents += 1
+                try:
+                    data = read()
+                except (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError) as e:
+                    yield ArchiveMember(name, None, 'failed', f"Could not read archive member: {e}")
+                    return
+                if len(data) > max_member_bytes:
+                    yield ArchiveMember(name, None, 'failed', _too_large(max_member_bytes))
+                else:
+                    yield ArchiveMember(name, data)
+
+
+def _too_large(max_bytes: int) -> str:
+    return f"PRD document exceeds the maximum size of {max_bytes} bytes"
+
+
+def _zip_members(archive: zipfile.ZipFile, max_bytes: int):
+    for info in archive.infolist():
+        if info.is_dir() or _ignored(info.filename):
+            continue
+
+        def read(info=info) -> bytes:
+            with archive.open(info) as member:
+                return member.read(max_bytes + 1)
+
+        yield info.filename, info.file_size, read
+
+
+def _tar_members(archive: tarfile.TarFile, max_bytes: int):
+    for info in archive:
+        # Links, devices and directories carry no document
+        if not info.isfile() or _ignored(info.name):
+            continue
+
+        def read(info=info) -> bytes:
+            member = archive.extractfile(info)
+            return member.read(max_bytes + 1) if member is not None else b''
+
+        yield info.name, info.size, read
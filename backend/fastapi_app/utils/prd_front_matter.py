@@ -0,0 +1,74 @@
+"""
+PRD front-matter
+PRD files start with a small YAML front-matter block carrying the PRD ID
+and content hash, so a database row and its file can be matched by a
+single index lookup instead of by filename patterns or content comparison:
+
+    ---
+    prd_id: 0b6f0c8e-6f3e-4a51-9d0e-3c1f4f3b2a77
+    content_hash: 5e2c...  (64 hex characters, from calculate_prd_hash)
+    ---
+    # PRD title
+    ...
+
+Only flat `key: value` pairs are read and written (a subset of YAML), so
+no YAML library is needed; unknown keys are preserved.
+"""
+import re
+from typing import Dict, Optional, Tuple
+
+PRD_ID_KEY = "prd_id"
+CONTENT_HASH_KEY = "content_hash"
+
+_FRONT_MATTER_RE = re.compile(r'\A---[ \t]*\r?\n(.*?\r?\n)?---[ \t]*(?:\r?\n|\Z)', re.DOTALL)
+_FIELD_RE = re.compile(r'^([A-Za-z0-9_-]+)[ \t]*:[ \t]*(.*?)[ \t]*$')
+
+
+def split_front_matter(content: str) -> Tuple[Dict[str, str], str]:
+    """(fields, body) of a PRD file; ({}, content) if it has no front-matter."""
+    if not content.startswith('---'):
+        return {}, content
+    match = _FRONT_MATTER_RE.match(content)
+    if not match:
+        return {}, content
+    fields: Dict[str, str] = {}
+    for line in (match.group(1) or '').splitlines():
+        if not line.strip():
+            continue
+        field = _FIELD_RE.match(line)
+        if not field:
+            # A markdown document that merely opens with a horizontal rule
+            return {}, content
+        value = field.group(2)
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+            value = value[1:-1]
+        fields[field.group(1)] = value
+    return fields, content[match.end():]
+
+
+def strip_front_matter(content: str) -> str:
+    """The PRD markdown without its front-matter block"""
+    return split_front_matter(content)[1]
+
+
+def front_matter_identity(content: str) -> Tuple[Optional[str], Optional[str]]:
+    """(prd_id, content_hash) from the front-matter, None where absent"""
+    fields, _ = split_front_matter(content)
+    return fields.get(PRD_ID_KEY) or None, fields.get(CONTENT_HASH_KEY) or None
+
+
+def with_front_matter(content: str, prd_id: Optional[str] = None,
+                      content_hash: Optional[str] = None) -> str:
+    """`content` with prd_id/content_hash set in its front-matter (other fields kept)."""
+    fields, body = split_front_matter(content)
+    if prd_id:
+        fields[PRD_ID_KEY] = prd_id
+    if content_hash:
+        fields[CONTENT_HASH_KEY] = content_hash
+    if not fields:
+        return body
+    # Identity first, then whatever else the file carried
+    ordered = {key: fields.pop(key) for key in (PRD_ID_KEY, CONTENT_HASH_KEY) if key in fields}
+    ordered.update(fields)
+    lines = [f"{key}: {value}" for key, value in ordered.items()]
+    return "---\n" + "\n".join(lines) + "\n---\n" + body
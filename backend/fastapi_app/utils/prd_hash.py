@@ -4,28 +4,83 @@ Generates deterministic hashes for duplicate detection
 """
 import hashlib
 import re
+from typing import Iterable, List, Optional, Tuple
 
+# Characters of the normalised description that feed the hash
+DESCRIPTION_HASH_LENGTH = 500
 
-def normalize_text(text: str) -> str:
-    """Normalize text for consistent hashing"""
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Markdown formatting passes, in order, with the delimiter that starts a match
+_MARKDOWN_PASSES = [
+    (re.compile(r'\*\*(.+?)\*\*'), '**'),  # Bold
+    (re.compile(r'__(.+?)__'), '__'),        # Bold
+    (re.compile(r'\*(.+?)\*'), '*'),         # Italic
+    (re.compile(r'_(.+?)_'), '_'),           # Italic
+    (re.compile(r'`(.+?)`'), '`'),           # Code
+]
+
+# Raw characters normalised first when only a prefix of the output is needed;
+# the window doubles until the prefix is provably exact
+_INITIAL_WINDOW = 4 * DESCRIPTION_HASH_LENGTH
+
+
+def _strip_markdown(text: str) -> Tuple[str, bool]:
+    """Apply the markdown passes; also report whether the result is exact
+    for any continuation of `text`.
+
+    A match only depends on characters up to its closing delimiter, so a
+    pass over a prefix agrees with the pass over the whole text unless some
+    match attempt failed - that attempt might have found its closing
+    delimiter further on. Every delimiter left outside a match is such an
+    attempt.
+    """
+    exact = True
+    for pattern, delimiter in _MARKDOWN_PASSES:
+        overlap = len(delimiter) - 1
+        parts = []
+        position = 0
+        for match in pattern.finditer(text):
+            if exact and delimiter in text[position:match.start() + overlap]:
+                exact = False
+            parts.append(text[position:match.start()])
+            parts.append(match.group(1))
+            position = match.end()
+        tail = text[position:]
+        # A delimiter split by the end of the text is a failed attempt too
+        if exact and (delimiter in tail or (overlap and tail.endswith(delimiter[:overlap]))):
+            exact = False
+        parts.append(tail)
+        text = ''.join(parts)
+    return text, exact
+
+
+def normalize_text(text: str, max_length: Optional[int] = None) -> str:
+    """Normalize text for consistent hashing
+
+    With `max_length`, returns `normalize_text(text)[:max_length]` but only
+    normalises as much of the input as needed to produce it.
+    """
     if not text:
         return ""
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove markdown formatting
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # Bold
-    text = re.sub(r'__(.+?)__', r'\1', text)      # Bold
-    text = re.sub(r'\*(.+?)\*', r'\1', text)      # Italic
-    text = re.sub(r'_(.+?)_', r'\1', text)        # Italic
-    text = re.sub(r'`(.+?)`', r'\1', text)        # Code
-    
-    # Strip leading/trailing whitespace
-    return text.strip()
+
+    window = _INITIAL_WINDOW
+    while max_length is not None and len(text) > window:
+        chunk = text[:window]
+        # A capital sigma lowers to 'ς' or 'σ' depending on what follows it,
+        # which may lie past the window; only then lowercase the whole text
+        lowered = text.lower()[:window] if 'Σ' in chunk else chunk.lower()
+        prefix, exact = _strip_markdown(_WHITESPACE_RE.sub(' ', lowered))
+        prefix = prefix.lstrip()
+        # Trailing whitespace may still be stripped unless real content follows
+        if exact and len(prefix.rstrip()) >= max_length:
+            return prefix[:max_length]
+        window *= 2
+
+    # Lowercase, collapse whitespace, remove markdown formatting
+    text, _ = _strip_markdown(_WHITESPACE_RE.sub(' ', text.lower()))
+    text = text.strip()
+    return text if max_length is None else text[:max_length]
 
 
 def calculate_prd_hash(title: str, description: str) -> str:
@@ -45,16 +100,34 @@ def calculate_prd_hash(title: str, description: str) -> str:
     """
     # Normalize inputs
     norm_title = normalize_text(title)
-    norm_description = normalize_text(description)
+    norm_description = normalize_text(description, DESCRIPTION_HASH_LENGTH)
     
     # Create combined content string
-    content = f"{norm_title}::{norm_description[:500]}"  # Use first 500 chars of description
+    content = f"{norm_title}::{norm_description}"  # Use first 500 chars of description
     
     # Calculate SHA-256 hash
     hash_obj = hashlib.sha256(content.encode('utf-8'))
     return hash_obj.hexdigest()
 
 
+def hash_many(prds: Iterable[Tuple[str, str]]) -> List[str]:
+    """
+    Calculate PRD hashes for many (title, description) pairs.
+    
+    Equivalent to calling calculate_prd_hash on each pair; repeated titles
+    (common when comparing against a whole queue) are normalised once.
+    """
+    titles = {}
+    hashes = []
+    for title, description in prds:
+        norm_title = titles.get(title)
+        if norm_title is None:
+            norm_title = titles[title] = normalize_text(title)
+        content = f"{norm_title}::{normalize_text(description, DESCRIPTION_HASH_LENGTH)}"
+        hashes.append(hashlib.sha256(content.encode('utf-8')).hexdigest())
+    return hashes
+
+
 def generate_prd_filename(title: str, content_hash: str, date_str: str = None) -> str:
     """
     Generate standardized PRD filename with content hash.
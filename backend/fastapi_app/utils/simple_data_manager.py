@@ -4,10 +4,24 @@ No more complex fallback chains - just clean, predictable storage.
 """
 import os
 import time
+import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from supabase import create_client, Client
 from ..config import config
+from .delta import TOMBSTONES_TABLE, filter_changed_since, to_utc
+
+
+def _uuid_ids(ids: List[str]) -> List[str]:
+    """The IDs that are valid UUIDs: one malformed value makes Postgres reject a whole in() query"""
+    valid = []
+    for value in ids:
+        try:
+            uuid.UUID(str(value))
+        except ValueError:
+            continue
+        valid.append(value)
+    return valid
 
 
 class SimpleDataManager:
@@ -26,6 +40,13 @@ class SimpleDataManager:
             "agents": {},
             "prds": {}
         }
+        # Deleted record IDs per table, for delta (deleted_since) queries
+        self.tombstones = {
+            "agents": {},
+            "prds": {}
+        }
+        # content_hash -> PRD ID for in-memory PRDs (O(1) duplicate checks)
+        self._prd_hash_index: Dict[str, str] = {}
         
         print(f"🔧 Initializing SimpleDataManager with mode: {mode}")
         
@@ -120,6 +141,40 @@ class SimpleDataManager:
                 db_data[key] = value
         return db_data
     
+    def _record_tombstones(self, table: str, record_ids: List[str]) -> None:
+        """Remember in-memory deletes so delta consumers can see them."""
+        deleted_at = datetime.utcnow().isoformat()
+        for record_id in record_ids:
+            self.tombstones[table][record_id] = deleted_at
+    
+    async def get_tombstones(self, table: str, since: Optional[datetime]) -> List[Dict[str, Any]]:
+        """Get records deleted from `table` at or after `since`.
+        
+        In production, tombstones are written by the `deleted_records` trigger
+        (scripts/maintenance/add-delta-sync-support.sql).
+        """
+        if since is None:
+            return []
+        if self.mode == "development":
+            since_utc = to_utc(since)
+            return [
+                {"record_id": record_id, "deleted_at": deleted_at}
+                for record_id, deleted_at in self.tombstones.get(table, {}).items()
+                if to_utc(deleted_at) >= since_utc
+            ]
+        else:
+            try:
+                result = (self.supabase.table(TOMBSTONES_TABLE)
+                          .select('record_id, deleted_at')
+                          .eq('table_name', table)
+                          .gte('deleted_at', to_utc(since).isoformat())
+                          .order('deleted_at')
+                          .execute())
+                return result.data or []
+            except Exception as e:
+                print(f"Error querying tombstones for {table}: {e}")
+                return []
+    
     # Agent Operations
     async def create_agent(self, agent_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create an agent."""
@@ -157,13 +212,17 @@ class SimpleDataManager:
                         # Re-raise to let the service handle it
                         raise
     
-    async def get_agents(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get agents."""
+    async def get_agents(self, skip: int = 0, limit: int = 100,
+                         updated_since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get agents, optionally only those updated at or after `updated_since`."""
         if self.mode == "development":
-            agents = list(self.memory_storage["agents"].values())
+            agents = filter_changed_since(self.memory_storage["agents"].values(), updated_since)
             return agents[skip:skip + limit]
         else:
-            result = self.supabase.table('agents').select('*').range(skip, skip + limit - 1).execute()
+            query = self.supabase.table('agents').select('*')
+            if updated_since:
+                query = query.gte('updated_at', to_utc(updated_since).isoformat()).order('updated_at')
+            result = query.range(skip, skip + limit - 1).execute()
             return result.data or []
     
     async def get_agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
@@ -174,6 +233,21 @@ class SimpleDataManager:
             result = self.supabase.table('agents').select('*').eq('id', agent_id).execute()
             return result.data[0] if result.data else None
     
+    async def get_agents_by_ids(self, agent_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several agents in one lookup (order not guaranteed; missing IDs are omitted)."""
+        if not agent_ids:
+            return []
+        if self.mode == "development":
+            agents = self.memory_storage["agents"]
+            return [agents[agent_id] for agent_id in agent_ids if agent_id in agents]
+        else:
+            # Anything that is not a UUID cannot exist; leave it out so it reads as not found
+            agent_ids = _uuid_ids(agent_ids)
+            if not agent_ids:
+                return []
+            result = self.supabase.table('agents').select('*').in_('id', agent_ids).execute()
+            return result.data or []
+    
     async def get_agent_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get an agent by name."""
         if self.mode == "development":
@@ -187,6 +261,9 @@ class SimpleDataManager:
         if self.mode == "development":
             if agent_id in self.memory_storage["agents"]:
                 self.memory_storage["agents"][agent_id].update(agent_data)
+                if "updated_at" not in agent_data:
+                    # Mirror the updated_at trigger so delta queries see the change
+                    self.memory_storage["agents"][agent_id]["updated_at"] = datetime.utcnow().isoformat()
                 return self.memory_storage["agents"][agent_id]
             return None
         else:
@@ -225,6 +302,7 @@ class SimpleDataManager:
         if self.mode == "development":
             if agent_id in self.memory_storage["agents"]:
                 del self.memory_storage["agents"][agent_id]
+                self._record_tombstones("agents", [agent_id])
                 return True
             return False
         else:
@@ -234,6 +312,7 @@ class SimpleDataManager:
     async def clear_all_agents(self) -> bool:
         """Clear all agents."""
         if self.mode == "development":
+            self._record_tombstones("agents", list(self.memory_storage["agents"]))
             self.memory_storage["agents"].clear()
             return True
         else:
@@ -255,6 +334,8 @@ class SimpleDataManager:
         if self.mode == "development":
             prd_id = prd_data.get("id", f"prd_{len(self.memory_storage['prds']) + 1}")
             self.memory_storage["prds"][prd_id] = prd_data
+            if prd_data.get("content_hash"):
+                self._prd_hash_index.setdefault(prd_data["content_hash"], prd_id)
             return prd_data
         else:
             if self.supabase is None:
@@ -277,13 +358,39 @@ class SimpleDataManager:
                 traceback.print_exc()
                 raise
     
-    async def get_prds(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get PRDs."""
+    async def create_prds(self, prds: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several PRDs with one insert (all or nothing); returns them in input order."""
+        if not prds:
+            return []
+        environment = os.getenv("ENVIRONMENT", "").lower()
+        if environment == "production" and self.mode == "development":
+            raise RuntimeError("CRITICAL: Attempting to write to in-memory storage in production environment! "
+                               "Supabase connection required in production.")
+
         if self.mode == "development":
-            prds = list(self.memory_storage["prds"].values())
+            return [await self.create_prd(prd_data) for prd_data in prds]
+        if self.supabase is None:
+            raise RuntimeError("Supabase client is None - cannot create PRDs in production mode")
+        print(f"📝 Inserting {len(prds)} PRDs into Supabase")
+        result = self.supabase.table('prds').insert(prds).execute()
+        if not result.data or len(result.data) != len(prds):
+            raise RuntimeError(f"Supabase batch insert returned {len(result.data or [])} of {len(prds)} rows")
+        # Match rows back to the input by ID rather than trusting the response order
+        by_id = {str(row.get("id")): row for row in result.data}
+        return [by_id.get(str(prd_data["id"]), row) for prd_data, row in zip(prds, result.data)]
+
+    async def get_prds(self, skip: int = 0, limit: int = 100,
+                       updated_since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get PRDs, optionally only those updated at or after `updated_since`."""
+        if self.mode == "development":
+            prds = filter_changed_since(self.memory_storage["prds"].values(), updated_since)
             return prds[skip:skip + limit]
         else:
-            result = self.supabase.table('prds').select('*').range(skip, skip + limit - 1).execute()
+            query = self.supabase.table('prds').select('*')
+            if updated_since:
+                # Served by idx_prds_updated_at
+                query = query.gte('updated_at', to_utc(updated_since).isoformat()).order('updated_at')
+            result = query.range(skip, skip + limit - 1).execute()
             return result.data or []
     
     async def get_prd(self, prd_id: str) -> Optional[Dict[str, Any]]:
@@ -294,12 +401,36 @@ class SimpleDataManager:
             result = self.supabase.table('prds').select('*').eq('id', prd_id).execute()
             return result.data[0] if result.data else None
     
+    async def get_prds_by_ids(self, prd_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several PRDs in one lookup (order not guaranteed; missing IDs are omitted)."""
+        if not prd_ids:
+            return []
+        if self.mode == "development":
+            prds = self.memory_storage["prds"]
+            return [prds[prd_id] for prd_id in prd_ids if prd_id in prds]
+        else:
+            # Anything that is not a UUID cannot exist; leave it out so it reads as not found
+            prd_ids = _uuid_ids(prd_ids)
+            if not prd_ids:
+                return []
+            result = self.supabase.table('prds').select('*').in_('id', prd_ids).execute()
+            return result.data or []
+    
     async def get_prd_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
         """Get a PRD by content hash (deterministic duplicate detection)."""
         if self.mode == "development":
-            # Check in-memory storage
-            for prd in self.memory_storage["prds"].values():
+            # Check in-memory storage through the hash index
+            prd_id = self._prd_hash_index.get(content_hash)
+            if prd_id is None:
+                return None
+            prd = self.memory_storage["prds"].get(prd_id)
+            if prd is not None and prd.get("content_hash") == content_hash:
+                return prd
+            # Entry went stale (PRD deleted or re-hashed): rescan once and repair it
+            del self._prd_hash_index[content_hash]
+            for prd_id, prd in self.memory_storage["prds"].items():
                 if prd.get("content_hash") == content_hash:
+                    self._prd_hash_index[content_hash] = prd_id
                     return prd
             return None
         else:
@@ -316,6 +447,11 @@ class SimpleDataManager:
         if self.mode == "development":
             if prd_id in self.memory_storage["prds"]:
                 self.memory_storage["prds"][prd_id].update(prd_data)
+                if prd_data.get("content_hash"):
+                    self._prd_hash_index.setdefault(prd_data["content_hash"], prd_id)
+                if "updated_at" not in prd_data:
+                    # Mirror the updated_at trigger so delta queries see the change
+                    self.memory_storage["prds"][prd_id]["updated_at"] = datetime.utcnow().isoformat()
                 return self.memory_storage["prds"][prd_id]
             return None
         else:
@@ -327,6 +463,7 @@ class SimpleDataManager:
         if self.mode == "development":
             if prd_id in self.memory_storage["prds"]:
                 del self.memory_storage["prds"][prd_id]
+                self._record_tombstones("prds", [prd_id])
                 return True
             return False
         else:
@@ -351,7 +488,9 @@ class SimpleDataManager:
     async def clear_all_prds(self) -> bool:
         """Clear all PRDs."""
         if self.mode == "development":
+            self._record_tombstones("prds", list(self.memory_storage["prds"]))
             self.memory_storage["prds"].clear()
+            self._prd_hash_index.clear()
             return True
         else:
             try:
@@ -133,6 +133,14 @@ CREATE TABLE IF NOT EXISTS system_metrics (
     timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Deleted Records Table (tombstones for delta sync / deleted_since queries)
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(100) NOT NULL,
+    record_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- Create indexes for performance optimization
 CREATE INDEX IF NOT EXISTS idx_prds_status ON prds(status);
 CREATE INDEX IF NOT EXISTS idx_prds_type ON prds(prd_type);
@@ -161,6 +169,8 @@ CREATE INDEX IF NOT EXISTS idx_audit_logs_table_record ON audit_logs(table_name,
 CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp);
 CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
 
+CREATE INDEX IF NOT EXISTS idx_deleted_records_table_deleted_at ON deleted_records(table_name, deleted_at);
+
 CREATE INDEX IF NOT EXISTS idx_system_metrics_name_timestamp ON system_metrics(metric_name, timestamp);
 CREATE INDEX IF NOT EXISTS idx_system_metrics_timestamp ON system_metrics(timestamp);
 
@@ -217,12 +227,36 @@ CREATE TRIGGER audit_devin_tasks_trigger
     AFTER INSERT OR UPDATE OR DELETE ON devin_tasks
     FOR EACH ROW EXECUTE FUNCTION audit_trigger_function();
 
+-- Create tombstone trigger function
+CREATE OR REPLACE FUNCTION record_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, NOW());
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+-- Create tombstone triggers
+CREATE TRIGGER tombstone_prds_trigger
+    AFTER DELETE ON prds
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+CREATE TRIGGER tombstone_agents_trigger
+    AFTER DELETE ON agents
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+CREATE TRIGGER tombstone_devin_tasks_trigger
+    AFTER DELETE ON devin_tasks
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
 -- Row Level Security (RLS) policies
 ALTER TABLE prds ENABLE ROW LEVEL SECURITY;
 ALTER TABLE agents ENABLE ROW LEVEL SECURITY;
 ALTER TABLE devin_tasks ENABLE ROW LEVEL SECURITY;
 ALTER TABLE audit_logs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE system_metrics ENABLE ROW LEVEL SECURITY;
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for service role access (for API operations)
 CREATE POLICY "Service role can do everything on prds" ON prds
@@ -240,6 +274,9 @@ CREATE POLICY "Service role can do everything on audit_logs" ON audit_logs
 CREATE POLICY "Service role can do everything on system_metrics" ON system_metrics
     FOR ALL USING (true);
 
+CREATE POLICY "Service role can do everything on deleted_records" ON deleted_records
+    FOR ALL USING (true);
+
 -- Create views for common queries
 CREATE OR REPLACE VIEW prd_summary AS
 SELECT 
@@ -0,0 +1,71 @@
+-- Add delta sync support (updated_since / deleted_since list queries)
+-- Lets incremental sync jobs and MCP caches fetch only changed records
+
+-- updated_at indexes serve the `updated_at >= watermark ORDER BY updated_at` scans
+CREATE INDEX IF NOT EXISTS idx_prds_updated_at ON prds(updated_at);
+CREATE INDEX IF NOT EXISTS idx_agents_updated_at ON agents(updated_at);
+CREATE INDEX IF NOT EXISTS idx_devin_tasks_updated_at ON devin_tasks(updated_at);
+
+-- Tombstones: one row per deleted record, so deletes show up in deltas
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(100) NOT NULL,
+    record_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_deleted_records_table_deleted_at
+    ON deleted_records(table_name, deleted_at);
+
+CREATE OR REPLACE FUNCTION record_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id, deleted_at)
+    VALUES (TG_TABLE_NAME, OLD.id, NOW());
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS tombstone_prds_trigger ON prds;
+CREATE TRIGGER tombstone_prds_trigger
+    AFTER DELETE ON prds
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+DROP TRIGGER IF EXISTS tombstone_agents_trigger ON agents;
+CREATE TRIGGER tombstone_agents_trigger
+    AFTER DELETE ON agents
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+DROP TRIGGER IF EXISTS tombstone_devin_tasks_trigger ON devin_tasks;
+CREATE TRIGGER tombstone_devin_tasks_trigger
+    AFTER DELETE ON devin_tasks
+    FOR EACH ROW EXECUTE FUNCTION record_tombstone();
+
+-- Make sure updated_at moves on every update (no-op if schema.sql already did this)
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_prds_updated_at ON prds;
+CREATE TRIGGER update_prds_updated_at BEFORE UPDATE ON prds
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_agents_updated_at ON agents;
+CREATE TRIGGER update_agents_updated_at BEFORE UPDATE ON agents
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_devin_tasks_updated_at ON devin_tasks;
+CREATE TRIGGER update_devin_tasks_updated_at BEFORE UPDATE ON devin_tasks
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Tombstones older than any consumer's watermark can be pruned, e.g.:
+-- DELETE FROM deleted_records WHERE deleted_at < NOW() - INTERVAL '30 days';
+
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS "Service role can do everything on deleted_records" ON deleted_records;
+CREATE POLICY "Service role can do everything on deleted_records" ON deleted_records
+    FOR ALL USING (true);
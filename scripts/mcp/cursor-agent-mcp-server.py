@@ -611,21 +611,7 @@ class CursorAgentMCPServer:
             
             # Step 1: Check for content duplicates (same title + description)
             # List all existing PRD files in GitHub
-            import hashlib
-            import re
-            
-            def normalize_text(text: str) -> str:
-                """Normalize text for consistent hashing (matches backend logic)"""
-                if not text:
-                    return ""
-                text = text.lower()
-                text = re.sub(r'\s+', ' ', text)
-                text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-                text = re.sub(r'__(.+?)__', r'\1', text)
-                text = re.sub(r'\*(.+?)\*', r'\1', text)
-                text = re.sub(r'_(.+?)_', r'\1', text)
-                text = re.sub(r'`(.+?)`', r'\1', text)
-                return text.strip()
+            from backend.fastapi_app.utils.prd_hash import calculate_prd_hash
             
             try:
                 # Get list of files in prds/queue/
@@ -653,59 +639,52 @@ class CursorAgentMCPServer:
                         if capture_desc:
                             description += line + "\n"
                     
-                    # Normalize for comparison (matches backend logic exactly)
-                    norm_title = normalize_text(title)
-                    norm_description = normalize_text(description)[:500]  # First 500 chars
-                    new_content_key = f"{norm_title}::{norm_description}"
-                    new_hash = hashlib.sha256(new_content_key.encode('utf-8')).hexdigest()
+                    new_hash = calculate_prd_hash(title, description)
                     
-                    # Check each existing PRD file
-                    for item in repo_contents.get("contents", []):
-                        if item.get("name", "").endswith(".md") and item.get("name") != "README.md":
-                            # Get file content
-                            existing_content_result = await self.github_service.get_file_content(repo_owner, repo_name, item.get("path"))
+                    # Check each existing PRD file (contents fetched concurrently, with a bounded fan-out)
+                    prd_items = [item for item in repo_contents.get("contents", [])
+                                 if item.get("name", "").endswith(".md") and item.get("name") != "README.md"]
+                    prd_contents = await self.github_service.get_file_contents(
+                        repo_owner, repo_name, [item.get("path") for item in prd_items])
+                    for item, existing_content_result in zip(prd_items, prd_contents):
+                        # CRITICAL FIX: Verify file content was retrieved successfully
+                        if "error" in existing_content_result:
+                            print(f"   ⚠️  Could not read file {item.get('name')}: {existing_content_result.get('error')}")
+                            continue  # Skip this file, continue checking others
+                        
+                        if existing_content_result and "content" in existing_content_result:
+                            existing_content = existing_content_result["content"]
                             
-                            # CRITICAL FIX: Verify file content was retrieved successfully
-                            if "error" in existing_content_result:
-                                print(f"   ⚠️  Could not read file {item.get('name')}: {existing_content_result.get('error')}")
-                                continue  # Skip this file, continue checking others
+                            # Extract title and description from existing file
+                            existing_lines = existing_content.split('\n')
+                            existing_title = ""
+                            existing_description = ""
+                            existing_capture_desc = False
                             
-                            if existing_content_result and "content" in existing_content_result:
-                                existing_content = existing_content_result["content"]
-                                
-                                # Extract title and description from existing file
-                                existing_lines = existing_content.split('\n')
-                                existing_title = ""
-                                existing_description = ""
-                                existing_capture_desc = False
-                                
-                                for line in existing_lines:
-                                    if line.strip().startswith('# '):
-                                        existing_title = line[2:].strip()
-                                    if line.strip().startswith('## Description'):
-                                        existing_capture_desc = True
-                                        continue
-                                    if existing_capture_desc and line.strip().startswith('##'):
-                                        break
-                                    if existing_capture_desc:
-                                        existing_description += line + "\n"
-                                
-                                # Normalize and hash existing content (matches backend logic)
-                                existing_norm_title = normalize_text(existing_title)
-                                existing_norm_desc = normalize_text(existing_description)[:500]
-                                existing_content_key = f"{existing_norm_title}::{existing_norm_desc}"
-                                existing_hash = hashlib.sha256(existing_content_key.encode('utf-8')).hexdigest()
-                                
-                                # Check if content matches
-                                if new_hash == existing_hash:
-                                    print(f"✅ Duplicate detected in GitHub: {item.get('name')}")
-                                    return {
-                                        "status": "duplicate_prevented",
-                                        "message": f"PRD with identical content already exists: {item.get('name')}",
-                                        "existing_file": item.get("name"),
-                                        "existing_path": item.get("path"),
-                                        "github_url": f"https://github.com/{repo_owner}/{repo_name}/blob/main/{item.get('path')}"
-                                    }
+                            for line in existing_lines:
+                                if line.strip().startswith('# '):
+                                    existing_title = line[2:].strip()
+                                if line.strip().startswith('## Description'):
+                                    existing_capture_desc = True
+                                    continue
+                                if existing_capture_desc and line.strip().startswith('##'):
+                                    break
+                                if existing_capture_desc:
+                                    existing_description += line + "\n"
+                            
+                            # Normalize and hash existing content
+                            existing_hash = calculate_prd_hash(existing_title, existing_description)
+                            
+                            # Check if content matches
+                            if new_hash == existing_hash:
+                                print(f"✅ Duplicate detected in GitHub: {item.get('name')}")
+                                return {
+                                    "status": "duplicate_prevented",
+                                    "message": f"PRD with identical content already exists: {item.get('name')}",
+                                    "existing_file": item.get("name"),
+                                    "existing_path": item.get("path"),
+                                    "github_url": f"https://github.com/{repo_owner}/{repo_name}/blob/main/{item.get('path')}"
+                                }
             except Exception as e:
                 # If duplicate check fails, log but continue (don't block PRD creation)
                 print(f"⚠️  Warning: Duplicate check failed: {e}")
@@ -5,8 +5,10 @@ Simple service implementations for Cursor Agent MCP Server
 
 import os
 import json
+import asyncio
 import requests
 import subprocess
+import aiohttp
 from typing import Dict, Any, Optional, List
 
 class SimpleSupabaseService:
@@ -131,20 +133,84 @@ class SimpleSupabaseService:
     def client(self):
         return self
 
+class _GitHubResponse:
+    """Buffered aiohttp response exposing the requests-style fields used below"""
+    
+    def __init__(self, status_code: int, headers, text: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+    
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
 class SimpleGitHubService:
-    """Simple GitHub service for basic operations"""
+    """Simple GitHub service for basic operations
     
-    def __init__(self, token: str):
+    Requests go through one pooled aiohttp session (keep-alive, timeouts), so
+    the MCP server's event loop is never blocked by GitHub calls.
+    """
+    
+    # Conditional GET cache entries (URL -> ETag and body)
+    ETAG_CACHE_SIZE = 256
+    # Connection pool size and concurrent file downloads
+    MAX_CONNECTIONS = 10
+    DOWNLOAD_CONCURRENCY = 8
+    
+    def __init__(self, token: str, timeout: float = 30):
         self.token = token
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        self.timeout = timeout
+        self._etag_cache: Dict[str, tuple] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session for the running event loop (created on first use)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=10),
+                connector=aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS, keepalive_timeout=30))
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    async def _request(self, method: str, url: str, **kwargs) -> _GitHubResponse:
+        async with self._get_session().request(method, url, **kwargs) as response:
+            return _GitHubResponse(response.status, response.headers.copy(), await response.text())
+    
+    async def _conditional_get(self, url: str) -> tuple:
+        """GET with If-None-Match; a 304 (free of rate limit) is answered from the cache.
+        Returns (status_code, json_body)."""
+        cached = self._etag_cache.get(url)
+        headers = {'If-None-Match': cached[0]} if cached else {}
+        response = await self._request('GET', url, headers=headers)
+        if response.status_code == 304 and cached:
+            return 200, cached[1]
+        if response.status_code != 200:
+            return response.status_code, None
+        body = response.json()
+        etag = response.headers.get('ETag')
+        if etag:
+            self._etag_cache.pop(url, None)
+            self._etag_cache[url] = (etag, body)
+            if len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                self._etag_cache.pop(next(iter(self._etag_cache)))
+        return 200, body
     
     async def get_user(self) -> Dict[str, Any]:
         """Get current user information"""
         try:
-            response = requests.get('https://api.github.com/user', headers=self.headers)
+            response = await self._request('GET', 'https://api.github.com/user')
             if response.status_code == 200:
                 return response.json()
             else:
@@ -161,7 +227,7 @@ class SimpleGitHubService:
                 "private": private,
                 "auto_init": True
             }
-            response = requests.post('https://api.github.com/user/repos', headers=self.headers, json=data)
+            response = await self._request('POST', 'https://api.github.com/user/repos', json=data)
             if response.status_code == 201:
                 return response.json()
             else:
@@ -172,7 +238,7 @@ class SimpleGitHubService:
     async def get_repository(self, owner: str, repo: str) -> Dict[str, Any]:
         """Get repository information"""
         try:
-            response = requests.get(f'https://api.github.com/repos/{owner}/{repo}', headers=self.headers)
+            response = await self._request('GET', f'https://api.github.com/repos/{owner}/{repo}')
             if response.status_code == 200:
                 return response.json()
             else:
@@ -181,29 +247,33 @@ class SimpleGitHubService:
             return {"error": f"GitHub operation failed: {str(e)}"}
     
     async def get_repository_contents(self, owner: str, repo: str, path: str = "", branch: str = "main") -> Dict[str, Any]:
-        """Get contents of a directory in repository"""
+        """Get contents of a directory in repository
+        
+        Uses the Git Trees API (no 1000-entry cap like the Contents API) with a
+        conditional request, so re-listing an unchanged directory is free.
+        """
         try:
-            url = f'https://api.github.com/repos/{owner}/{repo}/contents/{path}?ref={branch}'
-            response = requests.get(url, headers=self.headers)
-            if response.status_code == 200:
-                contents = response.json()
-                # Decode content for files if present
+            path = path.strip('/')
+            tree_ref = f'{branch}:{path}' if path else branch
+            url = f'https://api.github.com/repos/{owner}/{repo}/git/trees/{tree_ref}'
+            status_code, tree = await self._conditional_get(url)
+            if status_code == 200:
                 result = {"contents": []}
-                for item in contents:
+                for item in tree.get("tree", []):
                     item_data = {
-                        "name": item.get("name"),
-                        "path": item.get("path"),
-                        "type": item.get("type"),
+                        "name": item.get("path"),
+                        "path": f"{path}/{item.get('path')}" if path else item.get("path"),
+                        "type": {"tree": "dir", "commit": "submodule"}.get(item.get("type"), "file"),
                         "sha": item.get("sha"),
                         "size": item.get("size"),
                         "url": item.get("url")
                     }
                     result["contents"].append(item_data)
                 return result
-            elif response.status_code == 404:
+            elif status_code in (404, 422):
                 return {"error": "Path not found"}
             else:
-                return {"error": f"Failed to get contents: {response.status_code}"}
+                return {"error": f"Failed to get contents: {status_code}"}
         except Exception as e:
             return {"error": f"GitHub operation failed: {str(e)}"}
     
@@ -212,7 +282,7 @@ class SimpleGitHubService:
         import base64
         try:
             url = f'https://api.github.com/repos/{owner}/{repo}/contents/{file_path}?ref={branch}'
-            response = requests.get(url, headers=self.headers)
+            response = await self._request('GET', url)
             if response.status_code == 200:
                 file_data = response.json()
                 # Decode base64 content if present
@@ -230,6 +300,16 @@ class SimpleGitHubService:
         except Exception as e:
             return {"error": f"GitHub operation failed: {str(e)}"}
     
+    async def get_file_contents(self, owner: str, repo: str, file_paths: List[str], branch: str = "main") -> List[Dict[str, Any]]:
+        """get_file_content for many files, at most DOWNLOAD_CONCURRENCY at a time (results in input order)"""
+        slots = asyncio.Semaphore(self.DOWNLOAD_CONCURRENCY)
+        
+        async def fetch(file_path: str) -> Dict[str, Any]:
+            async with slots:
+                return await self.get_file_content(owner, repo, file_path, branch)
+        
+        return await asyncio.gather(*(fetch(file_path) for file_path in file_paths))
+    
     async def create_or_update_file(self, repo_owner: str, repo_name: str, file_path: str, 
                                    content: str, message: str, branch: str = "main") -> Dict[str, Any]:
         """Create or update a file in the repository"""
@@ -257,7 +337,7 @@ class SimpleGitHubService:
             
             # Create or update file via GitHub API
             url = f'https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{file_path}'
-            response = requests.put(url, headers=self.headers, json=data)
+            response = await self._request('PUT', url, json=data)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Backfill PRD front-matter
+Writes the PRD ID and content hash of the matching database row into the
+front-matter of every existing PRD file, so the backend matches rows to
+files with a single index lookup (see backend/fastapi_app/utils/prd_front_matter.py).
+
+Files are matched to rows by content hash (same hash the backend stores),
+then by original filename. Files that already carry a PRD ID are left alone.
+Commit the rewritten files afterwards.
+
+Usage:
+    python3 scripts/prd-management/backfill-prd-front-matter.py [--dry-run] [--backend-url URL]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+# Add backend to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from fastapi_app.services.prd_parser import PRDParser
+from fastapi_app.utils.prd_front_matter import front_matter_identity, with_front_matter
+from fastapi_app.utils.prd_hash import calculate_prd_hash
+
+EXCLUDED_FOLDERS = {"templates"}
+PAGE_SIZE = 1000
+
+
+def get_backend_url():
+    """Get backend URL from environment or use default"""
+    return os.getenv(
+        "BACKEND_URL",
+        "https://ai-agent-factory-backend-952475323593.us-central1.run.app"
+    )
+
+
+def get_database_prds(backend_url: str) -> List[Dict]:
+    """All PRD rows, page by page"""
+    prds: List[Dict] = []
+    while True:
+        response = requests.get(f"{backend_url}/api/v1/prds",
+                                params={"skip": len(prds), "limit": PAGE_SIZE}, timeout=30)
+        response.raise_for_status()
+        page = response.json().get("prds", [])
+        prds.extend(page)
+        if len(page) < PAGE_SIZE:
+            return prds
+
+
+def get_prd_files(root: Path) -> List[Path]:
+    """PRD markdown files in every prds/ status folder"""
+    files = []
+    for directory in sorted((root / "prds").iterdir()):
+        if directory.is_dir() and directory.name not in EXCLUDED_FOLDERS:
+            files.extend(f for f in sorted(directory.glob("*.md")) if f.name.lower() != "readme.md")
+    return files
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Write PRD IDs and content hashes into PRD file front-matter")
+    arg_parser.add_argument("--backend-url", default=get_backend_url(), help="Backend to read PRD rows from")
+    arg_parser.add_argument("--dry-run", action="store_true", help="Report matches without writing files")
+    args = arg_parser.parse_args()
+
+    print("🏷️  PRD Front-Matter Backfill")
+    print("=" * 60)
+
+    try:
+        db_prds = get_database_prds(args.backend_url)
+    except Exception as e:
+        print(f"❌ Error fetching database PRDs: {e}")
+        return 1
+    print(f"📊 {len(db_prds)} PRDs in database")
+
+    by_hash: Dict[str, Dict] = {}
+    by_filename: Dict[str, Dict] = {}
+    for prd in db_prds:
+        if prd.get("content_hash"):
+            by_hash.setdefault(prd["content_hash"], prd)
+        if prd.get("original_filename"):
+            by_filename.setdefault(prd["original_filename"].rsplit("/", 1)[-1], prd)
+
+    parser = PRDParser()
+    written = already = unmatched = 0
+    claimed = set()
+    for path in get_prd_files(project_root):
+        content = path.read_text(encoding="utf-8")
+        relative = path.relative_to(project_root)
+        if front_matter_identity(content)[0]:
+            already += 1
+            continue
+
+        # The hash of the full parse, exactly as the backend computes it for the row
+        parsed = parser.parse_prd_content(content, path.name)
+        content_hash = calculate_prd_hash(parsed["title"], parsed["description"])
+        prd = by_hash.get(content_hash) or by_filename.get(path.name)
+        if prd is None or prd["id"] in claimed:
+            print(f"   ⚠️  No database row for {relative}")
+            unmatched += 1
+            continue
+        claimed.add(prd["id"])
+
+        print(f"   ✅ {relative} → {prd['id']}")
+        if not args.dry_run:
+            # The row's own hash is what the backend looks the file up by
+            path.write_text(with_front_matter(content, prd["id"], prd.get("content_hash") or content_hash),
+                            encoding="utf-8")
+        written += 1
+
+    print("\n" + "=" * 60)
+    print(f"   🏷️  {'Would write' if args.dry_run else 'Written'}: {written}")
+    print(f"   ⏭️  Already had a PRD ID: {already}")
+    print(f"   ⚠️  Unmatched: {unmatched}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -157,7 +157,11 @@ def main():
             continue
         
         # Create PRD file content
-        content = get_prd_markdown_content(prd)
+        # Front-matter lets the backend match the row to this file by ID
+        content = f"---\nprd_id: {prd['id']}\n"
+        if prd.get('content_hash'):
+            content += f"content_hash: {prd['content_hash']}\n"
+        content += "---\n" + get_prd_markdown_content(prd)
         
         # Write file
         try:
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Batch PRD Parser
+Parses a corpus of PRD markdown files in parallel (one process per core) and
+writes the parsed results as JSON, in the order the files were given.
+
+Usage:
+    python3 scripts/prd-management/parse-prds-batch.py prds/ tests/samples/ [--workers N]
+        [--chunksize N] [--output parsed.json] [--no-validate] [--mode regex|ast]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add backend to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from fastapi_app.services.prd_batch_parser import parse_prd_batch, default_workers
+from fastapi_app.services.prd_parser import PARSER_MODES
+
+
+def collect_prd_files(paths: List[str]) -> List[Path]:
+    """Expand files and directories into a sorted list of PRD files"""
+    files: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(
+                p for p in path.rglob("*")
+                if p.suffix in ('.md', '.txt') and p.name.lower() != "readme.md"
+            ))
+        elif path.is_file():
+            files.append(path)
+        else:
+            print(f"⚠️  Skipping missing path: {raw}", file=sys.stderr)
+    return files
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Parse PRD files in parallel")
+    arg_parser.add_argument("paths", nargs="+", help="PRD files or directories")
+    arg_parser.add_argument("--workers", type=int, default=None,
+                            help=f"Worker processes (default: {default_workers()})")
+    arg_parser.add_argument("--chunksize", type=int, default=None, help="Documents per worker task")
+    arg_parser.add_argument("--output", "-o", help="Write results as JSON to this file (default: stdout)")
+    arg_parser.add_argument("--no-validate", action="store_true", help="Skip structure validation")
+    arg_parser.add_argument("--mode", choices=PARSER_MODES, default="regex",
+                            help="Section parser: line patterns or markdown block parser")
+    args = arg_parser.parse_args()
+
+    files = collect_prd_files(args.paths)
+    if not files:
+        print("❌ No PRD files found", file=sys.stderr)
+        return 1
+
+    documents = [(f.read_text(encoding='utf-8'), f.name) for f in files]
+
+    start = time.perf_counter()
+    results = parse_prd_batch(documents, max_workers=args.workers,
+                              chunksize=args.chunksize, validate=not args.no_validate,
+                              mode=args.mode)
+    elapsed = time.perf_counter() - start
+
+    output = [{"path": str(f), **result} for f, result in zip(files, results)]
+    failed = sum(1 for r in results if 'error' in r)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(output, indent=2, default=str), encoding='utf-8')
+    else:
+        print(json.dumps(output, indent=2, default=str))
+
+    rate = len(files) / elapsed if elapsed else float('inf')
+    print(f"✅ Parsed {len(files)} PRDs in {elapsed:.2f}s ({rate:.0f} docs/s), {failed} failed",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,9 +11,14 @@ import os
 import sys
 import requests
 from pathlib import Path
-from typing import Set, Dict, List
+from typing import Set, Dict, List, Optional
 import hashlib
-import re
+
+# Add backend to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "backend"))
+
+from fastapi_app.utils.prd_hash import calculate_prd_hash
 
 
 def get_backend_url():
@@ -32,28 +37,6 @@ def calculate_file_hash(file_path: Path) -> str:
     return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
 
-def normalize_text(text: str) -> str:
-    """Normalize text for consistent hashing (matches backend logic)"""
-    if not text:
-        return ""
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove markdown formatting
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # Bold
-    text = re.sub(r'__(.+?)__', r'\1', text)      # Bold
-    text = re.sub(r'\*(.+?)\*', r'\1', text)      # Italic
-    text = re.sub(r'_(.+?)_', r'\1', text)        # Italic
-    text = re.sub(r'`(.+?)`', r'\1', text)        # Code
-    
-    # Strip leading/trailing whitespace
-    return text.strip()
-
-
 def calculate_prd_content_hash(file_path: Path) -> str:
     """Calculate PRD content hash from file (matches backend calculate_prd_hash logic)"""
     content = file_path.read_text(encoding='utf-8')
@@ -79,12 +62,8 @@ def calculate_prd_content_hash(file_path: Path) -> str:
         if capture_desc:
             description += line + "\n"
     
-    # Normalize and hash (matches backend logic)
-    norm_title = normalize_text(title)
-    norm_description = normalize_text(description)[:500]  # First 500 chars
-    content_key = f"{norm_title}::{norm_description}"
-    
-    return hashlib.sha256(content_key.encode('utf-8')).hexdigest()
+    # Normalize and hash with the backend implementation
+    return calculate_prd_hash(title, description)
 
 
 def extract_title_from_file(file_path: Path) -> str:
@@ -200,6 +179,37 @@ def upload_prd(backend_url: str, file_path: Path) -> bool:
         return False
 
 
+def update_prd_content(backend_url: str, prd_id: str, file_path: Path) -> Optional[bool]:
+    """Update a PRD in place from its file (only changed sections are re-parsed).
+
+    Returns None if the backend does not support content updates, so the
+    caller can fall back to delete + re-upload.
+    """
+    try:
+        content = file_path.read_text(encoding='utf-8')
+        response = requests.put(
+            f"{backend_url}/api/v1/prds/{prd_id}/content",
+            json={"content": content, "filename": file_path.name},
+            timeout=30
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            changes = result.get("changes", {})
+            changed = changes.get("added", []) + changes.get("modified", []) + changes.get("removed", [])
+            print(f"   ✅ Updated sections: {', '.join(changed) or 'none'} "
+                  f"({len(changes.get('unchanged', []))} unchanged)")
+            return True
+        elif response.status_code in [404, 405]:
+            return None
+        else:
+            print(f"   ❌ Failed to update: {file_path.name} (HTTP {response.status_code})")
+            return False
+    except Exception as e:
+        print(f"   ❌ Error updating {file_path.name}: {e}")
+        return False
+
+
 def reconcile():
     """Main reconciliation function"""
     print("🔄 PRD Reconciliation: GitHub → Database")
@@ -299,7 +309,14 @@ def reconcile():
             # Compare content
             if github_content_normalized != db_content_normalized:
                 print(f"   🔍 '{github_title}' has different content - updating from GitHub")
-                # Delete old version
+                # Prefer an in-place update (partial re-parse, keeps the PRD ID)
+                in_place = update_prd_content(backend_url, db_prd["id"], github_prd["path"])
+                if in_place is not None:
+                    if in_place:
+                        print(f"   ✅ Updated: {github_title}")
+                        updated += 1
+                    continue
+                # Older backend: delete old version
                 if delete_prd(backend_url, db_prd["id"], github_title):
                     # Upload new version
                     if upload_prd(backend_url, github_prd["path"]):
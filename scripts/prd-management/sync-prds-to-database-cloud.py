@@ -49,6 +49,45 @@ def sync_prd_file(file_path: Path, backend_url: str) -> dict:
             "error": str(e)
         }
 
+# Documents per bulk import request
+IMPORT_BATCH_SIZE = 50
+
+def import_prd_files(prd_files: list, backend_url: str):
+    """Import PRD files in bulk; returns per-file results, or None if the backend lacks /prds/import"""
+    results = []
+    for start in range(0, len(prd_files), IMPORT_BATCH_SIZE):
+        batch = prd_files[start:start + IMPORT_BATCH_SIZE]
+        documents = [
+            {"content": f.read_text(encoding='utf-8'), "filename": f.name}
+            for f in batch
+        ]
+        try:
+            response = requests.post(
+                f"{backend_url}/api/v1/prds/import",
+                json={"documents": documents},
+                timeout=300
+            )
+        except Exception as e:
+            results.extend({"success": False, "error": str(e)} for _ in batch)
+            continue
+        if response.status_code in [404, 405] and start == 0:
+            return None
+        if response.status_code != 200:
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            results.extend({"success": False, "error": error} for _ in batch)
+            continue
+        for item in response.json().get("results", []):
+            if item.get("status") == "failed":
+                results.append({"success": False, "error": item.get("error") or "Unknown error"})
+            else:
+                results.append({
+                    "success": True,
+                    "duplicate": item.get("status") == "duplicate",
+                    "title": item.get("title"),
+                    "id": item.get("prd_id"),
+                })
+    return results
+
 def main():
     """Main sync function"""
     print("🔄 Syncing PRDs to Database (Cloud)")
@@ -80,12 +119,21 @@ def main():
     failed = 0
     skipped = 0
     
-    for prd_file in prd_files:
+    # One bulk import per batch; older backends without /prds/import get one upload per file
+    bulk_results = import_prd_files(prd_files, backend_url)
+    
+    for index, prd_file in enumerate(prd_files):
         print(f"\n📤 Syncing: {prd_file.name}")
         
-        result = sync_prd_file(prd_file, backend_url)
+        if bulk_results is not None:
+            result = bulk_results[index]
+        else:
+            result = sync_prd_file(prd_file, backend_url)
         
-        if result["success"]:
+        if result.get("duplicate"):
+            print(f"   ⏭️  Already synced")
+            skipped += 1
+        elif result["success"]:
             print(f"   ✅ Uploaded: {result.get('title', 'Unknown title')}")
             print(f"   📝 ID: {result.get('id', 'N/A')}")
             uploaded += 1
@@ -100,7 +148,8 @@ def main():
                 failed += 1
         
         # Small delay to avoid rate limiting
-        time.sleep(0.5)
+        if bulk_results is None:
+            time.sleep(0.5)
     
     # Summary
     print("\n" + "=" * 50)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+PRD parser micro-benchmarks
+Compares the optimised PRDParser stages against the original implementations
+and checks that both produce identical output.
+
+Usage:
+    python3 scripts/testing/benchmark-prd-parser.py [--lines 20000] [--repeat 5] [--stress-lines 2000]
+        [--batch-docs 2000]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+
+from fastapi_app.services.prd_parser import PRDParser
+from fastapi_app.services.prd_classifier import prd_type_classifier
+from fastapi_app.services.prd_batch_parser import parse_prd_batch, default_workers
+from fastapi_app.utils.parse_cache import ParseCache
+from fastapi_app.utils.prd_hash import calculate_prd_hash, hash_many
+from prd_benchmarks.corpus import build_large_prd, load_sample_prds
+from prd_benchmarks.inline_fields import build_inline_stress_prd, inline_fields, legacy_extract_inline_fields
+
+
+def legacy_identify_sections(parser: PRDParser, lines: List[str]) -> Dict[str, List[str]]:
+    """Original per-line loop over every uncompiled section pattern"""
+    sections = {}
+    current_section = None
+    current_content = []
+
+    for line in lines:
+        line_stripped = line.strip()
+
+        section_found = None
+        for section_name, pattern in parser.section_patterns.items():
+            if re.match(pattern, line_stripped, re.IGNORECASE):
+                section_found = section_name
+                break
+
+        if section_found:
+            if current_section and current_content:
+                sections[current_section] = current_content
+            current_section = section_found
+            current_content = []
+        elif current_section and line_stripped:
+            current_content.append(line)
+
+    if current_section and current_content:
+        sections[current_section] = current_content
+
+    return sections
+
+
+def legacy_detect_prd_type(content: str) -> str:
+    """Original PRDService._detect_prd_type (one `in` scan per keyword)"""
+    content_lower = content.lower()
+    platform_keywords = [
+        'platform', 'factory', 'infrastructure', 'system', 'architecture', 'framework',
+        'core', 'base', 'foundation', 'engine', 'orchestrator', 'deployment', 'ci/cd',
+        'pipeline', 'monitoring', 'logging', 'authentication', 'authorization', 'database',
+        'api', 'backend', 'frontend', 'ui', 'ux', 'dashboard', 'admin', 'management']
+    agent_keywords = [
+        'agent', 'bot', 'assistant', 'automation', 'workflow', 'task',
+        'process', 'execution', 'ai', 'ml', 'model', 'prediction',
+        'analysis', 'recommendation', 'chat', 'conversation', 'nlp',
+        'openai', 'anthropic', 'claude']
+    platform_score = sum(1 for keyword in platform_keywords if keyword in content_lower)
+    agent_score = sum(1 for keyword in agent_keywords if keyword in content_lower)
+    if any(pattern in content_lower for pattern in [
+        'prd type', 'platform prd', 'agent prd', 'type:', 'category:'
+    ]):
+        if 'platform' in content_lower:
+            return 'platform'
+        elif 'agent' in content_lower:
+            return 'agent'
+    if 'create agent' in content_lower or 'build agent' in content_lower:
+        return 'agent'
+    if 'improve platform' in content_lower or 'enhance system' in content_lower:
+        return 'platform'
+    return 'platform' if platform_score > agent_score else 'agent'
+
+
+def legacy_determine_prd_type(content: str, filename: str = None) -> str:
+    """Original PRDParser._determine_prd_type"""
+    content_lower = content.lower()
+    if filename:
+        filename_lower = filename.lower()
+        if 'platform' in filename_lower:
+            return 'platform'
+        elif 'agent' in filename_lower:
+            return 'agent'
+    platform_indicators = ['platform', 'infrastructure', 'system', 'deployment',
+                           'scalability', 'monitoring', 'operational']
+    agent_indicators = ['ai agent', 'agent', 'artificial intelligence', 'machine learning',
+                        'automation', 'chatbot', 'assistant', 'intelligent']
+    platform_score = sum(1 for indicator in platform_indicators if indicator in content_lower)
+    agent_score = sum(1 for indicator in agent_indicators if indicator in content_lower)
+    return 'platform' if platform_score > agent_score else 'agent'
+
+
+def legacy_normalize_text(text: str) -> str:
+    """Original utils.prd_hash.normalize_text (six passes over the whole text)"""
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = re.sub(r'\*(.+?)\*', r'\1', text)
+    text = re.sub(r'_(.+?)_', r'\1', text)
+    text = re.sub(r'`(.+?)`', r'\1', text)
+    return text.strip()
+
+
+def legacy_prd_hash(title: str, description: str) -> str:
+    content = f"{legacy_normalize_text(title)}::{legacy_normalize_text(description)[:500]}"
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def heading_variants() -> List[str]:
+    """Header-like lines that exercise the edges of the section patterns"""
+    names = ['Title', 'Description', 'Problem Statement', 'Functional Requirements',
+             'Agent Capabilities', 'Timeline', 'Unknown Section']
+    variants = []
+    for name in names:
+        for hashes in ['#', '##', '###', '####']:
+            for fmt in ['{}', '**{}**', '*{}*', '**{}', '{}**', '** {}**', '{} ']:
+                for sep in ['', ' ', '  ']:
+                    text = fmt.format(name)
+                    variants.append(f"{hashes}{sep}{text}")
+                    variants.append(f"{hashes}{sep}{text.upper()}")
+                    variants.append(f"  {hashes}{sep}{text.lower()}  ")
+    return variants
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Best-of-N wall time in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, legacy: float, current: float) -> None:
+    speedup = legacy / current if current else float('inf')
+    print(f"  {name:<28} legacy {legacy * 1000:9.2f} ms   current {current * 1000:9.2f} ms   "
+          f"speedup {speedup:5.1f}x")
+
+
+def benchmark_sections(parser: PRDParser, lines: List[str], repeat: int) -> None:
+    """Section tokenizer: compiled alternation vs per-pattern re.match loop"""
+    variant_lines = heading_variants() + ['body line'] * 3
+    assert legacy_identify_sections(parser, variant_lines) == parser._identify_sections(variant_lines), \
+        "section tokenizer output differs on heading variants"
+    assert legacy_identify_sections(parser, lines) == parser._identify_sections(lines), \
+        "section tokenizer output differs on large PRD"
+
+    legacy = time_call(lambda: legacy_identify_sections(parser, lines), repeat)
+    current = time_call(lambda: parser._identify_sections(lines), repeat)
+    report("_identify_sections", legacy, current)
+
+
+def benchmark_inline_fields(parser: PRDParser, samples: List[str], repeat: int,
+                            stress_lines: int) -> None:
+    """Inline field extraction: single forward pass vs per-marker rescans"""
+    extract = lambda content, result: parser._extract_inline_fields(content, result)
+
+    for sample in samples:
+        assert inline_fields(legacy_extract_inline_fields, sample) == inline_fields(extract, sample), \
+            "inline field output differs on a sample PRD"
+
+    # Duplicate marker lines: the legacy lines.index() lookup rescanned from the
+    # first copy and missed the later block; the forward pass picks it up
+    duplicate = "**Requirements:**\n## Next Section\n**Requirements:**\n- Real requirement\n"
+    assert inline_fields(legacy_extract_inline_fields, duplicate)['requirements'] == []
+    assert inline_fields(extract, duplicate)['requirements'] == ['Real requirement']
+
+    stress = build_inline_stress_prd(stress_lines)
+    assert inline_fields(legacy_extract_inline_fields, stress) == inline_fields(extract, stress), \
+        "inline field output differs on the stress PRD"
+
+    legacy = time_call(lambda: inline_fields(legacy_extract_inline_fields, stress), repeat)
+    current = time_call(lambda: inline_fields(extract, stress), repeat)
+    report(f"_extract_inline_fields {stress_lines}", legacy, current)
+
+
+def benchmark_parse_cache(parser: PRDParser, content: str, repeat: int) -> None:
+    """Full parse vs content-addressed cache hit for a re-uploaded document"""
+    cache = ParseCache(max_entries=8)
+    parse = lambda: parser.parse_prd_content(content, "large.md")
+    expected = cache.get_or_parse(content, parse, "large.md")
+    assert cache.get_or_parse(content, parse, "large.md") == expected, "cached parse result differs"
+
+    legacy = time_call(parse, repeat)
+    current = time_call(lambda: cache.get_or_parse(content, parse, "large.md"), repeat)
+    report("parse_prd_content (cached)", legacy, current)
+
+
+def benchmark_batch_parse(parser: PRDParser, samples: List[str], documents: int, repeat: int) -> None:
+    """Serial parse loop vs process-pool batch parse over a corpus of samples"""
+    corpus = [(samples[i % len(samples)], f"prd-{i}.md") for i in range(documents)]
+
+    def serial():
+        return [parser.parse_prd_content(content, filename) for content, filename in corpus]
+
+    assert parse_prd_batch(corpus, validate=False) == serial(), "batch parse output differs"
+
+    legacy = time_call(serial, repeat)
+    current = time_call(lambda: parse_prd_batch(corpus, validate=False), repeat)
+    report(f"parse_prd_batch x{default_workers()}", legacy, current)
+
+
+def benchmark_classifier(samples: List[str], content: str, repeat: int) -> None:
+    """PRD type detection: both legacy detectors (as run per upload) vs one classify() call
+
+    The legacy detectors disagree with each other, so outputs are compared for
+    agreement rather than asserted identical. classify() makes one presence
+    check per keyword, like the legacy `in` scans, but short keywords must be
+    whole words, so it should run at about the same cost as the two detectors.
+    """
+    legacy_both = lambda text: (legacy_determine_prd_type(text), legacy_detect_prd_type(text))
+    conflicts = sum(1 for sample in samples if len(set(legacy_both(sample))) > 1)
+    agree = sum(1 for sample in samples
+                if prd_type_classifier.classify(sample)['prd_type'] == legacy_detect_prd_type(sample))
+    print(f"  classifier agrees with the service detector on {agree}/{len(samples)} samples "
+          f"(legacy detectors conflict on {conflicts})")
+
+    legacy = time_call(lambda: [legacy_both(sample) for sample in samples], repeat)
+    current = time_call(lambda: [prd_type_classifier.classify(sample) for sample in samples], repeat)
+    report("prd type (samples)", legacy, current)
+
+    legacy = time_call(lambda: legacy_both(content), repeat)
+    current = time_call(lambda: prd_type_classifier.classify(content), repeat)
+    report("prd type (large PRD)", legacy, current)
+
+    # The whole document is classified: a declaration far into it still counts
+    late = "Notes on the platform.\n" * 4000 + "**Type:** agent\n"
+    assert prd_type_classifier.classify(late)['reason'] == 'declared', "late type declaration ignored"
+
+    # Only a line of its own declares the type; prose mentioning a type does not
+    for text in ("- **PRD Type:** agent", "---\ncategory: platform\n---", "**Type**: **platform**"):
+        assert prd_type_classifier.classify(text)['reason'] == 'declared', f"declaration missed: {text!r}"
+    chatbot = "# Support Chatbot\nAn AI agent chatbot that answers support chat.\n"
+    for prose in ("Message type: platform-specific payloads", "prototype: agent",
+                  "type: agent-based routing", "The message type: platform"):
+        verdict = prd_type_classifier.classify(f"{chatbot}{prose}\n")
+        assert verdict['reason'] != 'declared' and verdict['prd_type'] == 'agent', \
+            f"prose taken as a type declaration: {prose!r}"
+    first = prd_type_classifier.classify("category: platform\n\nType: agent\n")
+    assert first['prd_type'] == 'platform', "first type declaration not the one used"
+
+    # Short keywords are whole words: 'email' is not 'ai', 'build' is not 'ui'
+    inside = prd_type_classifier.classify("Email details for the build guide.")
+    assert inside['agent_score'] == inside['platform_score'] == 0, "short keyword matched inside another word"
+
+
+def benchmark_prd_hash(samples: List[str], content: str, repeat: int) -> None:
+    """PRD content hash: full normalisation vs bounded prefix normalisation"""
+    pairs = [(sample.split('\n', 1)[0], sample) for sample in samples] + [("Large PRD", content)]
+    for title, description in pairs:
+        assert calculate_prd_hash(title, description) == legacy_prd_hash(title, description), \
+            "PRD hash differs from the stored-hash algorithm"
+    assert hash_many(pairs) == [legacy_prd_hash(t, d) for t, d in pairs], "hash_many output differs"
+
+    # Prefix normalisation must stay exact at the window edges: open markdown
+    # delimiters, whitespace runs, and a 'Σ' whose lowercase form depends on
+    # what follows it
+    rng = random.Random(36)
+    alphabet = ['a', 'b', 'Σ', 'İ', "'", '.', ' ', '\n', '*', '**', '_', '__', '`']
+    edge_cases = ['__a__' * 375 + 'a' * 124 + 'Σ' + 'b' * 3000,
+                  '__a__' * 375 + 'a' * 124 + 'Σ' + "'" * 50 + 'b' * 3000]
+    edge_cases += [''.join(rng.choices(alphabet, k=rng.randint(1500, 9000))) for _ in range(200)]
+    for description in edge_cases:
+        assert calculate_prd_hash("T", description) == legacy_prd_hash("T", description), \
+            f"PRD hash differs from the stored-hash algorithm on {description[:40]!r}..."
+
+    legacy = time_call(lambda: legacy_prd_hash("Large PRD", content), repeat)
+    current = time_call(lambda: calculate_prd_hash("Large PRD", content), repeat)
+    report("calculate_prd_hash (large)", legacy, current)
+
+    corpus = pairs * 100
+    legacy = time_call(lambda: [legacy_prd_hash(t, d) for t, d in corpus], repeat)
+    current = time_call(lambda: hash_many(corpus), repeat)
+    report(f"hash_many x{len(corpus)}", legacy, current)
+    print(f"  {'':<28} {len(corpus) / current:,.0f} hashes/s")
+
+
+def benchmark_parser_modes(parser: PRDParser, samples: List[str], content: str, repeat: int) -> None:
+    """Section parsing: line regexes vs markdown block parser ('ast' mode)"""
+    ast_parser = PRDParser(mode='ast')
+    variant_lines = heading_variants() + ['body line'] * 3
+    assert parser._identify_sections(variant_lines) == ast_parser._identify_sections(variant_lines), \
+        "ast sections differ on heading variants"
+    for sample in samples + [content]:
+        assert parser.parse_prd_content(sample, "prd.md") == ast_parser.parse_prd_content(sample, "prd.md"), \
+            "ast parse result differs"
+
+    # Where the modes are meant to differ: fenced headings and setext headings
+    edge = "## Description\nText\n```\n## Risks\n```\nSecurity Requirements\n---\n- Encrypt data\n"
+    sections = ast_parser._identify_sections(edge.split('\n'))
+    assert 'risks' not in sections and sections['security_requirements'] == ['- Encrypt data']
+
+    legacy = time_call(lambda: [parser.parse_prd_content(sample) for sample in samples], repeat)
+    current = time_call(lambda: [ast_parser.parse_prd_content(sample) for sample in samples], repeat)
+    report("parse mode ast (samples)", legacy, current)
+
+    legacy = time_call(lambda: parser.parse_prd_content(content), repeat)
+    current = time_call(lambda: ast_parser.parse_prd_content(content), repeat)
+    report("parse mode ast (large PRD)", legacy, current)
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    arg_parser.add_argument("--lines", type=int, default=20000, help="Size of the synthetic PRD")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best of N)")
+    arg_parser.add_argument("--stress-lines", type=int, default=2000,
+                            help="Size of the inline-field stress document")
+    arg_parser.add_argument("--batch-docs", type=int, default=2000,
+                            help="Corpus size for the batch parse benchmark")
+    args = arg_parser.parse_args()
+
+    samples = load_sample_prds()
+    content = build_large_prd(samples, args.lines)
+    lines = content.split('\n')
+    parser = PRDParser()
+
+    print("⏱️  PRD Parser Benchmarks")
+    print("=" * 50)
+    print(f"  {len(samples)} sample PRDs, synthetic document of {len(lines)} lines\n")
+
+    benchmark_sections(parser, lines, args.repeat)
+    benchmark_inline_fields(parser, samples, args.repeat, args.stress_lines)
+    benchmark_parse_cache(parser, content, args.repeat)
+    benchmark_batch_parse(parser, samples, args.batch_docs, args.repeat)
+    benchmark_classifier(samples, content, args.repeat)
+    benchmark_prd_hash(samples, content, args.repeat)
+    benchmark_parser_modes(parser, samples, content, args.repeat)
+
+    print("\n✅ Outputs identical to the original implementations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
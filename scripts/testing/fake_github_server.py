@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Local fake GitHub REST API
+Serves one in-memory repository over HTTP so GitHub access code can be
+exercised (and its request/rate-limit cost measured) without the network.
+
+Supported endpoints (under /repos/{owner}/{repo}):
+    GET    /git/trees/{branch|sha}[?recursive=1]   (recursive listings optionally truncated)
+    GET    /git/blobs/{sha}
+    GET    /contents/{path}[?ref=...]              (directory listings cap at 1000)
+    PUT    /contents/{path}
+    DELETE /contents/{path}
+    GET    /raw/{path}                             (download_url of listings)
+    GET    /git/ref/heads/{branch}
+    POST   /git/trees                              (base_tree + entries with content, sha or sha: null)
+    POST   /git/commits
+    PATCH  /git/refs/heads/{branch}                (422 unless a fast-forward)
+
+GETs carry an ETag and answer a matching If-None-Match with 304, which like
+GitHub does not count against the rate limit. Every response carries
+X-RateLimit-Limit/Remaining/Reset; once the budget is spent API calls get
+GitHub's 403, and throttle() makes the next calls fail with a secondary rate
+limit (403 + Retry-After).
+
+Usage:
+    python3 scripts/testing/fake_github_server.py [--port 8765] [--seed-dir prds/queue] [--latency-ms 0]
+Then point the backend at it with GITHUB_API_URL=http://127.0.0.1:8765.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+# The Contents API returns at most this many directory entries
+CONTENTS_LIMIT = 1000
+
+
+def blob_sha(data: bytes) -> str:
+    """Git blob SHA-1, as GitHub reports it"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class FakeGitHub:
+    """In-memory repository plus request accounting."""
+
+    def __init__(self, files: Optional[Dict[str, str]] = None, owner: str = "owner",
+                 repo: str = "repo", branch: str = "main", rate_limit: int = 5000,
+                 truncate_tree_at: Optional[int] = None, latency: float = 0.0):
+        self.owner = owner
+        self.repo = repo
+        self.branch = branch
+        self.files: Dict[str, bytes] = {path: content.encode("utf-8") for path, content in (files or {}).items()}
+        # Like git, blobs stay readable by SHA after the file changes
+        self.blobs: Dict[str, bytes] = {blob_sha(data): data for data in self.files.values()}
+        self.rate_limit = rate_limit
+        self.truncate_tree_at = truncate_tree_at
+        # Seconds added to every response, to stand in for network round trips
+        self.latency = latency
+        self.rate_limit_reset = int(time.time()) + 3600
+        self._throttled = 0  # next API calls answered with a secondary rate limit
+        self._throttle_retry_after = 1
+        self.commits = 0
+        self.head = ""  # commit SHA the branch points at
+        self._commit_files: Dict[str, Dict[str, bytes]] = {}  # commit sha -> files
+        self._tree_files: Dict[str, Dict[str, bytes]] = {}  # root tree sha -> files
+        self._commit_parents: Dict[str, list] = {}
+        self.stats = {"requests": 0, "not_modified": 0, "rate_limit_cost": 0}
+        self.requests_by_kind: Dict[str, int] = {}
+        self._trees: Dict[str, str] = {}  # tree sha -> directory it was listed for
+        self._lock = threading.RLock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._commit()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, port: int = 0) -> str:
+        """Serve on a background thread; returns the base URL"""
+        fake = self
+
+        class Handler(_Handler):
+            github = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def throttle(self, requests: int = 1, retry_after: int = 1) -> None:
+        """Answer the next `requests` API calls with a secondary rate limit"""
+        with self._lock:
+            self._throttled = requests
+            self._throttle_retry_after = retry_after
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {key: 0 for key in self.stats}
+            self.requests_by_kind = {}
+
+    def write(self, path: str, content: str) -> None:
+        with self._lock:
+            self.files[path] = content.encode("utf-8")
+            self.blobs[blob_sha(self.files[path])] = self.files[path]
+            self._commit()
+
+    def delete(self, path: str) -> None:
+        with self._lock:
+            self.files.pop(path, None)
+            self._commit()
+
+    def _commit(self, sha: Optional[str] = None) -> None:
+        """Move the branch to a new commit of the current files"""
+        if sha is None:
+            sha = hashlib.sha1(f"{self.commits}:{self.head}:{self._tree_sha('')}".encode()).hexdigest()
+            self._commit_parents[sha] = [self.head] if self.head else []
+        self.commits += 1
+        self.head = sha
+        self._commit_files[sha] = dict(self.files)
+
+    # -- views -----------------------------------------------------------
+
+    def tree(self, directory: str, recursive: bool, files: Optional[Dict[str, bytes]] = None) -> dict:
+        if files is not None and files != self.files:
+            # A past commit: list its root only (subtree SHAs refer to the current files)
+            sha = self._tree_sha("", files)
+            self._tree_files[sha] = files
+            return {"sha": sha, "truncated": False,
+                    "tree": [{"path": path, "mode": "100644", "type": "blob", "sha": blob_sha(data),
+                              "size": len(data)} for path, data in sorted(files.items())]}
+        prefix = f"{directory}/" if directory else ""
+        entries, subdirs = [], set()
+        for path in sorted(self.files):
+            if not path.startswith(prefix):
+                continue
+            relative = path[len(prefix):]
+            parts = relative.split("/")
+            if len(parts) > 1:
+                if not recursive:
+                    subdirs.add(parts[0])
+                    continue
+                subdirs.update("/".join(parts[:depth]) for depth in range(1, len(parts)))
+            data = self.files[path]
+            entries.append({"path": relative, "mode": "100644", "type": "blob",
+                            "sha": blob_sha(data), "size": len(data)})
+        for subdir in sorted(subdirs):
+            entries.append({"path": subdir, "mode": "040000", "type": "tree",
+                            "sha": self._tree_sha(f"{prefix}{subdir}")})
+        entries.sort(key=lambda e: e["path"])
+        truncated = recursive and self.truncate_tree_at is not None and len(entries) > self.truncate_tree_at
+        if truncated:
+            entries = entries[:self.truncate_tree_at]
+        sha = self._tree_sha(directory)
+        if not directory:
+            self._tree_files[sha] = dict(self.files)
+        return {"sha": sha, "tree": entries, "truncated": truncated}
+
+    def _tree_sha(self, directory: str, files: Optional[Dict[str, bytes]] = None) -> str:
+        prefix = f"{directory}/" if directory else ""
+        digest = hashlib.sha1(directory.encode("utf-8"))
+        for path in sorted(files if files is not None else self.files):
+            if path.startswith(prefix):
+                data = (files if files is not None else self.files)[path]
+                digest.update(path.encode("utf-8") + blob_sha(data).encode("ascii"))
+        sha = digest.hexdigest()
+        if files is None:
+            self._trees[sha] = directory
+        return sha
+
+    def content_item(self, path: str, with_content: bool = False) -> dict:
+        data = self.files[path]
+        item = {"name": path.rsplit("/", 1)[-1], "path": path, "sha": blob_sha(data),
+                "size": len(data), "type": "file",
+                "html_url": f"https://github.com/{self.owner}/{self.repo}/blob/{self.branch}/{path}",
+                "download_url": f"{self.base_url}/repos/{self.owner}/{self.repo}/raw/{path}"}
+        if with_content:
+            item.update(content=base64.b64encode(data).decode("ascii"), encoding="base64")
+        return item
+
+
+class _Handler(BaseHTTPRequestHandler):
+    github: FakeGitHub
+    # Keep-alive, so pooled clients reuse connections as they would with GitHub
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this keep-alive stalls on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):  # keep test output quiet
+        pass
+
+    def _route(self):
+        if self.github.latency:
+            time.sleep(self.github.latency)
+        parsed = urlparse(self.path)
+        prefix = f"/repos/{self.github.owner}/{self.github.repo}/"
+        if not parsed.path.startswith(prefix):
+            return None, None, {}
+        rest = unquote(parsed.path[len(prefix):])
+        kind, _, arg = rest.partition("/")
+        if kind == "git":
+            kind, _, arg = arg.partition("/")
+        return kind, arg, parse_qs(parsed.query)
+
+    def _send(self, status: int, body=None, raw: Optional[bytes] = None, count: bool = True,
+              etag: Optional[str] = None) -> None:
+        gh = self.github
+        with gh._lock:
+            gh.stats["requests"] += 1
+            if status == 304:
+                gh.stats["not_modified"] += 1
+            elif count:
+                gh.stats["rate_limit_cost"] += 1
+            remaining = gh.rate_limit - gh.stats["rate_limit_cost"]
+        payload = raw if raw is not None else (json.dumps(body).encode("utf-8") if body is not None else b"")
+        self.send_response(status)
+        self.send_header("X-RateLimit-Limit", str(gh.rate_limit))
+        self.send_header("X-RateLimit-Remaining", str(max(0, remaining)))
+        self.send_header("X-RateLimit-Reset", str(gh.rate_limit_reset))
+        if status == 403 and gh._throttle_retry_after and body and "secondary" in body.get("message", ""):
+            self.send_header("Retry-After", str(gh._throttle_retry_after))
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/plain" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_conditional(self, body) -> None:
+        payload = json.dumps(body, sort_keys=True).encode("utf-8")
+        etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, etag=etag)
+        else:
+            self._send(200, raw=None, body=body, etag=etag)
+
+    def _rate_limited(self) -> bool:
+        """Send GitHub's 403 if the budget is spent or a secondary limit is pending"""
+        gh = self.github
+        with gh._lock:
+            if gh._throttled > 0:
+                gh._throttled -= 1
+                message = "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."
+            elif gh.stats["rate_limit_cost"] >= gh.rate_limit:
+                message = "API rate limit exceeded for user ID 1."
+            else:
+                return False
+        self._send(403, {"message": message}, count=False)
+        return True
+
+    def _count_kind(self, kind: str) -> None:
+        gh = self.github
+        with gh._lock:
+            gh.requests_by_kind[kind] = gh.requests_by_kind.get(kind, 0) + 1
+
+    def do_GET(self):
+        gh = self.github
+        kind, arg, query = self._route()
+        self._count_kind(f"GET {kind}")
+        if kind != "raw" and self._rate_limited():
+            return
+        with gh._lock:
+            recursive = query.get("recursive", ["0"])[0] not in ("0", "")
+            if kind == "trees" and arg in gh._commit_files:
+                body = gh.tree("", recursive, files=gh._commit_files[arg])
+            elif kind == "trees":
+                directory = "" if arg == gh.branch else gh._trees.get(arg)
+                if directory is None:
+                    body = None
+                else:
+                    body = gh.tree(directory, recursive)
+            elif kind == "ref" and arg == f"heads/{gh.branch}":
+                body = {"ref": f"refs/heads/{gh.branch}", "object": {"sha": gh.head, "type": "commit"}}
+            elif kind == "blobs":
+                data = gh.blobs.get(arg)
+                body = None if data is None else {"sha": arg, "size": len(data), "encoding": "base64",
+                                                  "content": base64.b64encode(data).decode("ascii")}
+            elif kind == "contents":
+                path = arg.strip("/")
+                if path in gh.files:
+                    body = gh.content_item(path, with_content=True)
+                else:
+                    children = sorted(p for p in gh.files if p.startswith(f"{path}/") and "/" not in p[len(path) + 1:])
+                    body = [gh.content_item(p) for p in children][:CONTENTS_LIMIT] or None
+            elif kind == "raw":
+                data = gh.files.get(arg)
+                # Raw downloads are not API calls
+                if data is None:
+                    return self._send(404, {"message": "Not Found"}, count=False)
+                return self._send(200, raw=data, count=False)
+            else:
+                body = None
+        if body is None:
+            return self._send(404, {"message": "Not Found"})
+        self._send_conditional(body)
+
+    def do_PUT(self):
+        gh = self.github
+        kind, path, _ = self._route()
+        self._count_kind(f"PUT {kind}")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self._rate_limited():
+            return
+        if kind != "contents":
+            return self._send(404, {"message": "Not Found"})
+        with gh._lock:
+            existing = gh.files.get(path)
+            if existing is not None and request.get("sha") != blob_sha(existing):
+                return self._send(409 if request.get("sha") else 422,
+                                  {"message": f"{path} does not match" if request.get("sha")
+                                   else "Invalid request.\n\n\"sha\" wasn't supplied."})
+            gh.files[path] = base64.b64decode(request.get("content", ""))
+            gh.blobs[blob_sha(gh.files[path])] = gh.files[path]
+            gh._commit()
+            item = gh.content_item(path)
+        self._send(200 if existing is not None else 201, {"content": item, "commit": {"sha": gh.head}})
+
+    def do_DELETE(self):
+        gh = self.github
+        kind, path, _ = self._route()
+        self._count_kind(f"DELETE {kind}")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self._rate_limited():
+            return
+        with gh._lock:
+            existing = gh.files.get(path) if kind == "contents" else None
+            if existing is None:
+                return self._send(404, {"message": "Not Found"})
+            if request.get("sha") != blob_sha(existing):
+                return self._send(409, {"message": f"{path} does not match {request.get('sha')}"})
+            del gh.files[path]
+            gh._commit()
+        self._send(200, {"content": None, "commit": {"sha": gh.head}})
+
+    def do_POST(self):
+        gh = self.github
+        kind, _, _ = self._route()
+        self._count_kind(f"POST {kind}")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self._rate_limited():
+            return
+        with gh._lock:
+            if kind == "trees":
+                base = gh._tree_files.get(request.get("base_tree"))
+                if base is None:
+                    return self._send(422, {"message": "Invalid tree info"})
+                files = dict(base)
+                for entry in request.get("tree", []):
+                    path = entry["path"]
+                    if "content" in entry:
+                        files[path] = entry["content"].encode("utf-8")
+                        gh.blobs[blob_sha(files[path])] = files[path]
+                    elif entry.get("sha") is None:
+                        if files.pop(path, None) is None:
+                            return self._send(422, {"message": "GitHub tree creation failed"})
+                    elif entry["sha"] in gh.blobs:
+                        files[path] = gh.blobs[entry["sha"]]
+                    else:
+                        return self._send(422, {"message": "Invalid tree info"})
+                sha = gh._tree_sha("", files)
+                gh._tree_files[sha] = files
+                body = {"sha": sha, "tree": [], "truncated": False}
+            elif kind == "commits":
+                files = gh._tree_files.get(request.get("tree"))
+                if files is None:
+                    return self._send(422, {"message": "Tree SHA does not exist"})
+                parents = request.get("parents", [])
+                sha = hashlib.sha1(json.dumps([request.get("tree"), parents, request.get("message"),
+                                               len(gh._commit_files)]).encode()).hexdigest()
+                gh._commit_files[sha] = files
+                gh._commit_parents[sha] = parents
+                body = {"sha": sha, "tree": {"sha": request["tree"]}, "parents": [{"sha": p} for p in parents]}
+            else:
+                return self._send(404, {"message": "Not Found"})
+        self._send(201, body)
+
+    def do_PATCH(self):
+        gh = self.github
+        kind, arg, _ = self._route()
+        self._count_kind(f"PATCH {kind}")
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self._rate_limited():
+            return
+        if kind != "refs" or arg != f"heads/{gh.branch}":
+            return self._send(404, {"message": "Not Found"})
+        with gh._lock:
+            sha = request.get("sha")
+            if sha not in gh._commit_files:
+                return self._send(422, {"message": "Object does not exist"})
+            if not request.get("force") and gh.head not in gh._commit_parents.get(sha, []):
+                return self._send(422, {"message": "Update is not a fast forward"})
+            gh.files = dict(gh._commit_files[sha])
+            gh._commit(sha)
+        self._send(200, {"ref": f"refs/heads/{gh.branch}", "object": {"sha": sha, "type": "commit"}})
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Local fake GitHub REST API")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--owner", default="thedoctorJJ")
+    arg_parser.add_argument("--repo", default="ai-agent-factory")
+    arg_parser.add_argument("--seed-dir", help="Repository directory to preload (e.g. prds/queue)")
+    arg_parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    args = arg_parser.parse_args()
+
+    project_root = Path(__file__).parent.parent.parent
+    files = {}
+    if args.seed_dir:
+        for path in sorted((project_root / args.seed_dir).glob("*.md")):
+            files[f"{args.seed_dir.strip('/')}/{path.name}"] = path.read_text(encoding="utf-8")
+
+    fake = FakeGitHub(files, owner=args.owner, repo=args.repo, latency=args.latency_ms / 1000)
+    fake._server = ThreadingHTTPServer(("127.0.0.1", args.port), type("Handler", (_Handler,), {"github": fake}))
+    print(f"Fake GitHub serving {args.owner}/{args.repo} ({len(files)} files) at {fake.base_url}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+GitHub directory scan cost
+Runs the PRD duplicate-check scan against the local fake GitHub server and
+reports HTTP requests and rate-limit cost for the old Contents API scan (list
++ download every file) and the tree-based GitHub PRD index (cold, unchanged,
+and after one file changes).
+
+Usage:
+    python3 scripts/testing/measure-github-scan-cost.py [--files 200] [--seed 42] [--concurrency 8]
+        [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_github_server import FakeGitHub
+from prd_benchmarks.corpus import CorpusGenerator
+from fastapi_app.services.github_api import GitHubAPI
+from fastapi_app.services.github_prd_index import PRD_QUEUE_DIR, GitHubPRDIndex
+
+
+def contents_scan(fake: FakeGitHub) -> int:
+    """The pre-index scan: Contents API listing, then download every PRD; returns files seen"""
+    url = f"{fake.base_url}/repos/{fake.owner}/{fake.repo}/contents/{PRD_QUEUE_DIR}"
+    files = requests.get(url, timeout=10).json()
+    for item in files:
+        if item["name"].endswith(".md") and item["name"] != "README.md":
+            requests.get(item["download_url"], timeout=10)
+    return len(files)
+
+
+async def run(args: argparse.Namespace) -> None:
+    corpus = CorpusGenerator(seed=args.seed).generate(args.files)
+    fake = FakeGitHub({f"{PRD_QUEUE_DIR}/prd-{i:05d}.md": doc for i, doc in enumerate(corpus)},
+                      latency=args.latency_ms / 1000)
+    base_url = fake.start()
+    raw_url = f"{base_url}/repos/{fake.owner}/{fake.repo}/raw"
+    api = GitHubAPI("test-token", fake.owner, fake.repo, base_url=base_url, raw_url=raw_url,
+                    download_concurrency=args.concurrency)
+    index = GitHubPRDIndex(api)
+
+    async def refresh() -> int:
+        await index.refresh()
+        return len(index.entries())
+
+    async def measure(label, action):
+        fake.reset_stats()
+        started = time.perf_counter()
+        seen = await action()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = fake.stats
+        print(f"{label:<32} {seen:>6} {stats['requests']:>9} {stats['not_modified']:>6} "
+              f"{stats['rate_limit_cost']:>10} {elapsed_ms:>9.1f}")
+
+    print(f"{args.files} PRD files in {PRD_QUEUE_DIR}/, download concurrency {args.concurrency}, "
+          f"{args.latency_ms:g} ms latency\n")
+    print(f"{'scan':<32} {'files':>6} {'requests':>9} {'304s':>6} {'rate cost':>10} {'ms':>9}")
+    await measure("contents API (list + download)", lambda: asyncio.to_thread(contents_scan, fake))
+    await measure("index: cold", refresh)
+    await measure("index: unchanged", refresh)
+    fake.write(f"{PRD_QUEUE_DIR}/prd-00000.md", corpus[0] + "\n- one more line\n")
+    await measure("index: one file changed", refresh)
+    await measure("index: unchanged again", refresh)
+    await api.http.aclose()
+    fake.stop()
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="GitHub scan cost against a fake GitHub server")
+    arg_parser.add_argument("--files", type=int, default=200, help="PRD files in prds/queue")
+    arg_parser.add_argument("--seed", type=int, default=42, help="Corpus generator seed")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent index downloads")
+    arg_parser.add_argument("--latency-ms", type=float, default=20, help="Simulated network latency per response")
+    asyncio.run(run(arg_parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
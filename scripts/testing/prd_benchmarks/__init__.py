@@ -0,0 +1,17 @@
+"""
+PRD benchmark suite
+Synthetic PRD corpus generation, per-stage throughput/allocation measurement
+and stored baselines for the PRD parser, hashing and type detection.
+
+Run it with scripts/testing/run-prd-benchmarks.py.
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Add backend to path
+if str(PROJECT_ROOT / "backend") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "backend"))
@@ -0,0 +1,95 @@
+"""
+Synthetic PRD corpus
+Documents are assembled from the sections of the real sample PRDs, so the
+generated corpus has realistic line lengths, list density and markdown.
+"""
+
+import random
+from typing import Dict, List, Optional
+
+from . import PROJECT_ROOT
+from fastapi_app.services.prd_markdown import heading_key, tokenize_blocks
+
+
+def load_sample_prds() -> List[str]:
+    """Load sample PRDs from tests/samples and prds/queue"""
+    paths = sorted((PROJECT_ROOT / "tests" / "samples").glob("*.md"))
+    paths += sorted((PROJECT_ROOT / "prds" / "queue").glob("*.md"))
+    return [p.read_text(encoding='utf-8') for p in paths if p.name.lower() != "readme.md"]
+
+
+def build_large_prd(samples: List[str], min_lines: int) -> str:
+    """Concatenate samples until the document has at least `min_lines` lines"""
+    lines: List[str] = []
+    while len(lines) < min_lines:
+        for sample in samples:
+            lines.extend(sample.split('\n'))
+    return '\n'.join(lines)
+
+
+def split_sections(content: str) -> Dict[str, List[str]]:
+    """H2 sections of a document: heading key -> raw lines (heading included)"""
+    lines = content.split('\n')
+    headings = [b for b in tokenize_blocks(content) if b.kind == 'heading' and b.level == 2]
+    sections: Dict[str, List[str]] = {}
+    for heading, following in zip(headings, headings[1:] + [None]):
+        end = following.start if following else len(lines)
+        body = lines[heading.start:end]
+        if any(line.strip() for line in body[1:]):
+            sections.setdefault(heading_key(heading.text), body)
+    return sections
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, float]:
+    """Parse a section mix like 'requirements=1,risks=0.25' (heading keys)"""
+    mix: Dict[str, float] = {}
+    for item in (spec or '').split(','):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition('=')
+        mix[heading_key(name.strip().replace('_', ' '))] = float(weight or 1)
+    return mix
+
+
+class CorpusGenerator:
+    """Deterministic generator of synthetic PRDs seeded from real samples."""
+
+    def __init__(self, samples: Optional[List[str]] = None, seed: int = 42):
+        self.samples = samples if samples is not None else load_sample_prds()
+        self.seed = seed
+        self.pools: Dict[str, List[List[str]]] = {}
+        for sample in self.samples:
+            for name, body in split_sections(sample).items():
+                self.pools.setdefault(name, []).append(body)
+
+        # By default each section appears as often as it does in the samples
+        self.default_mix = {name: len(pool) / len(self.samples) for name, pool in self.pools.items()}
+
+    def generate(self, documents: int, mix: Optional[Dict[str, float]] = None,
+                 scale: int = 1) -> List[str]:
+        """
+        Generate `documents` PRDs.
+
+        Args:
+            mix: Inclusion probability per section (heading key); sections not
+                listed keep their sample frequency, 0 excludes a section
+            scale: Repeat each section body this many times to grow documents
+        """
+        rng = random.Random(self.seed)
+        weights = dict(self.default_mix)
+        weights.update(mix or {})
+        names = list(self.pools)  # order of first appearance in the samples
+
+        corpus = []
+        for index in range(documents):
+            lines = [f"# Synthetic PRD {index}: {rng.choice(['Platform', 'Agent', 'Service'])} "
+                     f"{rng.randrange(10_000)}", ""]
+            for name in names:
+                if rng.random() >= weights[name]:
+                    continue
+                heading, *body = rng.choice(self.pools[name])
+                lines.append(heading)
+                for _ in range(max(1, scale)):
+                    lines.extend(body)
+            corpus.append('\n'.join(lines))
+        return corpus
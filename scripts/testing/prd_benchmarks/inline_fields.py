@@ -0,0 +1,87 @@
+"""
+Inline field reference implementation
+The original PRDParser._extract_inline_fields (four uncompiled searches per
+line, with a rescan from lines.index() for every **Requirements:** marker),
+kept to check the single-pass rewrite against, plus a marker-dense document
+for stress runs.
+"""
+
+import re
+from typing import Any, Callable, Dict, List
+
+
+def legacy_extract_inline_fields(content: str, result: Dict[str, Any]) -> None:
+    """Original inline field extraction (rescans from lines.index for each marker)"""
+    lines = content.split('\n')
+
+    field_patterns = {
+        r'\*\*Description:\*\*': 'description',
+        r'\*\*Problem Statement:\*\*': 'problem_statement',
+        r'\*\*Description\*\*:': 'description',
+        r'\*\*Problem Statement\*\*:': 'problem_statement',
+    }
+
+    for line in lines:
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+
+        for pattern, field_key in field_patterns.items():
+            if re.search(pattern, line_stripped, re.IGNORECASE):
+                match = re.search(r':\s*(.+)', line_stripped)
+                if match:
+                    value = match.group(1).strip()
+                    value = re.sub(r'^\*\*\s*', '', value)
+                    value = re.sub(r'\s*\*\*$', '', value)
+                    value = re.sub(r'\*\*(.+?)\*\*', r'\1', value)
+                    value = re.sub(r'\*(.+?)\*', r'\1', value)
+                    if value and (not result[field_key] or (isinstance(result[field_key], str) and not result[field_key].strip())):
+                        result[field_key] = value
+                break
+
+        if re.search(r'\*\*Requirements?:\*\*', line_stripped, re.IGNORECASE):
+            requirements = []
+            for next_line in lines[lines.index(line) + 1:]:
+                next_line_stripped = next_line.strip()
+                if not next_line_stripped:
+                    continue
+                if next_line_stripped.startswith('-') or next_line_stripped.startswith('*'):
+                    req_text = re.sub(r'^[\*\-\+]\s*', '', next_line_stripped)
+                    req_text = re.sub(r'\*\*(.+?)\*\*', r'\1', req_text)
+                    req_text = re.sub(r'\*(.+?)\*', r'\1', req_text)
+                    if req_text.strip():
+                        requirements.append(req_text.strip())
+                elif next_line_stripped.startswith('#'):
+                    break
+            if requirements and (not result['requirements'] or len(result['requirements']) == 0):
+                result['requirements'] = requirements
+
+
+def empty_inline_result() -> Dict[str, Any]:
+    return {'description': '', 'problem_statement': '', 'requirements': []}
+
+
+def inline_fields(extract: Callable[[str, Dict[str, Any]], None], content: str) -> Dict[str, Any]:
+    result = empty_inline_result()
+    extract(content, result)
+    return result
+
+
+def build_inline_stress_prd(lines: int) -> str:
+    """Document dense with inline markers: the legacy version rescans it per marker"""
+    block = [
+        "**Requirements:**",
+        "- Cache responses for **60 seconds**",
+        "- Invalidate on *write*",
+        "Some narrative text about the requirement.",
+        "**Description:** Inline description with **bold** text",
+        "**Problem Statement**: Inline problem statement",
+        "* Another requirement",
+        "",
+        "Plain paragraph line",
+        "+ not a list marker for requirements",
+    ]
+    out: List[str] = ["# Stress PRD", ""]
+    while len(out) < lines:
+        out.extend(block)
+    return '\n'.join(out[:lines])
@@ -0,0 +1,101 @@
+"""
+Stage measurement and baselines
+Throughput is the best of N timed runs; allocation is measured in a separate
+run under tracemalloc (tracing slows code down, so it never overlaps timing).
+"""
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import BASELINE_DIR
+from .stages import Stage
+
+# Peak allocation differences below this are noise, whatever the tolerance
+ALLOCATION_SLACK_KIB = 64
+
+
+def measure_stage(stage: Stage, corpus: List[str], repeat: int = 5,
+                  allocations: bool = True) -> Dict[str, Any]:
+    """Throughput and peak allocation of one stage over the corpus"""
+    inputs = stage.prepare(corpus)
+    corpus_bytes = sum(len(doc.encode('utf-8')) for doc in corpus)
+
+    stage.run(inputs)  # warm-up (lazy imports, regex caches)
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        stage.run(inputs)
+        best = min(best, time.perf_counter() - start)
+
+    result: Dict[str, Any] = {
+        'seconds': round(best, 6),
+        'docs_per_sec': round(len(corpus) / best, 1) if best else None,
+        'mb_per_sec': round(corpus_bytes / best / 1e6, 3) if best else None,
+        'us_per_doc': round(best / len(corpus) * 1e6, 2),
+    }
+
+    if allocations:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            stage.run(inputs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_kib'] = round(peak / 1024, 1)
+        result['peak_bytes_per_doc'] = round(peak / len(corpus))
+
+    return result
+
+
+def baseline_path(name: str) -> Path:
+    path = Path(name)
+    return path if path.suffix == '.json' else BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, corpus_info: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> Path:
+    """Write results as a named baseline (or to an explicit .json path)"""
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'created': datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'corpus': corpus_info,
+        'stages': results,
+    }
+    path.write_text(json.dumps(payload, indent=2) + '\n', encoding='utf-8')
+    return path
+
+
+def load_baseline(name: str) -> Optional[Dict[str, Any]]:
+    path = baseline_path(name)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                        tolerance: float) -> List[str]:
+    """Regressions: throughput below, or peak allocation above, the tolerance band"""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            continue
+        if base.get('docs_per_sec') and current['docs_per_sec'] < base['docs_per_sec'] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['docs_per_sec']:,.0f} docs/s vs baseline {base['docs_per_sec']:,.0f}")
+        if 'peak_kib' in current and base.get('peak_kib') is not None:
+            limit = max(base['peak_kib'] * (1 + tolerance), base['peak_kib'] + ALLOCATION_SLACK_KIB)
+            if current['peak_kib'] > limit:
+                regressions.append(
+                    f"{name}: peak {current['peak_kib']:,.0f} KiB vs baseline {base['peak_kib']:,.0f} KiB")
+    return regressions
@@ -0,0 +1,86 @@
+"""
+Benchmark stages
+Each stage isolates one step of PRD processing. `prepare` builds the stage
+input from the corpus outside the timed region; `run` is what gets measured.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from fastapi_app.services.prd_classifier import prd_type_classifier
+from fastapi_app.services.prd_parser import PRDParser
+from fastapi_app.utils.prd_hash import calculate_prd_hash, hash_many, normalize_text
+
+_parser = PRDParser()
+_ast_parser = PRDParser(mode='ast')
+
+
+class Stage(NamedTuple):
+    name: str
+    description: str
+    prepare: Callable[[List[str]], Any]
+    run: Callable[[Any], None]
+
+
+def _documents(corpus: List[str]) -> List[Dict[str, Any]]:
+    """Per-document inputs shared by the stages"""
+    documents = []
+    for index, content in enumerate(corpus):
+        parsed = _parser.parse_prd_content(content, f"prd-{index}.md")
+        documents.append({
+            'content': content,
+            'lines': content.split('\n'),
+            'filename': f"prd-{index}.md",
+            'parsed': parsed,
+            'sections': _parser._identify_sections(content.split('\n')),
+        })
+    return documents
+
+
+def _run_inline_fields(documents: List[Dict[str, Any]]) -> None:
+    for doc in documents:
+        _parser._extract_inline_fields(doc['content'], PRDParser._empty_result(doc['content']), doc['lines'])
+
+
+def _run_section_values(documents: List[Dict[str, Any]]) -> None:
+    for doc in documents:
+        for name, section_content in doc['sections'].items():
+            _parser._parse_section(name, section_content)
+
+
+def _service_detect_prd_type(documents: List[Dict[str, Any]]) -> None:
+    # Imported lazily: the service module sets up storage on import
+    from fastapi_app.services.prd_service import prd_service
+    for doc in documents:
+        prd_service._detect_prd_type(doc['content'])
+
+
+STAGES: List[Stage] = [
+    Stage('title', "PRDParser._extract_title", _documents,
+          lambda docs: [_parser._extract_title(d['lines']) for d in docs]),
+    Stage('inline_fields', "PRDParser._extract_inline_fields", _documents, _run_inline_fields),
+    Stage('sections_regex', "PRDParser._identify_sections (regex mode)", _documents,
+          lambda docs: [_parser._identify_sections(d['lines']) for d in docs]),
+    Stage('sections_ast', "PRDParser._identify_sections (ast mode)", _documents,
+          lambda docs: [_ast_parser._identify_sections(d['lines'], None, d['content']) for d in docs]),
+    Stage('section_values', "PRDParser._parse_section for every section", _documents, _run_section_values),
+    Stage('classify', "prd_type_classifier.classify", _documents,
+          lambda docs: [prd_type_classifier.classify(d['content'], d['filename']) for d in docs]),
+    Stage('detect_prd_type', "PRDService._detect_prd_type", _documents, _service_detect_prd_type),
+    Stage('parse_regex', "PRDParser.parse_prd_content (regex mode)", _documents,
+          lambda docs: [_parser.parse_prd_content(d['content'], d['filename']) for d in docs]),
+    Stage('parse_ast', "PRDParser.parse_prd_content (ast mode)", _documents,
+          lambda docs: [_ast_parser.parse_prd_content(d['content'], d['filename']) for d in docs]),
+    Stage('identity', "PRDParser.extract_identity (duplicate fast path)", _documents,
+          lambda docs: [_parser.extract_identity(d['content']) for d in docs]),
+    Stage('validate', "PRDParser.validate_prd_structure", _documents,
+          lambda docs: [_parser.validate_prd_structure(d['parsed']) for d in docs]),
+    Stage('normalize_text', "prd_hash.normalize_text (whole description)", _documents,
+          lambda docs: [normalize_text(d['parsed']['description']) for d in docs]),
+    Stage('prd_hash', "prd_hash.calculate_prd_hash", _documents,
+          lambda docs: [calculate_prd_hash(d['parsed']['title'], d['parsed']['description']) for d in docs]),
+    Stage('hash_many', "prd_hash.hash_many over the corpus",
+          lambda corpus: [(d['parsed']['title'], d['parsed']['description']) for d in _documents(corpus)],
+          hash_many),
+]
+
+STAGES_BY_NAME: Dict[str, Stage] = {stage.name: stage for stage in STAGES}
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+PRD benchmark suite runner
+Generates a synthetic PRD corpus from tests/samples, measures throughput and
+peak allocation per processing stage, and saves or checks stored baselines.
+
+Usage:
+    python3 scripts/testing/run-prd-benchmarks.py [--documents 500] [--scale 1] [--seed 42]
+        [--mix requirements=1,risks=0.25] [--stages parse_regex,prd_hash] [--repeat 5]
+        [--no-alloc] [--save-baseline NAME] [--compare NAME] [--tolerance 0.25] [--json out.json]
+
+Baselines are stored in scripts/testing/prd_benchmarks/baselines/NAME.json.
+Timings are machine-specific: record a baseline on the machine that runs the
+comparison. Exits 1 if --compare finds a regression.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from prd_benchmarks.corpus import CorpusGenerator, parse_mix
+from prd_benchmarks.measure import compare_to_baseline, load_baseline, measure_stage, save_baseline
+from prd_benchmarks.stages import STAGES, STAGES_BY_NAME
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="PRD benchmark suite")
+    arg_parser.add_argument("--documents", type=int, default=500, help="Synthetic corpus size")
+    arg_parser.add_argument("--scale", type=int, default=1, help="Repeat section bodies to grow documents")
+    arg_parser.add_argument("--seed", type=int, default=42, help="Corpus generator seed")
+    arg_parser.add_argument("--mix", help="Section inclusion probabilities, e.g. requirements=1,risks=0.25")
+    arg_parser.add_argument("--stages", help="Comma-separated stages to run (default: all)")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best of N)")
+    arg_parser.add_argument("--no-alloc", action="store_true", help="Skip allocation measurement")
+    arg_parser.add_argument("--save-baseline", metavar="NAME", help="Store results as a baseline")
+    arg_parser.add_argument("--compare", metavar="NAME", help="Compare results against a baseline")
+    arg_parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed relative slowdown / allocation growth (default 0.25)")
+    arg_parser.add_argument("--json", metavar="PATH", help="Also write results as JSON")
+    arg_parser.add_argument("--list", action="store_true", help="List stages and exit")
+    args = arg_parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            print(f"  {stage.name:<16} {stage.description}")
+        return 0
+
+    if args.stages:
+        unknown = [name for name in args.stages.split(',') if name not in STAGES_BY_NAME]
+        if unknown:
+            print(f"❌ Unknown stages: {', '.join(unknown)} (see --list)", file=sys.stderr)
+            return 2
+        stages = [STAGES_BY_NAME[name] for name in args.stages.split(',')]
+    else:
+        stages = STAGES
+
+    generator = CorpusGenerator(seed=args.seed)
+    mix = parse_mix(args.mix)
+    corpus = generator.generate(args.documents, mix, args.scale)
+    corpus_info = {
+        'documents': args.documents, 'scale': args.scale, 'seed': args.seed, 'mix': mix,
+        'bytes': sum(len(doc.encode('utf-8')) for doc in corpus),
+        'lines': sum(doc.count('\n') + 1 for doc in corpus),
+    }
+
+    print("⏱️  PRD Benchmark Suite")
+    print("=" * 50)
+    print(f"  {len(corpus)} documents, {corpus_info['lines']:,} lines, "
+          f"{corpus_info['bytes'] / 1e6:.2f} MB (seed {args.seed}, scale {args.scale})\n")
+    print(f"  {'stage':<16} {'docs/s':>11} {'MB/s':>8} {'µs/doc':>10} {'peak KiB':>10}")
+
+    results = {}
+    for stage in stages:
+        result = measure_stage(stage, corpus, args.repeat, allocations=not args.no_alloc)
+        results[stage.name] = result
+        peak = f"{result['peak_kib']:>10,.0f}" if 'peak_kib' in result else f"{'-':>10}"
+        print(f"  {stage.name:<16} {result['docs_per_sec']:>11,.0f} {result['mb_per_sec']:>8.2f} "
+              f"{result['us_per_doc']:>10,.1f} {peak}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'corpus': corpus_info, 'stages': results}, indent=2),
+                                   encoding='utf-8')
+
+    if args.save_baseline:
+        path = save_baseline(args.save_baseline, corpus_info, results)
+        print(f"\n💾 Baseline saved to {path}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline is None:
+            print(f"\n❌ Baseline not found: {args.compare}", file=sys.stderr)
+            return 2
+        base_corpus = {k: v for k, v in baseline.get('corpus', {}).items() if k in ('documents', 'scale', 'seed', 'mix')}
+        if base_corpus != {k: corpus_info[k] for k in base_corpus}:
+            print(f"\n⚠️  Corpus differs from the baseline's: {base_corpus}")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against baseline '{args.compare}':")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ No regressions against baseline '{args.compare}' (tolerance {args.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
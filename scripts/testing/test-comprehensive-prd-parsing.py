@@ -6,9 +6,9 @@ Tests the new PRD parser with sample PRD content
 
 import sys
 import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'fastapi_app'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
 
-from services.prd_parser import PRDParser
+from fastapi_app.services.prd_parser import PRDParser
 
 def test_comprehensive_prd_parsing():
     """Test the comprehensive PRD parser with sample content"""
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test inline PRD field extraction
+Checks PRDParser._extract_inline_fields against the original implementation
+on every PRD in tests/samples, on a marker-dense stress document, and on
+cases where the original got positions wrong (duplicate marker lines).
+
+Usage:
+    python3 scripts/testing/test-prd-inline-fields.py [--stress-lines 2000]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from prd_benchmarks import PROJECT_ROOT
+from prd_benchmarks.inline_fields import build_inline_stress_prd, inline_fields, legacy_extract_inline_fields
+from fastapi_app.services.prd_parser import PRDParser
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description="Check inline PRD field extraction")
+    arg_parser.add_argument("--stress-lines", type=int, default=2000,
+                            help="Lines in the stress document (the original is quadratic in it)")
+    args = arg_parser.parse_args()
+
+    parser = PRDParser()
+    extract = lambda content, result: parser._extract_inline_fields(content, result)
+    failures = 0
+
+    def check(name: str, actual, expected) -> None:
+        nonlocal failures
+        if actual == expected:
+            print(f"   ✅ {name}")
+        else:
+            failures += 1
+            print(f"   ❌ {name}\n      expected: {expected!r}\n      actual:   {actual!r}")
+
+    print("🧪 Inline PRD Field Extraction")
+    print("=" * 60)
+
+    samples = sorted(p for p in (PROJECT_ROOT / "tests" / "samples").glob("*.md")
+                     if p.name.lower() != "readme.md")
+    if not samples:
+        print("❌ No sample PRDs in tests/samples")
+        return 1
+    for path in samples:
+        content = path.read_text(encoding="utf-8")
+        check(f"{path.name} matches the original",
+              inline_fields(extract, content), inline_fields(legacy_extract_inline_fields, content))
+
+    conversation = (PROJECT_ROOT / "tests" / "samples" / "test-chatgpt-conversation.md").read_text(encoding="utf-8")
+    check("test-chatgpt-conversation.md problem statement",
+          inline_fields(extract, conversation)["problem_statement"].startswith("Small to medium teams"), True)
+
+    # The original looked the marker up with lines.index(), so a second
+    # identical marker line rescanned from the first one
+    duplicate = "**Requirements:**\n## Next Section\n**Requirements:**\n- Real requirement\n"
+    check("duplicate **Requirements:** lines", inline_fields(extract, duplicate)["requirements"],
+          ["Real requirement"])
+
+    check("markup stripped from inline values",
+          inline_fields(extract, "**Description:** A **bold** and *quiet* agent\n")["description"],
+          "A bold and quiet agent")
+    check("first non-empty value wins",
+          inline_fields(extract, "**Description:**\n**Description**: Second\n**Description:** Third\n")["description"],
+          "Second")
+    check("requirements stop at the next heading",
+          inline_fields(extract, "**Requirement:**\n- One\n* Two\n# Heading\n- Three\n")["requirements"],
+          ["One", "Two"])
+
+    stress = build_inline_stress_prd(args.stress_lines)
+    check(f"{args.stress_lines}-line stress document matches the original",
+          inline_fields(extract, stress), inline_fields(legacy_extract_inline_fields, stress))
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        return 1
+    print("🎉 All inline field checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())